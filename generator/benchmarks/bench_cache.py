@@ -0,0 +1,69 @@
+"""
+Benchmark the columnar cache against the previous indent=2 JSON cache
+
+Run from the generator directory:
+    python -m benchmarks.bench_cache
+"""
+
+import json
+import os
+import tempfile
+import time
+from datetime import datetime
+
+from zera_tracker.cache import load_columnar_cache, ohlcv_array, save_columnar_cache
+
+from .synthetic import make_api_response, make_ohlcv_list
+
+POOLS = 3
+CANDLES_PER_POOL = 200_000  # ~4.6 months of minute candles per pool
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main():
+    all_pool_data = {
+        f"pool_{i}": {
+            'info': {'address': f"MockPool{i}", 'name': f"Mock Pool {i}", 'token_symbol': 'MOCK'},
+            'data': make_api_response(make_ohlcv_list(CANDLES_PER_POOL, step_seconds=60, seed=i))
+        }
+        for i in range(POOLS)
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = f"{tmp}/api_cache.json"
+        npy_dir = f"{tmp}/api_cache"
+
+        # Previous format
+        with open(json_path, 'w') as f:
+            json.dump({'cached_at': datetime.now().isoformat(), 'data': all_pool_data}, f, indent=2)
+        save_columnar_cache(all_pool_data, npy_dir)
+
+        start = time.perf_counter()
+        with open(json_path, 'r') as f:
+            loaded = json.load(f)['data']
+        arrays = [ohlcv_array(p['data']['data']['attributes']['ohlcv_list']) for p in loaded.values()]
+        json_load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        _, loaded = load_columnar_cache(npy_dir)
+        arrays = [ohlcv_array(p['data']['data']['attributes']['ohlcv_list']) for p in loaded.values()]
+        npy_open = time.perf_counter() - start
+        # Touch every close so page-ins are counted, not just the mmap call
+        checksum = sum(float(arr[:, 4].sum()) for arr in arrays)
+        npy_load = time.perf_counter() - start
+
+        json_size = os.path.getsize(json_path)
+        npy_size = directory_size(npy_dir)
+
+    print(f"{POOLS} pools x {CANDLES_PER_POOL:,} candles (checksum {checksum:.2f})\n")
+    print(f"{'format':<22} {'size (MB)':>10} {'load (s)':>10}")
+    print(f"{'JSON indent=2':<22} {json_size / 1e6:>10.1f} {json_load:>10.3f}")
+    print(f"{'columnar .npy (mmap)':<22} {npy_size / 1e6:>10.1f} {npy_load:>10.3f}"
+          f"   (open: {npy_open * 1000:.1f} ms)")
+
+
+if __name__ == "__main__":
+    main()
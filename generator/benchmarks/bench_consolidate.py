@@ -0,0 +1,86 @@
+"""
+Benchmark create_unified_dataframe against the previous per-row implementation
+
+Run from the generator directory:
+    python -m benchmarks.bench_consolidate
+"""
+
+import contextlib
+import io
+import time
+import tracemalloc
+from datetime import datetime
+
+import pandas as pd
+
+from zera_tracker.cache import ohlcv_array
+from zera_tracker.consolidator import create_unified_dataframe
+from zera_tracker.fetcher import parse_ohlcv_data
+
+from .synthetic import make_api_response, make_ohlcv_list
+
+POOLS = 3
+SCALES = (10_000, 100_000, 1_000_000)  # Total candles across all pools
+
+
+def legacy_create_unified_dataframe(all_pool_data):
+    """The record-per-row implementation this benchmark compares against"""
+    all_records = []
+    for pool_name, pool_data in all_pool_data.items():
+        pool_info = pool_data['info']
+        for entry in parse_ohlcv_data(pool_data['data']):
+            all_records.append({
+                'timestamp': entry['timestamp'],
+                'date': datetime.fromtimestamp(entry['timestamp']),
+                'open': entry['open'],
+                'high': entry['high'],
+                'low': entry['low'],
+                'close': entry['close'],
+                'volume': entry['volume'],
+                'pool_name': pool_name,
+                'pool_address': pool_info['address'],
+                'token_symbol': pool_info['token_symbol']
+            })
+    df = pd.DataFrame(all_records)
+    df = df.sort_values('timestamp').reset_index(drop=True)
+    df['price_change'] = df['close'] - df['open']
+    df['price_change_pct'] = (df['price_change'] / df['open']) * 100
+    return df
+
+
+def measure(func, all_pool_data):
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        func(all_pool_data)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 1e6
+
+
+def main():
+    print("vector = from API lists, cached = from columnar cache arrays (no list conversion)\n")
+    print(f"{'rows':>10} {'legacy (s)':>11} {'legacy MB':>10} {'vector (s)':>11} {'vector MB':>10} "
+          f"{'cached (s)':>11} {'speedup':>8}")
+    for total in SCALES:
+        per_pool = total // POOLS
+        all_pool_data = {
+            f"pool_{i}": {
+                'info': {'address': f"MockPool{i}", 'name': f"Mock Pool {i}", 'token_symbol': 'MOCK'},
+                'data': make_api_response(make_ohlcv_list(per_pool, step_seconds=60, seed=i))
+            }
+            for i in range(POOLS)
+        }
+        legacy_s, legacy_mb = measure(legacy_create_unified_dataframe, all_pool_data)
+        vector_s, vector_mb = measure(create_unified_dataframe, all_pool_data)
+        for pool_data in all_pool_data.values():
+            attributes = pool_data['data']['data']['attributes']
+            attributes['ohlcv_list'] = ohlcv_array(attributes['ohlcv_list'])
+        cached_s, _ = measure(create_unified_dataframe, all_pool_data)
+        print(f"{total:>10,} {legacy_s:>11.3f} {legacy_mb:>10.1f} {vector_s:>11.3f} {vector_mb:>10.1f} "
+              f"{cached_s:>11.3f} {legacy_s / cached_s:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark serial vs concurrent pool fetching against a local mock server
+
+Run from the generator directory:
+    python -m benchmarks.bench_fetch
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+
+import config
+from zera_tracker.fetcher import fetch_all_pools
+from zera_tracker.ratelimit import TokenBucket
+
+from .mock_server import MockServer
+
+POOL_COUNTS = (3, 30, 300)
+LATENCY = 0.05  # Simulated per-request server latency in seconds
+
+
+def make_pools(count: int) -> dict:
+    return {
+        f"pool_{i}": {
+            'address': f"MockPool{i:04d}",
+            'name': f"Mock Pool {i}",
+            'token_symbol': 'MOCK'
+        }
+        for i in range(count)
+    }
+
+
+def time_fetch(max_workers: int, cache_dir: str) -> float:
+    # Effectively unlimited quota so the benchmark measures the fetch engine
+    limiter = TokenBucket(rate_per_minute=1_000_000, capacity=1000)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        fetch_all_pools(cache_path=f"{cache_dir}/api_cache.json",
+                        max_workers=max_workers, rate_limiter=limiter)
+    return time.perf_counter() - start
+
+
+def main():
+    original = (config.BASE_URL, config.POOLS)
+    print(f"Mock latency: {LATENCY * 1000:.0f} ms/request, "
+          f"concurrency: {config.MAX_CONCURRENT_REQUESTS} workers\n")
+    print(f"{'pools':>6} {'serial (s)':>12} {'concurrent (s)':>16} {'speedup':>9}")
+
+    try:
+        # No ETags, so repeated runs aren't answered with cheap 304s (see bench_http)
+        with MockServer(latency=LATENCY, etags=False) as server, tempfile.TemporaryDirectory() as cache_dir:
+            config.BASE_URL = server.base_url
+            for count in POOL_COUNTS:
+                config.POOLS = make_pools(count)
+                serial = time_fetch(1, cache_dir)
+                concurrent = time_fetch(config.MAX_CONCURRENT_REQUESTS, cache_dir)
+                print(f"{count:>6} {serial:>12.2f} {concurrent:>16.2f} {serial / concurrent:>8.1f}x")
+    finally:
+        config.BASE_URL, config.POOLS = original
+
+    print(f"\nNote: the previous serial loop also slept 1 s per pool; at the "
+          f"{config.RATE_LIMIT_PER_MINUTE}/min quota, the limiter bounds 300 pools to "
+          f"~{300 / config.RATE_LIMIT_PER_MINUTE:.0f} min regardless of concurrency.")
+
+
+if __name__ == "__main__":
+    main()
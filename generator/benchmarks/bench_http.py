@@ -0,0 +1,81 @@
+"""
+Benchmark bare requests.get vs the pooled, conditional ApiClient
+
+Fetches every pool twice against the local mock server, which speaks
+HTTP/1.1 keep-alive, gzip and ETags:
+
+- bare:   one requests.get per pool (a new connection every time)
+- cold:   ApiClient, first run (pooled connections, gzip, no validators yet)
+- warm:   ApiClient, second run (every pool revalidated with If-None-Match)
+
+Loopback HTTP has no TLS handshake, so the time column understates what
+connection reuse saves against the real HTTPS API; the connection and byte
+counts carry over directly.
+
+Run from the generator directory:
+    python -m benchmarks.bench_http
+"""
+
+import tempfile
+import time
+
+import requests
+
+from zera_tracker.client import ApiClient
+
+from .mock_server import MockServer
+
+POOL_COUNT = 50
+CANDLES = 1000
+LATENCY = 0.005  # Simulated per-request server latency in seconds
+
+
+def pool_urls(base_url: str) -> list:
+    return [f"{base_url}/networks/solana/pools/MockPool{i:04d}/ohlcv/hour" for i in range(POOL_COUNT)]
+
+
+def run_bare(urls: list) -> dict:
+    wire = 0
+    start = time.perf_counter()
+    for url in urls:
+        response = requests.get(url, headers={"Accept": "application/json"}, timeout=10)
+        response.raise_for_status()
+        response.json()
+        wire += response.raw.tell()
+    return {'seconds': time.perf_counter() - start, 'requests': len(urls),
+            'connections': len(urls), 'wire_bytes': wire, 'not_modified': 0}
+
+
+def run_client(client: ApiClient, urls: list) -> dict:
+    client.reset_stats()
+    start = time.perf_counter()
+    for url in urls:
+        client.get_json(url)
+    seconds = time.perf_counter() - start
+    stats = client.stats
+    stats.update(client.connection_stats())
+    stats['seconds'] = seconds
+    return stats
+
+
+def main():
+    print(f"{POOL_COUNT} pools x {CANDLES} candles, {LATENCY * 1000:.0f} ms mock latency\n")
+    print(f"{'mode':>6} {'time (s)':>9} {'requests':>9} {'connections':>12} {'304s':>6} {'KB on wire':>11}")
+
+    with MockServer(latency=LATENCY, candles=CANDLES, step_seconds=3600) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        urls = pool_urls(server.base_url)
+        client = ApiClient(cache_dir=cache_dir)
+        rows = [
+            ('bare', run_bare(urls)),
+            ('cold', run_client(client, urls)),
+            ('warm', run_client(client, urls)),
+        ]
+
+    for mode, stats in rows:
+        print(f"{mode:>6} {stats['seconds']:>9.2f} {stats['requests']:>9} {stats['connections']:>12} "
+              f"{stats['not_modified']:>6} {stats['wire_bytes'] / 1024:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
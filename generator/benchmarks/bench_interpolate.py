@@ -0,0 +1,98 @@
+"""
+Benchmark interpolate_migration_gaps against the previous per-point loop
+
+Two pools separated by a long gap at each migration, filled at
+hours_per_point=1.
+
+Run from the generator directory:
+    python -m benchmarks.bench_interpolate
+"""
+
+import contextlib
+import io
+import time
+
+import numpy as np
+import pandas as pd
+
+import config
+from zera_tracker.consolidator import create_unified_dataframe, interpolate_migration_gaps
+
+from .synthetic import make_token_data
+
+GAP_DAYS = (7, 30, 180)
+MIGRATIONS = 3
+
+
+def legacy_interpolate_migration_gaps(df, hours_per_point=6):
+    """The concat-per-point implementation this benchmark compares against"""
+    df = df.sort_values('timestamp').reset_index(drop=True)
+    df['is_interpolated'] = False
+    for event_name, migration_ts in config.MIGRATION_DATES.items():
+        real_data = df[df['is_interpolated'] == False].copy()
+        before_mask = real_data['timestamp'] < migration_ts
+        after_mask = real_data['timestamp'] >= migration_ts
+        if before_mask.any() and after_mask.any():
+            last_before = real_data[before_mask].iloc[-1]
+            first_after = real_data[after_mask].iloc[0]
+            time_gap_seconds = first_after['timestamp'] - last_before['timestamp']
+            if time_gap_seconds / 3600 > hours_per_point:
+                num_points = int(time_gap_seconds / 3600 / hours_per_point)
+                interval_seconds = hours_per_point * 3600
+                for i in range(1, num_points + 1):
+                    ratio = (i * interval_seconds) / time_gap_seconds
+                    interp_ts = last_before['timestamp'] + (i * interval_seconds)
+                    price = last_before['close'] + ratio * (first_after['close'] - last_before['close'])
+                    volume_ratio = 1 - (2 * abs(ratio - 0.5))
+                    new_row = {
+                        'timestamp': int(interp_ts),
+                        'date': pd.Timestamp(int(interp_ts), unit='s', tz='UTC'),
+                        'open': price, 'high': price * 1.001, 'low': price * 0.999, 'close': price,
+                        'volume': (last_before['volume'] + first_after['volume']) * volume_ratio * 0.3,
+                        'pool_name': f'{last_before["pool_name"]}_to_{first_after["pool_name"]}',
+                        'pool_address': last_before['pool_address'],
+                        'token_symbol': last_before['token_symbol'],
+                        'price_change': 0, 'price_change_pct': 0, 'is_interpolated': True
+                    }
+                    df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
+    return df.sort_values('timestamp').reset_index(drop=True)
+
+
+def make_frame(gap_days: int):
+    """MIGRATIONS + 1 hourly pools of 500 candles with a gap at each migration"""
+    token, all_pool_data = make_token_data(MIGRATIONS + 1, 500, step_seconds=3600,
+                                           gap_candles=gap_days * 24)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return create_unified_dataframe(all_pool_data), token.migration_dates
+
+
+def timed(func, df):
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = func(df.copy(), hours_per_point=1)
+    return result, time.perf_counter() - start
+
+
+def main():
+    original = config.MIGRATION_DATES
+    print(f"{MIGRATIONS} migrations, hours_per_point=1\n")
+    print(f"{'gap (days)':>10} {'points':>8} {'legacy (s)':>11} {'vector (s)':>11} {'speedup':>8}")
+    try:
+        for gap_days in GAP_DAYS:
+            df, config.MIGRATION_DATES = make_frame(gap_days)
+            legacy, legacy_s = timed(legacy_interpolate_migration_gaps, df)
+            # The old loop also emitted a point on top of the first post-migration candle
+            legacy = legacy[~(legacy['is_interpolated'] & legacy['timestamp'].duplicated(keep=False))]
+            vector, vector_s = timed(interpolate_migration_gaps, df)
+
+            assert np.array_equal(legacy['timestamp'].to_numpy(), vector['timestamp'].to_numpy())
+            assert np.allclose(legacy['close'].to_numpy(), vector['close'].to_numpy())
+
+            points = int(vector['is_interpolated'].sum())
+            print(f"{gap_days:>10} {points:>8} {legacy_s:>11.3f} {vector_s:>11.4f} {legacy_s / vector_s:>7.0f}x")
+    finally:
+        config.MIGRATION_DATES = original
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Check and benchmark the sliding-window peak/trough detection
+
+First verifies that find_local_peaks/find_local_troughs return exactly what
+the previous per-index loop returned, over many random series (including
+plateaus and ties), window sizes and thresholds. Then times both.
+
+Run from the generator directory:
+    python -m benchmarks.bench_peaks
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from zera_tracker.visualizer import find_local_peaks, find_local_troughs
+
+CASES = 500
+SCALES = (1_000, 10_000, 100_000)
+
+
+def legacy_find_local_peaks(df, window=5, prominence_threshold=0.1):
+    if len(df) < window * 2:
+        return []
+    peaks = []
+    highs = df['high'].values
+    dates = df['date'].values
+    min_prominence = (highs.max() - highs.min()) * prominence_threshold
+    for i in range(window, len(highs) - window):
+        if all(highs[i] >= highs[i-window:i]) and all(highs[i] >= highs[i+1:i+window+1]):
+            left_min = min(highs[max(0, i-window):i])
+            right_min = min(highs[i+1:min(len(highs), i+window+1)])
+            if highs[i] - max(left_min, right_min) >= min_prominence:
+                peaks.append((dates[i], highs[i]))
+    return peaks
+
+
+def legacy_find_local_troughs(df, window=5, prominence_threshold=0.1):
+    if len(df) < window * 2:
+        return []
+    troughs = []
+    lows = df['low'].values
+    dates = df['date'].values
+    min_prominence = (lows.max() - lows.min()) * prominence_threshold
+    for i in range(window, len(lows) - window):
+        if all(lows[i] <= lows[i-window:i]) and all(lows[i] <= lows[i+1:i+window+1]):
+            left_max = max(lows[max(0, i-window):i])
+            right_max = max(lows[i+1:min(len(lows), i+window+1)])
+            if min(left_max, right_max) - lows[i] >= min_prominence:
+                troughs.append((dates[i], lows[i]))
+    return troughs
+
+
+def make_frame(rng, n, decimals=None):
+    walk = np.cumsum(rng.normal(0, 1, n)) + 100
+    if decimals is not None:
+        walk = walk.round(decimals)  # Coarse rounding creates plateaus and ties
+    return pd.DataFrame({
+        'date': pd.date_range('2025-01-01', periods=n, freq='h', tz='UTC'),
+        'high': walk + np.abs(rng.normal(0, 0.5, n)).round(decimals or 8),
+        'low': walk - np.abs(rng.normal(0, 0.5, n)).round(decimals or 8)
+    })
+
+
+def check_equivalence():
+    rng = np.random.default_rng(0)
+    for _ in range(CASES):
+        df = make_frame(rng, int(rng.integers(0, 300)), decimals=rng.choice([None, 0, 1]))
+        window = int(rng.integers(1, 8))
+        threshold = float(rng.choice([0.0, 0.05, 0.1, 0.25, 0.5]))
+        assert find_local_peaks(df, window, threshold) == legacy_find_local_peaks(df, window, threshold)
+        assert find_local_troughs(df, window, threshold) == legacy_find_local_troughs(df, window, threshold)
+    print(f"✓ Identical results on {CASES} random series\n")
+
+
+def main():
+    check_equivalence()
+    rng = np.random.default_rng(1)
+    print(f"{'points':>8} {'legacy (s)':>11} {'vector (s)':>11} {'speedup':>8}")
+    for n in SCALES:
+        df = make_frame(rng, n)
+        start = time.perf_counter()
+        legacy_find_local_peaks(df, 5, 0.25)
+        legacy_find_local_troughs(df, 5, 0.25)
+        legacy_s = time.perf_counter() - start
+        start = time.perf_counter()
+        find_local_peaks(df, 5, 0.25)
+        find_local_troughs(df, 5, 0.25)
+        vector_s = time.perf_counter() - start
+        print(f"{n:>8,} {legacy_s:>11.3f} {vector_s:>11.4f} {legacy_s / vector_s:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Benchmark create_price_chart render time at increasing candle counts
+
+Compares the collection-based candlesticks with the previous one-artist-per-
+candle loop (skipped at 100k candles, where it takes many minutes).
+
+Run from the generator directory:
+    python -m benchmarks.bench_render
+"""
+
+import contextlib
+import io
+import tempfile
+import time
+from unittest import mock
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.dates as mdates
+from matplotlib.patches import Rectangle
+
+import config
+from zera_tracker import visualizer
+from zera_tracker.consolidator import create_unified_dataframe, interpolate_migration_gaps
+
+from .synthetic import make_api_response, make_ohlcv_list
+
+SCALES = (100, 10_000, 100_000)
+LEGACY_MAX = 10_000
+
+
+def legacy_plot_candlesticks(ax, df, color='#4ECDC4', alpha=0.8):
+    """The per-row artist implementation this benchmark compares against"""
+    candle_width = (df['date'].iloc[-1] - df['date'].iloc[0]) / len(df) * 0.6
+    half = candle_width.total_seconds() / (2 * 86400)
+    for _, row in df.iterrows():
+        body_color = '#26a69a' if row['close'] >= row['open'] else '#ef5350'
+        ax.plot([row['date'], row['date']], [row['low'], row['high']],
+                color=body_color, linewidth=1, alpha=alpha, zorder=1)
+        x = mdates.date2num(row['date'])
+        height = abs(row['close'] - row['open'])
+        if height > 0:
+            ax.add_patch(Rectangle((x - half, min(row['open'], row['close'])), 2 * half, height,
+                                   facecolor=body_color, edgecolor=body_color,
+                                   alpha=alpha, linewidth=0.5, zorder=2))
+        else:
+            ax.plot([x - half, x + half], [row['close'], row['close']],
+                    color=body_color, linewidth=1.5, alpha=alpha, zorder=2)
+
+
+def legacy_plot_volume_bars(ax, df, color='#4ECDC4', alpha=0.6, width=0.8):
+    ax.bar(df['date'], df['volume'] / 1_000_000, color=color, alpha=alpha, width=width)
+
+
+def make_frame(candles: int):
+    all_pool_data = {
+        'pool_0': {
+            'info': {'address': 'MockPool0', 'name': 'Mock Pool 0', 'token_symbol': 'MOCK'},
+            'data': make_api_response(make_ohlcv_list(candles, step_seconds=3600))
+        }
+    }
+    with contextlib.redirect_stdout(io.StringIO()):
+        return interpolate_migration_gaps(create_unified_dataframe(all_pool_data, overlap=None))
+
+
+def time_render(df, out_dir: str) -> float:
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        visualizer.create_price_chart(df, f"{out_dir}/chart.png", include_volume=True)
+    return time.perf_counter() - start
+
+
+def main():
+    print(f"{'candles':>8} {'legacy (s)':>11} {'collections (s)':>16}")
+    # Synthetic candles don't span the configured migrations; their labels
+    # would sit far outside the data and blow up the tight bounding box
+    with tempfile.TemporaryDirectory() as out_dir, \
+            mock.patch.object(config, 'MIGRATION_DATES', {}):
+        for candles in SCALES:
+            df = make_frame(candles)
+            new_s = time_render(df, out_dir)
+            if candles <= LEGACY_MAX:
+                with mock.patch.object(visualizer, 'plot_candlesticks', legacy_plot_candlesticks), \
+                        mock.patch.object(visualizer, 'plot_volume_bars', legacy_plot_volume_bars):
+                    legacy = f"{time_render(df, out_dir):>11.2f}"
+            else:
+                legacy = f"{'skipped':>11}"
+            print(f"{candles:>8,} {legacy} {new_s:>16.2f}")
+
+
+if __name__ == "__main__":
+    main()
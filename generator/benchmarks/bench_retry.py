@@ -0,0 +1,107 @@
+"""
+Exercise the retry policy and circuit breaker against a fault-injecting server
+
+Scenarios, all against the local mock server:
+
+- flaky:     20% of requests fail with 503. Compares the old fixed-sleep
+             retry loop with the jittered exponential RetryPolicy
+- throttled: every 4th request gets 429 with Retry-After: 1; the policy
+             must wait at least that long before retrying
+- down:      every request fails with 503. Counts the requests sent to the
+             dead host with and without the circuit breaker
+
+Delays are scaled down (fixed sleep 0.5 s, jitter base 0.05 s) so the run
+takes seconds; the ratios carry over to the real settings.
+
+Run from the generator directory:
+    python -m benchmarks.bench_retry
+"""
+
+import contextlib
+import io
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from zera_tracker.client import ApiClient
+from zera_tracker.fetcher import fetch_pool_data
+from zera_tracker.retry import RetryPolicy
+from zera_tracker.tokens import TokenConfig
+
+from .mock_server import MockServer
+
+POOLS = [f"MockPool{i:04d}" for i in range(40)]
+WORKERS = 8
+FIXED_DELAY = 0.5
+
+
+class FixedDelayPolicy(RetryPolicy):
+    """The previous behaviour: retry everything after a constant sleep"""
+
+    def is_retryable(self, error):
+        return True
+
+    def delay(self, attempt, retry_after=None):
+        return FIXED_DELAY
+
+
+def make_client(policy: RetryPolicy, failure_threshold: int = None) -> ApiClient:
+    return ApiClient(cache_dir=False, retry_policy=policy, failure_threshold=failure_threshold)
+
+
+def fetch_all(server: MockServer, client: ApiClient) -> dict:
+    token = TokenConfig(name='mock', symbol='MOCK', pools={}, migration_dates={},
+                        base_url=server.base_url, timeframe='day')
+    start_requests = server.requests
+
+    def fetch(address):
+        try:
+            fetch_pool_data(address, token=token, client=client)
+            return True
+        except Exception:
+            return False
+
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), ThreadPoolExecutor(WORKERS) as executor:
+        ok = sum(executor.map(fetch, POOLS))
+    return {'seconds': time.perf_counter() - start, 'ok': ok,
+            'sent': server.requests - start_requests}
+
+
+def jittered(**kwargs) -> RetryPolicy:
+    return RetryPolicy(base_delay=0.05, max_delay=2, rng=random.Random(1), **kwargs)
+
+
+def main():
+    print(f"{len(POOLS)} pools, {WORKERS} workers\n")
+    print(f"{'scenario':>10} {'policy':>16} {'ok':>4} {'requests':>9} {'time (s)':>9}")
+
+    def row(scenario, policy, result):
+        print(f"{scenario:>10} {policy:>16} {result['ok']:>4} {result['sent']:>9} {result['seconds']:>9.2f}")
+
+    with MockServer(error_rate=0.2, seed=7) as server:
+        row('flaky', 'fixed sleep', fetch_all(server, make_client(FixedDelayPolicy(max_attempts=4))))
+    with MockServer(error_rate=0.2, seed=7) as server:
+        row('flaky', 'jittered', fetch_all(server, make_client(jittered(max_attempts=4))))
+
+    with MockServer(rate_limit_every=4, retry_after=1) as server:
+        client = make_client(jittered(max_attempts=4))
+        result = fetch_all(server, client)
+        row('throttled', 'Retry-After', result)
+        waited = result['seconds'] >= 1.0
+        print(f"{'':>10} {'✓' if waited else '✗'} retries waited for Retry-After "
+              f"({server.faults} rate-limited answers)")
+
+    with MockServer(down=True) as server:
+        row('down', 'no breaker', fetch_all(server, make_client(jittered(max_attempts=4),
+                                                                failure_threshold=10 ** 9)))
+    with MockServer(down=True) as server:
+        client = make_client(jittered(max_attempts=4), failure_threshold=5)
+        row('down', 'breaker (5)', fetch_all(server, client))
+
+    stats = client.report()
+    print(f"\nHistogram buckets for the last run: {next(iter(stats['latency'].values()))['buckets']}")
+
+
+if __name__ == "__main__":
+    main()
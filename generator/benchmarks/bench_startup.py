@@ -0,0 +1,61 @@
+"""
+Measure CLI cold-start import cost per subcommand with `python -X importtime`
+
+Each row imports what the subcommand's code path imports, in a fresh
+interpreter, and reports the summed top-level import time and whether
+pandas / matplotlib were loaded. The "eager" row reproduces the old
+package __init__, which imported every submodule (matplotlib included)
+on any `from zera_tracker import ...`.
+
+Run from the generator directory:
+    python -m benchmarks.bench_startup
+"""
+
+import statistics
+import subprocess
+import sys
+
+RUNS = 5
+
+PATHS = {
+    'eager (before)': "import main, zera_tracker.fetcher, zera_tracker.consolidator, "
+                      "zera_tracker.visualizer, zera_tracker.render",
+    'fetch': "import main, zera_tracker.fetcher, zera_tracker.client",
+    'consolidate': "import main, zera_tracker.fetcher, zera_tracker.pipeline, zera_tracker.consolidator",
+    'export': "import main, zera_tracker.pipeline, zera_tracker.consolidator, zera_tracker.export",
+    'render': "import main, zera_tracker.pipeline, zera_tracker.consolidator, zera_tracker.render, "
+              "zera_tracker.visualizer",
+}
+
+
+def import_profile(statement: str):
+    """Total top-level import time (ms) and loaded module names for one run"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                            capture_output=True, text=True, check=True)
+    total_us = 0
+    modules = set()
+    for line in result.stderr.splitlines():
+        # "import time: <self us> | <cumulative us> | <indent><module>"
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        name = name[1:]
+        modules.add(name.strip())
+        if not name.startswith(' '):  # Top-level imports only (nested ones are included)
+            total_us += int(cumulative_us)
+    return total_us / 1000, modules
+
+
+def main():
+    print(f"{'path':>16} {'import (ms)':>12} {'pandas':>7} {'matplotlib':>11}")
+    for name, statement in PATHS.items():
+        timings = []
+        for _ in range(RUNS):
+            ms, modules = import_profile(statement)
+            timings.append(ms)
+        print(f"{name:>16} {statistics.median(timings):>12.0f} {'yes' if 'pandas' in modules else 'no':>7} "
+              f"{'yes' if 'matplotlib' in modules else 'no':>11}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,356 @@
+"""
+Local GeckoTerminal stand-in for benchmarks, load and integration tests
+
+Serves GET /networks/{network}/pools/{address}/ohlcv/{timeframe} with the
+API's paging parameters (`before_timestamp`, `limit`, `aggregate`), gzip,
+ETags, and injectable latency, rate limiting and errors. Candles are either
+synthetic (a deterministic random walk per pool address) or replayed from
+data the tracker recorded: an API cache directory, or pools built with
+synthetic.make_token_data.
+
+In code:
+    with MockServer(latency=0.05, rate_limit_per_minute=30) as server:
+        config.BASE_URL = server.base_url
+
+Standalone, then point the tracker at it:
+    python -m benchmarks.mock_server --port 8080 --rate-limit 30 --latency 0.2
+    python main.py --base-url http://127.0.0.1:8080 --output-dir output_stub
+"""
+
+import argparse
+import collections
+import gzip
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from zera_tracker.fetcher import TIMEFRAME_SECONDS, load_cache, parse_ohlcv_array
+
+from .synthetic import make_api_response, make_ohlcv_list
+
+OHLCV_PATH = re.compile(r"^/networks/(?P<network>[^/]+)/pools/(?P<address>[^/]+)/ohlcv/(?P<timeframe>[^/?]+)")
+
+# `aggregate` values GeckoTerminal accepts per timeframe
+AGGREGATES = {'minute': (1, 5, 15), 'hour': (1, 4, 12), 'day': (1,)}
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+
+def pools_from_token_data(all_pool_data: Dict) -> Dict[str, List[List[float]]]:
+    """
+    Map pool address to newest-first OHLCV rows
+
+    Args:
+        all_pool_data: {pool name: {'info', 'data'}}, as returned by
+            fetch_all_pools, load_cache or synthetic.make_token_data
+    """
+    pools = {}
+    for pool_data in all_pool_data.values():
+        if not pool_data.get('data'):
+            continue
+        rows = parse_ohlcv_array(pool_data['data']).tolist()
+        for row in rows:
+            row[0] = int(row[0])
+        pools[pool_data['info']['address']] = sorted(rows, key=lambda row: row[0], reverse=True)
+    return pools
+
+
+def load_recorded(cache_path: str) -> Dict[str, List[List[float]]]:
+    """
+    Pools recorded by the tracker, for replay
+
+    Args:
+        cache_path: API cache directory (e.g. output/api_cache) or legacy JSON cache file
+
+    Raises:
+        FileNotFoundError: If nothing could be loaded from cache_path
+    """
+    data = load_cache(cache_path)
+    if not data:
+        raise FileNotFoundError(f"No recorded pool data in {cache_path}")
+    return pools_from_token_data(data)
+
+
+def aggregate_rows(rows: List[List[float]], seconds: int) -> List[List[float]]:
+    """
+    Merge newest-first candles into `seconds`-wide buckets aligned to the epoch
+
+    Each bucket takes the oldest open, highest high, lowest low, newest
+    close and summed volume, and is stamped with the bucket start.
+    """
+    buckets = []
+    for row in rows:
+        start = row[0] - row[0] % seconds
+        if buckets and buckets[-1][0] == start:
+            bucket = buckets[-1]
+            bucket[1] = row[1]  # Rows go back in time, so the last seen open is the oldest
+            bucket[2] = max(bucket[2], row[2])
+            bucket[3] = min(bucket[3], row[3])
+            bucket[5] += row[5]
+        else:
+            buckets.append([start, row[1], row[2], row[3], row[4], row[5]])
+    return buckets
+
+
+class MockServer:
+    """
+    Threaded HTTP server answering the OHLCV endpoint
+
+    Faults can be injected to exercise the retry policy and circuit breaker:
+    a random share of requests answered with `error_status`, every n-th
+    request rate limited with 429, a per-minute quota like GeckoTerminal's
+    (429 with the seconds until a slot frees as Retry-After), or the whole
+    host down. The attributes can be changed while the server runs; the
+    counters (requests, faults, rate_limited, not_modified) are read the
+    same way.
+    """
+
+    def __init__(self, latency: float = 0.0, candles: int = 100, step_seconds: int = None,
+                 keep_alive: bool = True, etags: bool = True, error_rate: float = 0.0,
+                 error_status: int = 503, rate_limit_every: int = 0, retry_after: float = None,
+                 down: bool = False, seed: int = 0, jitter: float = 0.0,
+                 rate_limit_per_minute: int = 0, pools: Dict = None, end_at_now: bool = False,
+                 host: str = '127.0.0.1', port: int = 0):
+        """
+        Args:
+            latency: Seconds added to every answer
+            candles: Synthetic candles per pool
+            step_seconds: Synthetic candle width (default: the requested timeframe's)
+            keep_alive: Speak HTTP/1.1 with persistent connections
+            etags: Send ETags and answer If-None-Match with 304
+            error_rate: Share of requests failed with error_status
+            error_status: Status for error_rate and `down` faults
+            rate_limit_every: Answer every n-th request with 429
+            retry_after: Retry-After seconds sent with injected 429/503s
+            down: Fail every request
+            seed: Seed for error_rate and jitter
+            jitter: Extra uniform random latency, up to this many seconds
+            rate_limit_per_minute: Requests allowed per sliding minute (0: no quota)
+            pools: {address: newest-first rows} to serve instead of synthetic
+                candles (see load_recorded, pools_from_token_data); other
+                addresses get 404
+            end_at_now: Synthetic candles end at the current candle, like the
+                live API, instead of starting at a fixed timestamp
+            host, port: Address to listen on (port 0 picks a free one)
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.rate_limit_every = rate_limit_every
+        self.rate_limit_per_minute = rate_limit_per_minute
+        self.retry_after = retry_after
+        self.down = down
+        self.faults = 0
+        self.rate_limited = 0
+        self._rng = random.Random(seed)
+        self._recent = collections.deque()  # Accepted request times in the quota window
+        self.candles = candles
+        self.step_seconds = step_seconds
+        self.pools = pools
+        self.end_at_now = end_at_now
+        self.etags = etags
+        self.requests = 0
+        self.not_modified = 0
+        self.keep_alive = keep_alive
+        self._lock = threading.Lock()
+        self._series = {}  # (address, step, end) -> synthetic rows
+        self._httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address
+        return f"http://{host}:{port}"
+
+    def _rows(self, address: str, timeframe: str) -> List[List[float]]:
+        """Newest-first candles of a pool, or None for an unknown pool"""
+        if self.pools is not None:
+            return self.pools.get(address)
+
+        step = self.step_seconds or TIMEFRAME_SECONDS[timeframe]
+        end = int(time.time()) // step * step if self.end_at_now else None
+        key = (address, step, end)
+        with self._lock:
+            rows = self._series.get(key)
+        if rows is None:
+            seed = sum(map(ord, address))
+            if end is None:
+                rows = make_ohlcv_list(self.candles, step_seconds=step, seed=seed)
+            else:
+                rows = make_ohlcv_list(self.candles, start_ts=end - (self.candles - 1) * step,
+                                       step_seconds=step, seed=seed)
+            with self._lock:
+                self._series[key] = rows
+        return rows
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            # HTTP/1.1 keeps connections open between requests, like the real API
+            protocol_version = 'HTTP/1.1' if server.keep_alive else 'HTTP/1.0'
+            # Headers and body are separate writes; without TCP_NODELAY a kept-alive
+            # connection stalls on delayed ACKs
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                query = parse_qs(url.query)
+                match = OHLCV_PATH.match(url.path)
+                if not match:
+                    self._send_error(404, 'Not Found')
+                    return
+
+                with server._lock:
+                    server.requests += 1
+                    fault, retry_after = server._fault(server.requests)
+                    delay = server.latency + (server._rng.uniform(0, server.jitter) if server.jitter else 0)
+                if delay:
+                    time.sleep(delay)
+                if fault:
+                    self._send_error(fault, 'Injected fault', retry_after)
+                    return
+
+                timeframe = match.group('timeframe')
+                try:
+                    aggregate = int(query.get('aggregate', ['1'])[0])
+                    limit = min(int(query.get('limit', [str(DEFAULT_LIMIT)])[0]), MAX_LIMIT)
+                    before = int(query['before_timestamp'][0]) if 'before_timestamp' in query else None
+                except ValueError:
+                    self._send_error(400, 'Invalid query parameter')
+                    return
+                if aggregate not in AGGREGATES.get(timeframe, ()):
+                    self._send_error(400, f"Invalid timeframe/aggregate: {timeframe}/{aggregate}")
+                    return
+
+                rows = server._rows(match.group('address'), timeframe)
+                if rows is None:
+                    self._send_error(404, 'Pool not found')
+                    return
+
+                # Honor GeckoTerminal's paging parameters (rows are newest-first)
+                if aggregate > 1:
+                    rows = aggregate_rows(rows, TIMEFRAME_SECONDS[timeframe] * aggregate)
+                if before is not None:
+                    rows = [row for row in rows if row[0] < before]
+                rows = rows[:max(limit, 0)]
+
+                body = json.dumps(make_api_response(rows, pool_address=match.group('address'))).encode()
+                etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+                if server.etags and self.headers.get('If-None-Match') == etag:
+                    with server._lock:
+                        server.not_modified += 1
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                if server.etags:
+                    self.send_header('ETag', etag)
+                if 'gzip' in self.headers.get('Accept-Encoding', ''):
+                    body = gzip.compress(body)
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_error(self, status: int, title: str, retry_after: float = None):
+                body = json.dumps({'errors': [{'status': str(status), 'title': title}]}).encode()
+                self.send_response(status)
+                if retry_after is not None:
+                    self.send_header('Retry-After', str(int(math.ceil(retry_after))))
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def _fault(self, request_number: int):
+        """(status, Retry-After) to fail this request with, or (None, None) (called under the lock)"""
+        if self.down:
+            self.faults += 1
+            return self.error_status, self.retry_after if self.error_status in (429, 503) else None
+        if self.rate_limit_per_minute:
+            now = time.monotonic()
+            while self._recent and now - self._recent[0] >= 60:
+                self._recent.popleft()
+            if len(self._recent) >= self.rate_limit_per_minute:
+                self.faults += 1
+                self.rate_limited += 1
+                return 429, 60 - (now - self._recent[0])
+            self._recent.append(now)
+        if self.rate_limit_every and request_number % self.rate_limit_every == 0:
+            self.faults += 1
+            self.rate_limited += 1
+            return 429, self.retry_after
+        if self.error_rate and self._rng.random() < self.error_rate:
+            self.faults += 1
+            return self.error_status, self.retry_after if self.error_status in (429, 503) else None
+        return None, None
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local GeckoTerminal OHLCV stand-in')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8080)
+    parser.add_argument('--recorded', metavar='PATH',
+                        help='Replay an API cache (e.g. output/api_cache) instead of synthetic candles')
+    parser.add_argument('--candles', type=int, default=1000, help='Synthetic candles per pool')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every answer')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random latency, up to this many seconds')
+    parser.add_argument('--rate-limit', type=int, default=0, metavar='PER_MINUTE',
+                        help='Answer 429 with Retry-After beyond this many requests per minute')
+    parser.add_argument('--rate-limit-every', type=int, default=0, metavar='N',
+                        help='Answer every N-th request with 429')
+    parser.add_argument('--retry-after', type=float, help='Retry-After seconds for injected 429/503s')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Share of requests that fail')
+    parser.add_argument('--error-status', type=int, default=503)
+    parser.add_argument('--no-etags', action='store_true', help='Never answer 304 Not Modified')
+    args = parser.parse_args()
+
+    pools = load_recorded(args.recorded) if args.recorded else None
+    server = MockServer(latency=args.latency, jitter=args.jitter, candles=args.candles,
+                        rate_limit_per_minute=args.rate_limit, rate_limit_every=args.rate_limit_every,
+                        retry_after=args.retry_after, error_rate=args.error_rate,
+                        error_status=args.error_status, etags=not args.no_etags, pools=pools,
+                        end_at_now=True, host=args.host, port=args.port)
+    source = f"{len(pools)} recorded pools" if pools is not None else f"{args.candles} synthetic candles per pool"
+    print(f"✓ GeckoTerminal stand-in at {server.base_url} ({source}), Ctrl+C to stop")
+    print(f"  python main.py --base-url {server.base_url} --output-dir output_stub")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        print(f"\n{server.requests} requests, {server.rate_limited} rate limited, "
+              f"{server.faults} faults, {server.not_modified} not modified")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,304 @@
+"""
+Per-stage benchmark suite on synthetic tokens at several scales
+
+Each class covers one pipeline stage and follows asv's conventions
+(`params`/`param_names`, `setup`, `time_*` and `peakmem_*` methods), so
+the suite can also be collected by asv. Without it, run from the generator
+directory:
+
+    python -m benchmarks.suite                       # every stage, every scale
+    python -m benchmarks.suite --scale small --bench Unify
+    python -m benchmarks.suite --json before.json    # save results
+    python -m benchmarks.suite --compare before.json # ratio against saved results
+
+time_* results are the best and median of `repeat` runs in seconds;
+peakmem_* results are the peak traced Python/NumPy allocation (tracemalloc)
+of one run in MB.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from functools import lru_cache
+
+from zera_tracker.consolidator import (
+    add_migration_markers,
+    build_rollups,
+    create_unified_dataframe,
+    get_summary_stats,
+    interpolate_migration_gaps
+)
+from zera_tracker.fetcher import parse_ohlcv_array
+
+from .synthetic import make_token_data
+
+# Scale name -> (pools N, candles per pool M, migrations K). "large" has two
+# pools per era, so stitching has overlapping candles to resolve.
+SCALES = {
+    'small': (3, 1_000, 2),
+    'medium': (3, 10_000, 2),
+    'large': (6, 100_000, 2)
+}
+
+
+@lru_cache(maxsize=None)
+def scenario(scale: str):
+    """(token, all_pool_data) for a scale, generated once per process"""
+    pools, candles, migrations = SCALES[scale]
+    return make_token_data(pools, candles, migrations, step_seconds=3600, seed=1)
+
+
+@lru_cache(maxsize=None)
+def _unified(scale: str):
+    token, all_pool_data = scenario(scale)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return create_unified_dataframe(all_pool_data)
+
+
+@lru_cache(maxsize=None)
+def _consolidated(scale: str):
+    token, _ = scenario(scale)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return add_migration_markers(interpolate_migration_gaps(_unified(scale), token=token), token=token)
+
+
+class StageSuite:
+    """Shared asv parameters: every stage runs at every scale"""
+    params = list(SCALES)
+    param_names = ['scale']
+    repeat = 3
+    timeout = 600
+
+
+class Parse(StageSuite):
+    """Fetch stage, minus the network: API answers to arrays"""
+
+    def setup(self, scale):
+        _, self.all_pool_data = scenario(scale)
+
+    def time_parse_ohlcv_array(self, scale):
+        for pool_data in self.all_pool_data.values():
+            parse_ohlcv_array(pool_data['data'])
+
+
+class Unify(StageSuite):
+    def setup(self, scale):
+        _, self.all_pool_data = scenario(scale)
+
+    def time_create_unified_dataframe(self, scale):
+        create_unified_dataframe(self.all_pool_data)
+
+    def peakmem_create_unified_dataframe(self, scale):
+        create_unified_dataframe(self.all_pool_data)
+
+
+class Interpolate(StageSuite):
+    def setup(self, scale):
+        self.token, _ = scenario(scale)
+        self.df = _unified(scale).copy()
+
+    def time_interpolate_migration_gaps(self, scale):
+        interpolate_migration_gaps(self.df, token=self.token)
+
+    def peakmem_interpolate_migration_gaps(self, scale):
+        interpolate_migration_gaps(self.df, token=self.token)
+
+
+class Markers(StageSuite):
+    def setup(self, scale):
+        self.token, _ = scenario(scale)
+        self.df = _unified(scale).copy()
+
+    def time_add_migration_markers(self, scale):
+        add_migration_markers(self.df, token=self.token)
+
+
+class Rollups(StageSuite):
+    def setup(self, scale):
+        self.token, _ = scenario(scale)
+        self.df = _unified(scale)
+
+    def time_build_rollups(self, scale):
+        build_rollups(self.df, token=self.token)
+
+    def peakmem_build_rollups(self, scale):
+        build_rollups(self.df, token=self.token)
+
+
+class Stats(StageSuite):
+    def setup(self, scale):
+        self.token, _ = scenario(scale)
+        self.df = _consolidated(scale)
+
+    def time_get_summary_stats(self, scale):
+        get_summary_stats(self.df, token=self.token)
+
+
+class ExportCsv(StageSuite):
+    """Full CSV rewrite, including the row index sidecar"""
+
+    def setup(self, scale):
+        self.df = _consolidated(scale)
+        self.directory = tempfile.mkdtemp(prefix='bench_csv_')
+        self.path = f"{self.directory}/unified.csv"
+
+    def teardown(self, scale):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_export_csv(self, scale):
+        from zera_tracker.export import export_csv
+
+        for path in (self.path, f"{self.path}.index.npz"):
+            if os.path.exists(path):
+                os.remove(path)
+        export_csv(self.df, self.path)
+
+
+class ChartModel(StageSuite):
+    def setup(self, scale):
+        import matplotlib
+        matplotlib.use('Agg')
+        self.token, _ = scenario(scale)
+        self.df = _consolidated(scale)
+
+    def time_prepare_chart_model(self, scale):
+        from zera_tracker.visualizer import prepare_chart_model
+
+        prepare_chart_model(self.df, self.token)
+
+
+class Render(StageSuite):
+    """Main price chart with volume, from a prepared chart model"""
+    repeat = 1
+
+    def setup(self, scale):
+        import matplotlib
+        matplotlib.use('Agg')
+        from zera_tracker.visualizer import prepare_chart_model
+
+        self.token, _ = scenario(scale)
+        self.df = _consolidated(scale)
+        self.model = prepare_chart_model(self.df, self.token)
+        self.directory = tempfile.mkdtemp(prefix='bench_render_')
+
+    def teardown(self, scale):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def time_create_price_chart(self, scale):
+        from zera_tracker.visualizer import create_price_chart
+
+        create_price_chart(self.df, f"{self.directory}/chart.png", model=self.model, token=self.token)
+
+
+SUITES = [Parse, Unify, Interpolate, Markers, Rollups, Stats, ExportCsv, ChartModel, Render]
+
+
+def _measure(method, scale, kind: str, repeat: int):
+    """Run one benchmark method: (best, median) seconds, or (peak MB, None)"""
+    with contextlib.redirect_stdout(io.StringIO()):
+        if kind == 'peakmem':
+            tracemalloc.start()
+            method(scale)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            return peak / 1e6, None
+        samples = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            method(scale)
+            samples.append(time.perf_counter() - start)
+        return min(samples), statistics.median(samples)
+
+
+def run(scales, name_filter: str = None, repeat: int = None) -> dict:
+    """
+    Run the suite
+
+    Args:
+        scales: Scale names to run
+        name_filter: Only run benchmarks whose "Class.method" contains this
+        repeat: Timing runs per benchmark (default: each class's `repeat`)
+
+    Returns:
+        {"Class.method": {scale: {"best": ..., "median": ...} or {"peak_mb": ...}}}
+    """
+    results = {}
+    for suite in SUITES:
+        methods = [name for name in dir(suite) if name.startswith(('time_', 'peakmem_'))]
+        methods = [name for name in methods if not name_filter or name_filter in f"{suite.__name__}.{name}"]
+        if not methods:
+            continue
+        for scale in scales:
+            instance = suite()
+            with contextlib.redirect_stdout(io.StringIO()):
+                instance.setup(scale)
+            try:
+                for name in methods:
+                    kind = name.split('_', 1)[0]
+                    value, median = _measure(getattr(instance, name), scale, kind, repeat or suite.repeat)
+                    key = f"{suite.__name__}.{name}"
+                    result = {'peak_mb': value} if kind == 'peakmem' else {'best': value, 'median': median}
+                    results.setdefault(key, {})[scale] = result
+                    _print_row(key, scale, result)
+            finally:
+                if hasattr(instance, 'teardown'):
+                    instance.teardown(scale)
+    return results
+
+
+_baseline = {}
+
+
+def _print_row(key: str, scale: str, result: dict):
+    if 'peak_mb' in result:
+        value, unit = result['peak_mb'], 'MB'
+        line = f"{key:<50} {scale:<7} {value:>10.1f} {unit:<3}"
+    else:
+        value, unit = result['best'], 's'
+        line = f"{key:<50} {scale:<7} {value:>10.4f} {unit:<3} (median {result['median']:.4f})"
+    before = _baseline.get(key, {}).get(scale)
+    if before:
+        old = before.get('peak_mb', before.get('best'))
+        if old:
+            ratio = value / old
+            flag = "  ✗ slower" if ratio > 1.1 else "  ✓ faster" if ratio < 0.9 else ""
+            line += f"  {ratio:5.2f}x vs baseline{flag}"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Per-stage benchmarks on synthetic tokens')
+    parser.add_argument('--scale', action='append', choices=list(SCALES),
+                        help='Scale to run (repeatable; default: all)')
+    parser.add_argument('--bench', help='Only run benchmarks whose Class.method contains this')
+    parser.add_argument('--repeat', type=int, help='Timing runs per benchmark')
+    parser.add_argument('--json', metavar='PATH', help='Save results as JSON')
+    parser.add_argument('--compare', metavar='PATH', help='Show ratios against saved results')
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            _baseline.update(json.load(f)['results'])
+
+    scales = args.scale or list(SCALES)
+    for scale in scales:
+        pools, candles, migrations = SCALES[scale]
+        print(f"{scale}: {pools} pools x {candles:,} hourly candles, {migrations} migrations")
+    print()
+    results = run(scales, name_filter=args.bench, repeat=args.repeat)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'scales': {scale: SCALES[scale] for scale in scales}, 'results': results}, f, indent=2)
+        print(f"\n✓ Results saved to: {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Synthetic GeckoTerminal-shaped OHLCV data for offline benchmarks
+
+make_ohlcv_list / make_api_response produce one pool's API answer;
+make_token_data builds a whole token (N pools x M candles x K migrations)
+with its TokenConfig, in the shape fetch_all_pools returns.
+"""
+
+import random
+import uuid
+from typing import Dict, List, Tuple
+
+from zera_tracker.fetcher import TIMEFRAME_SECONDS
+from zera_tracker.tokens import TokenConfig
+
+# Quote token of every synthetic pool, as GeckoTerminal reports it for Solana pools
+QUOTE_TOKEN = {
+    'address': 'So11111111111111111111111111111111111111112',
+    'name': 'Wrapped SOL',
+    'symbol': 'SOL',
+    'coingecko_coin_id': 'wrapped-solana'
+}
+
+
+def make_ohlcv_list(num_candles: int, start_ts: int = 1_700_000_000,
+                    step_seconds: int = 86400, start_price: float = 1.0,
+                    seed: int = 0, volume: float = 50_000) -> List[List[float]]:
+    """
+    Generate a deterministic random-walk OHLCV list
+
+    Rows are newest-first, matching the GeckoTerminal `ohlcv_list` ordering:
+    [timestamp, open, high, low, close, volume]. `volume` is the mean
+    candle volume.
+    """
+    rng = random.Random(seed)
+    rows = []
+    price = start_price
+
+    for i in range(num_candles):
+        open_price = price
+        close = max(open_price * (1 + rng.gauss(0, 0.03)), 1e-9)
+        high = max(open_price, close) * (1 + abs(rng.gauss(0, 0.01)))
+        low = min(open_price, close) * (1 - abs(rng.gauss(0, 0.01)))
+        candle_volume = abs(rng.gauss(volume, volume * 0.4))
+        rows.append([start_ts + i * step_seconds, open_price, high, low, close, candle_volume])
+        price = close
+
+    rows.reverse()
+    return rows
+
+
+def make_api_response(ohlcv_list: List[List[float]], pool_address: str = 'MockPool',
+                      symbol: str = 'MOCK') -> dict:
+    """
+    Wrap an OHLCV list in the GeckoTerminal response envelope
+
+    Args:
+        ohlcv_list: Rows from make_ohlcv_list
+        pool_address: Pool the response is for (seeds the response id)
+        symbol: Base token symbol reported in `meta`
+    """
+    first = ohlcv_list[-1][0] if ohlcv_list else 0
+    return {
+        'data': {
+            'id': str(uuid.uuid5(uuid.NAMESPACE_URL, f"{pool_address}/{first}/{len(ohlcv_list)}")),
+            'type': 'ohlcv_request_response',
+            'attributes': {'ohlcv_list': ohlcv_list}
+        },
+        'meta': {
+            'base': {'address': f"{symbol}Mint", 'name': symbol.title(), 'symbol': symbol,
+                     'coingecko_coin_id': None},
+            'quote': dict(QUOTE_TOKEN)
+        }
+    }
+
+
+def make_token_data(num_pools: int = 3, candles_per_pool: int = 1_000, num_migrations: int = None,
+                    step_seconds: int = 3600, gap_candles: int = 24, start_ts: int = 1_700_000_000,
+                    seed: int = 0, name: str = 'synth', output_dir: str = None) -> Tuple[TokenConfig, Dict]:
+    """
+    Deterministic multi-pool token history with migrations
+
+    The timeline is cut into num_migrations + 1 eras of candles_per_pool
+    candles each. Pools are spread over the eras in order; with more pools
+    than eras, pools sharing an era trade over the same candles at 1% of
+    the era's first pool's volume, so stitching has overlaps to resolve
+    but mostly keeps the main pool, as with real secondary pools. Each
+    migration sits in the middle of a run of gap_candles missing candles,
+    so interpolation has a gap to fill. Each era's prices continue from the
+    previous era's last close, with a jump.
+
+    Args:
+        num_pools: N, number of pools
+        candles_per_pool: M, candles per pool
+        num_migrations: K, migration events (default: num_pools - 1; at most that)
+        step_seconds: Candle width in seconds (a GeckoTerminal timeframe's
+            width sets the token's timeframe to match)
+        gap_candles: Candles missing around each migration
+        start_ts: Timestamp of the first candle
+        seed: Random seed; equal arguments always give equal data
+        name: Token id (pool names and symbol derive from it)
+        output_dir: Token output directory (default: under config.OUTPUT_DIR)
+
+    Returns:
+        (token, all_pool_data), where all_pool_data maps pool name to
+        {'info': pool config, 'data': GeckoTerminal response}
+
+    Raises:
+        ValueError: If num_migrations is negative or leaves an era without a pool
+    """
+    if num_migrations is None:
+        num_migrations = num_pools - 1
+    if not 0 <= num_migrations < max(num_pools, 1):
+        raise ValueError(f"{num_pools} pools support 0 to {num_pools - 1} migrations, "
+                         f"not {num_migrations}")
+
+    rng = random.Random(seed)
+    symbol = name.upper()
+    eras = num_migrations + 1
+    era_seconds = (candles_per_pool + gap_candles) * step_seconds
+
+    pools, all_pool_data, migration_dates, migration_labels = {}, {}, {}, {}
+    era_first_pool, era_open, era_close = {}, {}, {}
+    for i in range(num_pools):
+        era = i * eras // num_pools
+        pool_name = f"{name}_pool{i}"
+        era_start = start_ts + era * era_seconds
+
+        if era not in era_first_pool:
+            era_first_pool[era] = pool_name
+            era_open[era] = 1.0
+            if era:
+                # Migration halfway through the gap before this era
+                previous = era_first_pool[era - 1]
+                event = f"{previous}_to_{pool_name}"
+                migration_dates[event] = era_start - gap_candles * step_seconds // 2
+                migration_labels[event] = f"{previous} → {pool_name}"
+                era_open[era] = era_close[era - 1] * rng.uniform(0.5, 2.0)
+
+        primary = era_first_pool[era] == pool_name
+        rows = make_ohlcv_list(candles_per_pool, start_ts=era_start, step_seconds=step_seconds,
+                               start_price=era_open[era], seed=seed * 1000 + i,
+                               volume=50_000 if primary else 500)
+        if primary:
+            era_close[era] = rows[0][4] if rows else era_open[era]  # Newest row first
+
+        pool_info = {
+            'address': f"{symbol}Pool{i:02d}{seed:x}",
+            'name': f"{symbol} Pool {i}",
+            'token_symbol': symbol,
+            'label': f"Pool {i}"
+        }
+        pools[pool_name] = pool_info
+        all_pool_data[pool_name] = {
+            'info': pool_info,
+            'data': make_api_response(rows, pool_address=pool_info['address'], symbol=symbol)
+        }
+
+    timeframe = {seconds: tf for tf, seconds in TIMEFRAME_SECONDS.items()}.get(step_seconds)
+    token = TokenConfig(name=name, symbol=symbol, pools=pools, migration_dates=migration_dates,
+                        migration_labels=migration_labels, timeframe=timeframe, output_dir=output_dir)
+    return token, all_pool_data
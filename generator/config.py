@@ -14,6 +14,38 @@ NETWORK = "solana"  # Network where pools are deployed (e.g., "solana", "ethereu
 #   "hour"   - Last ~4 days (100 hours) - RECOMMENDED for recent detail
 #   "day"    - Last ~3+ months (100 days) - REQUIRED for full migration history
 TIMEFRAME = "day"
+# Backfill mode (main.py --backfill) pages backwards with before_timestamp to
+# reach each pool's active_from date, lifting the 100-point window above.
+BACKFILL_PAGE_LIMIT = 1000  # Candles per request (GeckoTerminal maximum)
+
+# Request throttling
+# GeckoTerminal's public API allows roughly 30 calls per minute. All pool
+# requests share one token bucket, so raising MAX_CONCURRENT_REQUESTS only
+# helps until the per-minute quota is reached.
+RATE_LIMIT_PER_MINUTE = 30
+RATE_LIMIT_BURST = 5  # Requests allowed back-to-back before throttling starts
+MAX_CONCURRENT_REQUESTS = 8
+
+# Retries: exponential backoff with full jitter, at least as long as any
+# Retry-After header the API sends with a 429/503
+REQUEST_TIMEOUT = (5, 15)  # (connect, read) seconds
+RETRY_MAX_ATTEMPTS = 4
+RETRY_BASE_DELAY = 1.0  # Backoff ceiling for the first retry, doubling per attempt
+RETRY_MAX_DELAY = 30
+RETRY_AFTER_MAX = 120  # Longest Retry-After honoured
+# After this many consecutive failures, requests to the host fail fast for
+# CIRCUIT_RESET_SECONDS, then a single trial request decides whether to resume
+CIRCUIT_FAILURE_THRESHOLD = 5
+CIRCUIT_RESET_SECONDS = 60
+
+# Watch mode (main.py --watch) polls the active pool this many seconds after
+# each candle closes, giving GeckoTerminal time to publish it
+WATCH_SETTLE_SECONDS = 5
+# Charts re-rendered after each new candle in watch mode: any of "chart"
+# (price and volume), "price_only" (large price chart) and "comparison".
+# Each costs a few seconds at CHART_DPI; the others keep their last
+# full-run render, and an empty tuple renders none.
+WATCH_CHARTS = ("chart",)
 
 # Pool Configuration (in chronological order)
 # Each pool represents a phase in the token's migration history.
@@ -26,20 +58,26 @@ POOLS = {
         "address": "95AT5r4i85gfqeew2yR6BYFG8RLrY1d9ztPs7qrSKDVc",  # GeckoTerminal pool address
         "name": "M0N3Y (Original)",  # Human-readable pool name
         "token_symbol": "M0N3Y",  # Token symbol for this phase
-        "active_until": "2025-10-02"  # Date this pool became inactive (YYYY-MM-DD)
+        "active_until": "2025-10-02",  # Date this pool became inactive (YYYY-MM-DD)
+        "label": "MON3Y",  # Short name for chart legends (optional)
+        "color": "#FF6B6B"  # Chart color (optional, defaults to a palette)
     },
     "zera_Raydium": {
         "address": "Nn9VMHJTqgG9L9F8SP3GEuFWC5zVuHrADCwehh7N7Di",
         "name": "ZERA Raydium",
         "token_symbol": "ZERA",
         "active_from": "2025-10-02",  # Date this pool became active
-        "active_until": "2025-11-05"  # Date this pool became inactive
+        "active_until": "2025-11-05",  # Date this pool became inactive
+        "label": "Raydium",
+        "color": "#4ECDC4"
     },
     "zera_Meteora": {
         "address": "6oUJD1EHNVBNMeTpytmY2NxKWicz5C2JUbByUrHEsjhc",
         "name": "ZERA Meteora",
         "token_symbol": "ZERA",
-        "active_from": "2025-11-05"  # Current active pool (no active_until)
+        "active_from": "2025-11-05",  # Current active pool (no active_until)
+        "label": "Meteora",
+        "color": "#45B7D1"
     }
 }
 
@@ -51,14 +89,47 @@ MIGRATION_DATES = {
     "zera_Raydium_to_Meteora": 1762300800  # November 5, 2025 08:00:00 UTC
 }
 
+# Chart labels for migration events (default: event name with "_to_" → " → ")
+MIGRATION_LABELS = {
+    "mon3y_to_zera": "MON3Y → Raydium",
+    "zera_Raydium_to_Meteora": "Raydium → Meteora"
+}
+
 # Output Configuration
 # Customize output file locations and naming conventions
+TOKEN_SYMBOL = "ZERA"  # Shown in chart titles and the summary
 OUTPUT_DIR = "output"
 CSV_FILENAME = "zera_unified_price_history.csv"  # Change for different tokens
 CHART_FILENAME = "zera_price_chart.png"  # Change for different tokens
+# Also write <token>_parquet/, partitioned by pool and month (requires pyarrow)
+EXPORT_PARQUET = False
+# Also write <token>_chart_data/<tier>.json payloads for the webapp chart
+EXPORT_CHART_PAYLOADS = False
+CHART_PAYLOAD_TIERS = ['1h', '4h', '1d']  # Tiers finer than TIMEFRAME are skipped
+CHART_PAYLOAD_COMPRESSION = ['gzip']  # Add 'br' for brotli (requires the brotli package)
+CHART_PAYLOAD_MAX_CANDLES = 1500  # Longer tiers are merged into OHLC buckets (~1500px wide chart)
+CHART_OVERVIEW_POINTS = 500  # Close-price line (LTTB) written as overview.json
+
+# Chart resolution; candles beyond what the figure width can show at
+# CHART_PIXELS_PER_CANDLE are merged into OHLC buckets before drawing
+CHART_DPI = 300
+CHART_PIXELS_PER_CANDLE = 3
+
+# Instrumentation: every run writes <output>/run_report.json with per-stage
+# timings, peak memory and counters (None disables it). Set METRICS_TEXTFILE
+# (or pass --metrics-file) to also write the Prometheus text format.
+RUN_REPORT_FILENAME = "run_report.json"
+METRICS_TEXTFILE = None
+METRICS_PREFIX = "migrate_chart"
+METRICS_SAMPLE_INTERVAL = 0.02  # Seconds between RSS samples for per-stage peaks
 
 # To track a different token:
 # 1. Update POOLS with new pool addresses and migration dates
 # 2. Update MIGRATION_DATES with new migration timestamps
 # 3. Update OUTPUT filenames to match the new token name
 # 4. Optionally update NETWORK if tracking tokens on different chains
+#
+# To track several tokens in one run, put one JSON/YAML file per token in a
+# directory (see zera_tracker/tokens.py for the format) and run:
+#   python main.py --tokens tokens/
+TOKEN_BATCH_CONCURRENCY = 4  # Tokens consolidated/rendered at once in batch mode
@@ -3,7 +3,8 @@
 Token Migration Tracker - Main Orchestration Script
 
 This script tracks token price history across pool migrations and transitions.
-Currently configured for ZERA token, but can be adapted for any token migration.
+Currently configured for ZERA token, but can be adapted for any token migration,
+or run over a directory of token definitions with --tokens.
 
 This script:
 1. Fetches historical price data from GeckoTerminal for all configured pools
@@ -16,120 +17,512 @@ Configure pool addresses and migration dates in config.py to track different tok
 import os
 import sys
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from typing import Dict
 
 # Import our modules
+# pandas, matplotlib and the pipeline are imported inside the functions that
+# need them, so `main.py fetch` and `--help` start without loading them
 import config
-from src.zera_tracker import (
-    fetch_all_pools,
-    create_unified_dataframe,
-    interpolate_migration_gaps,
-    add_migration_markers,
-    get_summary_stats,
-    print_summary,
-    create_price_chart,
-    create_comparison_chart
-)
-
-
-def main(use_cache: bool = False):
+from zera_tracker import instrument
+from zera_tracker.tokens import TokenConfig, load_token_registry
+from zera_tracker.fetcher import ROLLUP_TIERS
+
+
+def _fetch(token: TokenConfig, use_cache: bool, backfill: bool, incremental: bool, tier: str):
+    """Fetch pool data from GeckoTerminal (or load it from cache / a rollup tier)"""
+    from zera_tracker.fetcher import fetch_all_pools, backfill_all_pools
+    from zera_tracker.client import default_client
+
+    if tier:
+        from zera_tracker.consolidator import load_rollup
+
+        rollup_df = load_rollup(tier, token=token)
+        if rollup_df is None:
+            raise Exception(f"No {tier} rollup found; run without --tier first")
+        print("\n✓ Data fetching completed")
+        return rollup_df
+    default_client().reset_stats()
+    if backfill:
+        all_pool_data = backfill_all_pools(token=token)
+    else:
+        all_pool_data = fetch_all_pools(use_cache=use_cache, incremental=incremental, token=token)
+    print("\n✓ Data fetching completed")
+    default_client().report()
+    return all_pool_data
+
+
+def _consolidate(fetched, token: TokenConfig):
+    """Build the unified frame (or finish a loaded rollup) with gap fills and markers"""
+    import pandas as pd
+    from zera_tracker.consolidator import (
+        create_unified_dataframe,
+        interpolate_migration_gaps,
+        add_migration_markers,
+        build_rollups,
+        save_rollups
+    )
+
+    if isinstance(fetched, pd.DataFrame):
+        df = fetched
+    else:
+        with instrument.span('unify'):
+            df = create_unified_dataframe(fetched)
+        # Persist every coarser tier so later runs can chart with --tier
+        with instrument.span('rollups'):
+            save_rollups(build_rollups(df, token=token), token=token)
+    instrument.count('rows_unified', len(df))
+    with instrument.span('interpolate'):
+        interpolated = interpolate_migration_gaps(df, token=token)
+    instrument.count('rows_interpolated', len(interpolated) - len(df))
+    with instrument.span('markers'):
+        df = add_migration_markers(interpolated, token=token)
+    print("✓ Data consolidation completed")
+    return df
+
+
+def _consolidate_key(token: TokenConfig):
+    """Everything besides the fetched data that the unified frame depends on"""
+    from zera_tracker import artifacts, consolidator
+    source = os.path.join(os.path.dirname(consolidator.__file__), 'consolidator.py')
+    return artifacts.config_fingerprint(token), artifacts.source_fingerprint(source)
+
+
+def _export_csv(df, token: TokenConfig, force: bool) -> str:
+    """Write the unified CSV unless an identical one is already on disk"""
+    from zera_tracker import artifacts
+    from zera_tracker.export import export_csv
+
+    os.makedirs(token.output_dir, exist_ok=True)
+    csv_path = token.output_path(token.csv_filename)
+    csv_inputs = artifacts.inputs_hash(artifacts.frame_fingerprint(df),
+                                       artifacts.config_fingerprint(token), 'csv')
+    if not force and artifacts.is_current(artifacts.load_manifest(), csv_path, csv_inputs):
+        print(f"✓ Data unchanged, skipped: {csv_path}")
+        return csv_path
+
+    # Appends just the new rows when the start of the file is unchanged
+    result = export_csv(df, csv_path)
+    instrument.count('csv_rows_written', result['rows_written'])
+    entries = {}
+    artifacts.record_artifact(entries, csv_path, csv_inputs)
+    artifacts.update_manifest(entries)
+    print(f"✓ Data exported to: {csv_path} ({result['mode']}, {result['rows_written']} rows written)")
+    print(f"  Total rows: {len(df)}")
+    print(f"  Columns: {', '.join(df.columns)}")
+    return csv_path
+
+
+def _export_parquet(df, token: TokenConfig) -> str:
+    """Write the pool/month-partitioned Parquet dataset"""
+    from zera_tracker.export import export_parquet
+
+    root = token.output_path(token.parquet_dirname)
+    result = export_parquet(df, root)
+    instrument.count('parquet_partitions_written', result['written'])
+    print(f"✓ Parquet dataset updated: {root} ({result['written']} partitions written, "
+          f"{result['unchanged']} unchanged, {result['removed']} removed)")
+    return root
+
+
+def _export_chart_payloads(df, token: TokenConfig, rollups: Dict = None) -> str:
+    """Write the per-tier JSON payloads consumed by the webapp chart (from `rollups` if given)"""
+    from zera_tracker.consolidator import build_rollups
+    from zera_tracker.export import export_chart_payloads
+
+    directory = token.output_path(token.chart_payload_dirname)
+    if rollups is None:
+        rollups = build_rollups(df, tiers=config.CHART_PAYLOAD_TIERS, token=token)
+    else:
+        rollups = {tier: rollups[tier] for tier in config.CHART_PAYLOAD_TIERS if tier in rollups}
+    results = export_chart_payloads(rollups, directory, token=token,
+                                    compression=config.CHART_PAYLOAD_COMPRESSION,
+                                    max_candles=config.CHART_PAYLOAD_MAX_CANDLES,
+                                    overview_points=config.CHART_OVERVIEW_POINTS)
+    print(f"✓ Chart payloads exported to: {directory}")
+    for tier, result in results.items():
+        sizes = ', '.join(f"{encoding} {size / 1024:.1f} KB" for encoding, size in result['bytes'].items())
+        print(f"  {tier}: {result['rows']} points ({sizes}){'' if result['written'] else ', unchanged'}")
+    return directory
+
+
+def _chart_paths(token: TokenConfig) -> Dict:
+    return {
+        'chart': token.output_path(token.chart_filename),
+        'price_only': token.output_path(token.large_chart_filename),
+        'comparison': token.output_path(token.comparison_chart_filename)
+    }
+
+
+def _render(df, token: TokenConfig, force: bool, max_workers: int = None, charts=None):
+    """Render the price, large price-only and comparison charts (or the `charts` among them)"""
+    from zera_tracker.render import render_charts
+
+    chart_paths = _chart_paths(token)
+    jobs = {
+        # Main price chart with volume
+        'chart': {'kind': 'price', 'df': df, 'output_path': chart_paths['chart'],
+                  'include_volume': True, 'token': token},
+        # Large price chart without volume
+        'price_only': {'kind': 'price', 'df': df, 'output_path': chart_paths['price_only'],
+                       'include_volume': False, 'token': token},
+        # Comparison chart
+        'comparison': {'kind': 'comparison', 'df': df, 'output_path': chart_paths['comparison'],
+                       'token': token}
+    }
+    if charts is not None:
+        jobs = {name: job for name, job in jobs.items() if name in charts}
+    # Shared chart model is computed once; figures render in parallel
+    paths = render_charts(list(jobs.values()), max_workers=max_workers, force=force)
+    print("✓ Visualizations completed")
+    return paths
+
+
+def _write_run_report(directory: str, command: str, metrics_file: str = None,
+                      summary: bool = True, **extra):
+    """
+    Write the run's instrumentation as JSON (and optionally Prometheus text)
+
+    Args:
+        directory: Directory for config.RUN_REPORT_FILENAME
+        command: Recorded as the report's 'command' field
+        metrics_file: Prometheus text file (default: config.METRICS_TEXTFILE)
+        summary: Also print the timing table
+        **extra: Additional report fields
+    """
+    recorder = instrument.recorder()
+    if summary:
+        recorder.print_summary()
+    if config.RUN_REPORT_FILENAME:
+        path = f"{directory}/{config.RUN_REPORT_FILENAME}"
+        recorder.write_report(path, command=command, timeframe=config.TIMEFRAME, **extra)
+        if summary:
+            print(f"✓ Run report: {path}")
+    metrics_file = metrics_file or config.METRICS_TEXTFILE
+    if metrics_file:
+        recorder.write_prometheus(metrics_file)
+        if summary:
+            print(f"✓ Metrics: {metrics_file}")
+
+
+def run_token(token: TokenConfig, use_cache: bool = False, backfill: bool = False,
+              incremental: bool = False, tier: str = None, force: bool = False,
+              fetched: Dict = None, render_workers: int = None, parquet: bool = None,
+              chart_payloads: bool = None, outputs=('export', 'render')) -> Dict:
+    """
+    Run the fetch → consolidate → stats → CSV/charts pipeline for one token
+
+    Args:
+        token: Token to process
+        use_cache, backfill, incremental, tier: Fetch mode (see main)
+        force: Ignore memoized stages and regenerate every output
+        fetched: Already-fetched pool data (batch mode), skips the API
+        render_workers: Chart worker processes (default: one per CPU)
+        parquet: Also export partitioned Parquet (default: config.EXPORT_PARQUET)
+        chart_payloads: Also export webapp chart payloads (default: config.EXPORT_CHART_PAYLOADS)
+        outputs: Output stages to run after stats: 'export' (CSV and the
+            optional Parquet/chart payloads) and/or 'render'
+
+    Returns:
+        Pipeline outputs by name ('df', 'stats', 'csv_path', 'chart_paths')
+    """
+    from zera_tracker.pipeline import Stage, run_pipeline
+    from zera_tracker.consolidator import get_summary_stats
+
+    if fetched is not None:
+        fetch_description = f"Using pool data fetched for {token.symbol}"
+    elif tier:
+        fetch_description = f"Loading pre-aggregated {tier} rollup"
+    elif backfill:
+        fetch_description = "Backfilling full history from GeckoTerminal API"
+    elif use_cache:
+        fetch_description = "Loading data from cache"
+    else:
+        fetch_description = "Fetching data from GeckoTerminal API"
+
+    if fetched is not None:
+        fetch = lambda: fetched
+    else:
+        fetch = lambda: _fetch(token, use_cache, backfill, incremental, tier)
+
+    # CSV export and chart rendering only depend on the unified frame, so
+    # they run concurrently; consolidation is memoized on its inputs' hash
+    stages = [
+        Stage('fetch', fetch, output='pool_data', description=fetch_description),
+        Stage('consolidate', lambda data: _consolidate(data, token), inputs=('pool_data',),
+              output='df', description="Consolidating data from all pools",
+              memoize=True, key=lambda: _consolidate_key(token)),
+        Stage('stats', lambda df: get_summary_stats(df, token=token), inputs=('df',),
+              output='stats', description="Calculating summary statistics",
+              memoize=True, key=lambda: _consolidate_key(token)),
+    ]
+
+    if 'export' in outputs:
+        stages.append(Stage('export_csv', lambda df: _export_csv(df, token, force), inputs=('df',),
+                            output='csv_path', description="Exporting data to CSV", fatal=False))
+        if parquet is None:
+            parquet = config.EXPORT_PARQUET
+        if parquet:
+            stages.append(Stage('export_parquet', lambda df: _export_parquet(df, token), inputs=('df',),
+                                output='parquet_path', description="Exporting partitioned Parquet",
+                                fatal=False))
+        if chart_payloads is None:
+            chart_payloads = config.EXPORT_CHART_PAYLOADS
+        if chart_payloads:
+            stages.append(Stage('export_chart_payloads', lambda df: _export_chart_payloads(df, token),
+                                inputs=('df',), output='chart_payload_dir',
+                                description="Exporting webapp chart payloads", fatal=False))
+    if 'render' in outputs:
+        stages.append(Stage('render', lambda df: _render(df, token, force, render_workers), inputs=('df',),
+                            output='chart_paths', description="Generating visualizations", fatal=False))
+
+    return run_pipeline(stages, cache_dir=f"{token.output_dir}/stages", force=force,
+                        labels={'token': token.symbol})
+
+
+def _refresh(df, token: TokenConfig, since: int, rollups: Dict = None, parquet: bool = False,
+             chart_payloads: bool = False) -> Dict:
+    """
+    Regenerate the outputs that depend on the unified frame after new candles
+
+    Args:
+        df: Unified frame with the new candles folded in
+        token: Token being watched
+        since: Timestamp of the earliest row that may have changed
+        rollups: Rollup tiers from the previous refresh (default: build them)
+        parquet, chart_payloads: Also refresh these exports
+
+    Returns:
+        The updated rollup tiers, for the next refresh
+    """
+    from zera_tracker.consolidator import build_rollups, save_rollups, update_rollups
+
+    labels = {'token': token.symbol}
+    with instrument.span('rollups', **labels):
+        # Only the buckets from the changed candles onward are rebuilt
+        if rollups is None:
+            rollups = build_rollups(df, token=token)
+        else:
+            rollups = update_rollups(rollups, df, since)
+        save_rollups(rollups, token=token)
+    with instrument.span('export_csv', **labels):
+        _export_csv(df, token, force=False)
+    if parquet:
+        with instrument.span('export_parquet', **labels):
+            _export_parquet(df, token)
+    if chart_payloads:
+        with instrument.span('export_chart_payloads', **labels):
+            _export_chart_payloads(df, token, rollups)
+    # Render in-process: the watcher already has matplotlib loaded, and
+    # spawning workers would cost more than the charts themselves
+    if config.WATCH_CHARTS:
+        with instrument.span('render', **labels):
+            _render(df, token, force=False, max_workers=1, charts=config.WATCH_CHARTS)
+    return rollups
+
+
+def main(use_cache: bool = False, backfill: bool = False, incremental: bool = False,
+         tier: str = None, force: bool = False, watch: bool = False, parquet: bool = None,
+         chart_payloads: bool = None, metrics_file: str = None):
     """Main execution function"""
+    from zera_tracker.pipeline import PipelineError
+    from zera_tracker.consolidator import print_summary
+
+    token = TokenConfig.from_config()
+
     print("="*70)
     print("TOKEN MIGRATION TRACKER")
     print("="*70)
     print(f"\nStarting data collection at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("\nThis tool tracks complete price history across pool migrations.")
-    print(f"Currently configured for: {config.CSV_FILENAME.replace('_unified_price_history.csv', '').upper()}\n")
+    print(f"Currently configured for: {token.symbol}\n")
 
-    # Step 1: Fetch data from GeckoTerminal API (or load from cache)
-    if use_cache:
-        print("\n[1/5] Loading data from cache...")
-    else:
-        print("\n[1/5] Fetching data from GeckoTerminal API...")
-    print("-" * 70)
     try:
-        all_pool_data = fetch_all_pools(use_cache=use_cache)
-        print("\n✓ Data fetching completed")
-    except Exception as e:
-        print(f"\n✗ Error fetching data: {e}")
+        results = run_token(token, use_cache=use_cache, backfill=backfill,
+                            incremental=incremental, tier=tier, force=force, parquet=parquet,
+                            chart_payloads=chart_payloads)
+    except PipelineError:
+        _write_run_report(token.output_dir, 'run', metrics_file, token=token.symbol, outcome='failed')
         sys.exit(1)
 
-    # Step 2: Consolidate data
-    print("\n[2/5] Consolidating data from all pools...")
-    print("-" * 70)
-    try:
-        df = create_unified_dataframe(all_pool_data)
-        df = interpolate_migration_gaps(df)
-        df = add_migration_markers(df)
-        print("✓ Data consolidation completed")
-    except Exception as e:
-        print(f"\n✗ Error consolidating data: {e}")
+    df, stats = results['df'], results['stats']
+    print_summary(stats)
+    chart_paths = _chart_paths(token)
+
+    # Final summary
+    print("\n" + "="*70)
+    print("COMPLETION SUMMARY")
+    print("="*70)
+    print(f"\n✓ Successfully tracked {len(df)} days of price history")
+    print(f"✓ From: {stats['start_date']}")
+    print(f"✓ To:   {stats['end_date']}")
+    print(f"\nGenerated files:")
+    print(f"  📊 {token.output_path(token.csv_filename)}")
+    print(f"  📈 {chart_paths['chart']}")
+    print(f"  📈 {chart_paths['price_only']} (large, price only)")
+    print(f"  📊 {chart_paths['comparison']}")
+    _write_run_report(token.output_dir, 'run', metrics_file, token=token.symbol, outcome='ok',
+                      rows=len(df))
+    print("\n" + "="*70)
+    print(f"Completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print("="*70 + "\n")
+
+    if watch:
+        from zera_tracker.consolidator import build_rollups
+        from zera_tracker.watch import watch as watch_pools
+
+        print("Watching active pools for new candles (Ctrl+C to stop)...")
+        if parquet is None:
+            parquet = config.EXPORT_PARQUET
+        if chart_payloads is None:
+            chart_payloads = config.EXPORT_CHART_PAYLOADS
+        # Built once here, then only their trailing buckets are refreshed
+        rollups = build_rollups(df, token=token)
+
+        def on_new_candles(new_df, since):
+            nonlocal rollups
+            # Each refresh replaces the report with its own timings
+            instrument.recorder().reset()
+            rollups = _refresh(new_df, token, since, rollups, parquet, chart_payloads)
+            _write_run_report(token.output_dir, 'watch', metrics_file, summary=False,
+                              token=token.symbol, outcome='ok', rows=len(new_df))
+
+        watch_pools(df, on_new_candles, token=token)
+
+
+def fetch_main(backfill: bool = False, incremental: bool = False, metrics_file: str = None):
+    """
+    Fetch pool data into the API cache without consolidating or rendering
+
+    Imports neither pandas nor matplotlib; follow with the consolidate,
+    export or render subcommands, which read the cache.
+
+    Args:
+        backfill: Page backwards through each pool's full history
+        incremental: Only fetch candles newer than the per-pool cache
+        metrics_file: Also write Prometheus text metrics here (default: config.METRICS_TEXTFILE)
+    """
+    from zera_tracker.fetcher import save_cache
+
+    token = TokenConfig.from_config()
+    print(f"Fetching {token.symbol} pools at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    with instrument.span('fetch', token=token.symbol):
+        all_pool_data = _fetch(token, use_cache=False, backfill=backfill, incremental=incremental,
+                               tier=None)
+    if backfill:
+        # fetch_all_pools caches its own results; backfills land in their own files
+        save_cache(all_pool_data, f"{token.output_dir}/api_cache")
+
+    failed = [pool_name for pool_name, pool_data in all_pool_data.items() if pool_data.get('data') is None]
+    for pool_name in failed:
+        print(f"✗ {pool_name}: {all_pool_data[pool_name].get('error', 'no data')}")
+    _write_run_report(token.output_dir, 'fetch', metrics_file, token=token.symbol,
+                      outcome='failed' if failed else 'ok')
+    if failed:
         sys.exit(1)
 
-    # Step 3: Generate summary statistics
-    print("\n[3/5] Calculating summary statistics...")
-    print("-" * 70)
+
+def cached_main(command: str, tier: str = None, force: bool = False, parquet: bool = None,
+                chart_payloads: bool = None, metrics_file: str = None):
+    """
+    Run one step of the pipeline from the API cache
+
+    Args:
+        command: 'consolidate' (unified frame and statistics only), 'export'
+            (CSV plus optional Parquet/chart payloads) or 'render' (charts)
+        tier: Use a persisted rollup tier instead of the API cache
+        force: Ignore memoized stages and regenerate the outputs
+        parquet, chart_payloads: Extra exports for 'export' (default: config)
+        metrics_file: Also write Prometheus text metrics here (default: config.METRICS_TEXTFILE)
+    """
+    from zera_tracker.pipeline import PipelineError
+
+    outputs = {'consolidate': (), 'export': ('export',), 'render': ('render',)}[command]
+    token = TokenConfig.from_config()
     try:
-        stats = get_summary_stats(df)
-        print_summary(stats)
-    except Exception as e:
-        print(f"\n✗ Error calculating stats: {e}")
+        results = run_token(token, use_cache=True, tier=tier, force=force, parquet=parquet,
+                            chart_payloads=chart_payloads, outputs=outputs)
+    except PipelineError:
+        _write_run_report(token.output_dir, command, metrics_file, token=token.symbol, outcome='failed')
         sys.exit(1)
 
-    # Step 4: Export data to CSV
-    print("\n[4/5] Exporting data to CSV...")
-    print("-" * 70)
-    try:
-        os.makedirs(config.OUTPUT_DIR, exist_ok=True)
-        csv_path = f"{config.OUTPUT_DIR}/{config.CSV_FILENAME}"
-        df.to_csv(csv_path, index=False)
-        print(f"✓ Data exported to: {csv_path}")
-        print(f"  Total rows: {len(df)}")
-        print(f"  Columns: {', '.join(df.columns)}")
-    except Exception as e:
-        print(f"\n✗ Error exporting CSV: {e}")
+    if command == 'consolidate':
+        from zera_tracker.consolidator import print_summary
+        print_summary(results['stats'])
+    _write_run_report(token.output_dir, command, metrics_file, token=token.symbol, outcome='ok',
+                      rows=len(results['df']))
 
-    # Step 5: Generate visualizations
-    print("\n[5/5] Generating visualizations...")
-    print("-" * 70)
 
-    # Define paths before try block
-    chart_path = f"{config.OUTPUT_DIR}/{config.CHART_FILENAME}"
-    chart_price_only_path = f"{config.OUTPUT_DIR}/zera_price_chart_large.png"
-    comparison_path = f"{config.OUTPUT_DIR}/zera_comparison_chart.png"
+def batch_main(tokens_dir: str, use_cache: bool = False, incremental: bool = False,
+               force: bool = False, max_parallel: int = None, metrics_file: str = None):
+    """
+    Track every token defined in a registry directory
 
-    try:
-        # Main price chart with volume
-        create_price_chart(df, chart_path, include_volume=True)
+    Pools shared between tokens are fetched once; tokens are then
+    consolidated, exported and rendered in parallel, at most `max_parallel`
+    at a time.
 
-        # Large price chart without volume
-        create_price_chart(df, chart_price_only_path, include_volume=False)
+    Args:
+        tokens_dir: Directory of per-token JSON/YAML definitions
+        use_cache: Load each token's pool data from its cache instead of the API
+        incremental: Only fetch candles newer than the shared per-pool cache
+        force: Ignore memoized stages and regenerate every output
+        max_parallel: Tokens processed at once (default: config.TOKEN_BATCH_CONCURRENCY)
+        metrics_file: Also write Prometheus text metrics here (default: config.METRICS_TEXTFILE)
+    """
+    from zera_tracker.fetcher import fetch_all_pools, fetch_all_tokens
+    from zera_tracker.client import default_client
 
-        # Comparison chart
-        create_comparison_chart(df, comparison_path)
+    tokens = load_token_registry(tokens_dir)
+    if max_parallel is None:
+        max_parallel = config.TOKEN_BATCH_CONCURRENCY
+    max_parallel = max(1, min(max_parallel, len(tokens)))
 
-        print("✓ Visualizations completed")
-    except Exception as e:
-        print(f"\n✗ Error generating charts: {e}")
-        import traceback
-        traceback.print_exc()
+    print("="*70)
+    print("TOKEN MIGRATION TRACKER - BATCH")
+    print("="*70)
+    print(f"\nStarting batch at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Tokens: {', '.join(token.symbol for token in tokens)}\n")
+
+    if use_cache:
+        fetched = {token.name: fetch_all_pools(use_cache=True, token=token) for token in tokens}
+    else:
+        default_client().reset_stats()
+        with instrument.span('fetch'):
+            fetched = fetch_all_tokens(tokens, incremental=incremental)
+        default_client().report()
+
+    # Split the CPUs between the tokens rendering at the same time
+    render_workers = max(1, (os.cpu_count() or 1) // max_parallel)
+    failures = {}
+    with ThreadPoolExecutor(max_workers=max_parallel) as executor:
+        futures = {
+            token.symbol: executor.submit(run_token, token, force=force, fetched=fetched[token.name],
+                                          render_workers=render_workers)
+            for token in tokens
+        }
+        for symbol, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failures[symbol] = str(e)
 
-    # Final summary
     print("\n" + "="*70)
-    print("COMPLETION SUMMARY")
+    print("BATCH SUMMARY")
     print("="*70)
-    print(f"\n✓ Successfully tracked {len(df)} days of price history")
-    print(f"✓ From: {stats['start_date']}")
-    print(f"✓ To:   {stats['end_date']}")
-    print(f"\nGenerated files:")
-    print(f"  📊 {csv_path}")
-    print(f"  📈 {chart_path}")
-    print(f"  📈 {chart_price_only_path} (large, price only)")
-    print(f"  📊 {comparison_path}")
-    print("\n" + "="*70)
-    print(f"Completed at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    for token in tokens:
+        if token.symbol in failures:
+            print(f"✗ {token.symbol}: {failures[token.symbol]}")
+        else:
+            print(f"✓ {token.symbol}: {token.output_dir}")
+    _write_run_report(config.OUTPUT_DIR, 'batch', metrics_file,
+                      tokens=[token.symbol for token in tokens], failed=sorted(failures))
     print("="*70 + "\n")
 
+    if failures:
+        sys.exit(1)
+
 
 if __name__ == "__main__":
     # Parse command line arguments
@@ -138,10 +531,85 @@ if __name__ == "__main__":
     )
     parser.add_argument('--cache', action='store_true',
                        help='Use cached API data instead of fetching from GeckoTerminal')
+    parser.add_argument('--backfill', action='store_true',
+                       help='Page backwards through each pool\'s full history (resumable)')
+    parser.add_argument('--incremental', action='store_true',
+                       help='Only fetch candles newer than the per-pool cache; skip inactive pools')
+    parser.add_argument('--tier', choices=list(ROLLUP_TIERS),
+                       help='Chart and export a persisted rollup tier instead of fetching')
+    parser.add_argument('--force', action='store_true',
+                       help='Regenerate the CSV and charts even if their inputs are unchanged')
+    parser.add_argument('--parquet', action='store_true', default=None,
+                       help='Also export a Parquet dataset partitioned by pool and month (needs pyarrow)')
+    parser.add_argument('--chart-data', action='store_true', default=None,
+                       help='Also export compact per-tier JSON payloads for the webapp chart')
+    parser.add_argument('--watch', action='store_true',
+                       help='Keep running and refresh outputs as new candles close on the active pool')
+    parser.add_argument('--tokens', metavar='DIR',
+                       help='Track every token defined in a directory of JSON/YAML files')
+    parser.add_argument('--base-url', metavar='URL',
+                       help='GeckoTerminal API root to fetch from, e.g. a local stand-in '
+                            '(python -m benchmarks.mock_server)')
+    parser.add_argument('--output-dir', metavar='DIR',
+                       help=f'Directory for caches and outputs (default: {config.OUTPUT_DIR})')
+    parser.add_argument('--metrics-file', metavar='PATH',
+                       help='Also write run metrics in the Prometheus text format '
+                            '(e.g. for node_exporter\'s textfile collector; give it before a step name)')
+    parser.add_argument('--parallel', type=int,
+                       help='Tokens processed at once with --tokens '
+                            f'(default: {config.TOKEN_BATCH_CONCURRENCY})')
+
+    # Single steps; without a subcommand the whole pipeline runs. Step options
+    # are also accepted before the step name: the copies below default to
+    # SUPPRESS, so they only override the top-level value when given.
+    subparsers = parser.add_subparsers(dest='command', metavar='{fetch,consolidate,export,render}',
+                                       help='Run one step')
+    fetch_parser = subparsers.add_parser('fetch', help='Fetch pool data into the API cache only')
+    fetch_parser.add_argument('--backfill', action='store_true', default=argparse.SUPPRESS,
+                              help='Page backwards through each pool\'s full history (resumable)')
+    fetch_parser.add_argument('--incremental', action='store_true', default=argparse.SUPPRESS,
+                              help='Only fetch candles newer than the per-pool cache')
+    consolidate_parser = subparsers.add_parser('consolidate',
+                                               help='Build the unified frame from the API cache')
+    consolidate_parser.add_argument('--force', action='store_true', default=argparse.SUPPRESS,
+                                    help='Ignore the memoized consolidation')
+    export_parser = subparsers.add_parser('export', help='Export CSV (and optional formats) from the API cache')
+    render_parser = subparsers.add_parser('render', help='Render charts from the API cache')
+    for step_parser in (export_parser, render_parser):
+        step_parser.add_argument('--tier', choices=list(ROLLUP_TIERS), default=argparse.SUPPRESS,
+                                 help='Use a persisted rollup tier instead of the API cache')
+        step_parser.add_argument('--force', action='store_true', default=argparse.SUPPRESS,
+                                 help='Regenerate outputs even if their inputs are unchanged')
+    export_parser.add_argument('--parquet', action='store_true', default=argparse.SUPPRESS,
+                               help='Also export a Parquet dataset partitioned by pool and month')
+    export_parser.add_argument('--chart-data', action='store_true', default=argparse.SUPPRESS,
+                               help='Also export compact per-tier JSON payloads for the webapp chart')
     args = parser.parse_args()
 
+    # Tokens read these when they are built, so overrides apply to every step
+    if args.base_url:
+        config.BASE_URL = args.base_url.rstrip('/')
+    if args.output_dir:
+        config.OUTPUT_DIR = args.output_dir
+
     try:
-        main(use_cache=args.cache)
+        if args.command == 'fetch':
+            fetch_main(backfill=args.backfill, incremental=args.incremental,
+                       metrics_file=args.metrics_file)
+        elif args.command:
+            cached_main(args.command, tier=args.tier, force=args.force, parquet=args.parquet,
+                        chart_payloads=args.chart_data, metrics_file=args.metrics_file)
+        elif args.tokens:
+            if args.backfill or args.tier or args.watch:
+                parser.error('--backfill, --tier and --watch are not supported with --tokens')
+            batch_main(args.tokens, use_cache=args.cache, incremental=args.incremental,
+                       force=args.force, max_parallel=args.parallel, metrics_file=args.metrics_file)
+        else:
+            if args.tier and args.watch:
+                parser.error('--watch needs fetched candles and cannot be used with --tier')
+            main(use_cache=args.cache, backfill=args.backfill, incremental=args.incremental,
+                 tier=args.tier, force=args.force, watch=args.watch, parquet=args.parquet,
+                 chart_payloads=args.chart_data, metrics_file=args.metrics_file)
     except KeyboardInterrupt:
         print("\n\nProcess interrupted by user. Exiting...")
         sys.exit(0)
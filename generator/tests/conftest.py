@@ -0,0 +1,21 @@
+"""
+Shared fixtures. Run from the generator directory:
+
+    python -m pytest tests
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def output_dir(tmp_path, monkeypatch):
+    """Keep caches (including the HTTP cache) out of the real output directory"""
+    monkeypatch.setattr(config, 'OUTPUT_DIR', str(tmp_path))
+    return str(tmp_path)
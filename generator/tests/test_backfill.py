@@ -0,0 +1,60 @@
+from benchmarks.mock_server import MockServer
+from benchmarks.synthetic import make_ohlcv_list
+from zera_tracker.fetcher import _date_to_timestamp, backfill_all_pools, backfill_pool, load_backfill
+from zera_tracker.tokens import TokenConfig
+
+ACTIVE_FROM = '2023-11-15'
+HOUR = 3600
+
+
+def _token(server, output_dir, **pool):
+    pools = {'pool': {'address': 'Pool1', 'name': 'Pool', 'token_symbol': 'TST',
+                      'active_from': ACTIVE_FROM, **pool}}
+    return TokenConfig(name='tst', symbol='TST', pools=pools, migration_dates={}, timeframe='hour',
+                       base_url=server.base_url, output_dir=output_dir)
+
+
+def _timestamps(data):
+    return [row[0] for row in data['data']['attributes']['ohlcv_list']]
+
+
+def test_backfill_resumes_forward_after_new_candles(output_dir):
+    rows = make_ohlcv_list(2500, start_ts=_date_to_timestamp(ACTIVE_FROM), step_seconds=HOUR)
+    backfill_dir = f"{output_dir}/backfill"
+
+    with MockServer(pools={'Pool1': rows[700:]}) as server:
+        token = _token(server, output_dir)
+        pool_info = token.pools['pool']
+
+        assert backfill_pool('pool', pool_info, backfill_dir, page_limit=300, token=token) == 1800
+        assert _timestamps(load_backfill(pool_info, backfill_dir, token)) == [row[0] for row in rows[700:]]
+
+        # 700 candles close, and the previously newest one was still forming
+        newer = [list(row) for row in rows]
+        newer[700][4] *= 1.5
+        server.pools['Pool1'] = newer
+        requests_before = server.requests
+
+        all_pool_data = backfill_all_pools(backfill_dir, token=token)
+        assert _timestamps(all_pool_data['pool']['data']) == [row[0] for row in rows]
+        # Only the catch-up pages: history before the first backfill is not re-read
+        assert server.requests - requests_before == 1
+        backfilled = {row[0]: row for row in all_pool_data['pool']['data']['data']['attributes']['ohlcv_list']}
+        assert backfilled[rows[700][0]][4] == newer[700][4]
+
+
+def test_backfill_of_ended_pool_is_not_repeated(output_dir):
+    rows = make_ohlcv_list(500, start_ts=_date_to_timestamp(ACTIVE_FROM), step_seconds=HOUR)
+    backfill_dir = f"{output_dir}/backfill"
+    active_until = '2023-11-30'
+
+    with MockServer(pools={'Pool1': rows}) as server:
+        token = _token(server, output_dir, active_until=active_until)
+        pool_info = token.pools['pool']
+        backfill_pool('pool', pool_info, backfill_dir, page_limit=200, token=token)
+        assert max(_timestamps(load_backfill(pool_info, backfill_dir, token))) < \
+            _date_to_timestamp(active_until) + HOUR
+
+        requests_before = server.requests
+        assert backfill_pool('pool', pool_info, backfill_dir, page_limit=200, token=token) == 0
+        assert server.requests == requests_before
@@ -0,0 +1,52 @@
+import os
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import make_ohlcv_list
+from zera_tracker import cache
+from zera_tracker.cache import load_ohlcv_frame, save_ohlcv_frame
+
+POOLS = [{'pool_name': 'a', 'address': 'A', 'token_symbol': 'A'},
+         {'pool_name': 'b', 'address': 'B', 'token_symbol': 'B'}]
+
+
+def _frame(rows: int):
+    ohlcv = np.asarray(make_ohlcv_list(rows, step_seconds=3600)[::-1])
+    return ohlcv, np.arange(rows) * 2 // rows
+
+
+def test_ohlcv_frame_round_trip(tmp_path):
+    ohlcv, codes = _frame(50)
+    save_ohlcv_frame(ohlcv, codes, POOLS, str(tmp_path), '1h')
+
+    loaded, loaded_codes, pools = load_ohlcv_frame(str(tmp_path), '1h')
+    np.testing.assert_array_equal(loaded, ohlcv)
+    np.testing.assert_array_equal(loaded_codes, codes)
+    assert pools == POOLS
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+
+
+def test_interrupted_save_is_not_loaded(tmp_path, monkeypatch):
+    save_ohlcv_frame(*_frame(50), POOLS, str(tmp_path), '1h')
+
+    # Crash while writing the pool codes of a longer frame: the candles were
+    # already replaced, the pool codes and manifest were not
+    save = np.save
+
+    def crash_on_pool_codes(file, array, *args, **kwargs):
+        if array.dtype == np.int32:
+            raise KeyboardInterrupt
+        return save(file, array, *args, **kwargs)
+
+    monkeypatch.setattr(cache.np, 'save', crash_on_pool_codes)
+    with pytest.raises(KeyboardInterrupt):
+        save_ohlcv_frame(*_frame(80), POOLS, str(tmp_path), '1h')
+    monkeypatch.setattr(cache.np, 'save', save)
+
+    assert not [name for name in os.listdir(tmp_path) if name.endswith('.tmp')]
+    assert load_ohlcv_frame(str(tmp_path), '1h') is None
+
+    # The next complete save is readable again
+    save_ohlcv_frame(*_frame(80), POOLS, str(tmp_path), '1h')
+    assert len(load_ohlcv_frame(str(tmp_path), '1h')[0]) == 80
@@ -0,0 +1,64 @@
+import time
+
+import numpy as np
+
+from benchmarks.mock_server import MockServer
+from benchmarks.synthetic import make_ohlcv_list
+from zera_tracker import fetcher
+from zera_tracker.cache import load_pool_cache, save_pool_cache
+from zera_tracker.fetcher import fetch_pool_incremental
+from zera_tracker.tokens import TokenConfig
+
+MINUTE = 60
+
+
+def _minute_history(candles: int):
+    """Newest-first minute candles ending at the current minute"""
+    end = int(time.time()) // MINUTE * MINUTE
+    return make_ohlcv_list(candles, start_ts=end - (candles - 1) * MINUTE, step_seconds=MINUTE)
+
+
+def _setup(server, output_dir, cached_rows):
+    pool_info = {'address': 'Pool1', 'name': 'Pool', 'token_symbol': 'TST'}
+    token = TokenConfig(name='tst', symbol='TST', pools={'pool': pool_info}, migration_dates={},
+                        timeframe='minute', base_url=server.base_url, output_dir=output_dir)
+    cache_dir = f"{output_dir}/pool_cache"
+    save_pool_cache(pool_info, cached_rows, cache_dir, token)
+    return pool_info, token, cache_dir
+
+
+def test_gap_longer_than_a_page_is_paged(output_dir):
+    rows = _minute_history(5000)
+    # Offline for 2500 minutes: the gap needs three 1000-candle pages
+    with MockServer(pools={'Pool1': rows}) as server:
+        pool_info, token, cache_dir = _setup(server, output_dir, rows[2500:])
+        result = fetch_pool_incremental('pool', pool_info, None, cache_dir, token)
+
+        assert server.requests == 3
+        timestamps = np.asarray(result['data']['data']['attributes']['ohlcv_list'])[:, 0]
+        assert sorted(timestamps) == sorted(row[0] for row in rows)
+        assert load_pool_cache(pool_info, cache_dir, token)['newest_timestamp'] == rows[0][0]
+
+
+def test_failed_page_keeps_the_gap_for_the_next_run(output_dir, monkeypatch):
+    rows = _minute_history(5000)
+    with MockServer(pools={'Pool1': rows}) as server:
+        pool_info, token, cache_dir = _setup(server, output_dir, rows[2500:])
+        fetch_pool_data = fetcher.fetch_pool_data
+
+        def fail_older_pages(*args, params=None, **kwargs):
+            if 'before_timestamp' in params:
+                raise Exception("page failed")
+            return fetch_pool_data(*args, params=params, **kwargs)
+
+        monkeypatch.setattr(fetcher, 'fetch_pool_data', fail_older_pages)
+        result = fetch_pool_incremental('pool', pool_info, None, cache_dir, token)
+
+        # Stale history is served, but the partial pages are not saved over the gap
+        assert 'error' in result
+        assert len(result['data']['data']['attributes']['ohlcv_list']) == 2500
+        assert load_pool_cache(pool_info, cache_dir, token)['newest_timestamp'] == rows[2500][0]
+
+        monkeypatch.setattr(fetcher, 'fetch_pool_data', fetch_pool_data)
+        result = fetch_pool_incremental('pool', pool_info, None, cache_dir, token)
+        assert len(result['data']['data']['attributes']['ohlcv_list']) == 5000
@@ -0,0 +1,85 @@
+"""
+find_local_peaks/find_local_troughs against the per-index loops they
+replaced (kept in benchmarks.bench_peaks as the oracle), on seeded random
+cases
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_peaks import legacy_find_local_peaks, legacy_find_local_troughs, make_frame
+from zera_tracker.visualizer import find_local_peaks, find_local_troughs
+
+WINDOWS = range(1, 9)
+THRESHOLDS = (0.0, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+
+def _frame(high, low=None):
+    high = np.asarray(high, dtype=float)
+    return pd.DataFrame({
+        'date': pd.date_range('2025-01-01', periods=len(high), freq='h', tz='UTC'),
+        'high': high,
+        'low': high if low is None else np.asarray(low, dtype=float)
+    })
+
+
+def _assert_same(df, window, threshold):
+    assert find_local_peaks(df, window, threshold) == legacy_find_local_peaks(df, window, threshold)
+    assert find_local_troughs(df, window, threshold) == legacy_find_local_troughs(df, window, threshold)
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_random_walks(seed):
+    rng = np.random.default_rng(seed)
+    for _ in range(25):
+        # Coarse rounding creates plateaus and ties
+        df = make_frame(rng, int(rng.integers(0, 300)), decimals=rng.choice([None, 0, 1]))
+        _assert_same(df, int(rng.choice(WINDOWS)), float(rng.choice(THRESHOLDS)))
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_edge_lengths(window):
+    rng = np.random.default_rng(window)
+    for n in sorted({0, 1, window - 1, window, window + 1, 2 * window - 1, 2 * window, 2 * window + 1}):
+        df = make_frame(rng, n, decimals=0)
+        for threshold in THRESHOLDS:
+            _assert_same(df, window, threshold)
+
+
+@pytest.mark.parametrize('window', WINDOWS)
+def test_flat_runs(window):
+    rng = np.random.default_rng(100 + window)
+    for _ in range(20):
+        # Piecewise-constant series: long plateaus, equal neighbours on both sides
+        levels = rng.integers(0, 4, int(rng.integers(1, 12)))
+        high = np.repeat(levels, rng.integers(1, 3 * window, len(levels)))
+        for threshold in THRESHOLDS:
+            _assert_same(_frame(high, high - 1), window, threshold)
+    for threshold in THRESHOLDS:
+        _assert_same(_frame(np.full(5 * window, 7.0)), window, threshold)
+
+
+@pytest.mark.parametrize('window', (1, 2, 3, 5))
+def test_prominence_at_the_threshold(window):
+    # Integer prices with a range of 10: every prominence is a whole number, so
+    # thresholds of k/10 put candidates exactly on the `>=` boundary
+    rng = np.random.default_rng(200 + window)
+    for _ in range(30):
+        high = rng.integers(0, 11, int(rng.integers(2 * window, 80)))
+        high[:2] = (0, 10)
+        low = high - rng.integers(0, 3, len(high))
+        df = _frame(high, low)
+        for threshold in np.arange(11) / 10:
+            _assert_same(df, window, float(threshold))
+
+
+def test_prominence_filters_shallow_peaks():
+    # Peaks of prominence 1 and 5 on a 0-10 range
+    high = [0, 0, 0, 1, 0, 0, 0, 5, 0, 0, 0, 10, 0, 0, 0]
+    df = _frame(high)
+    values = lambda points: [value for _, value in points]
+    assert values(find_local_peaks(df, 2, 0.0)) == [1, 5, 10]
+    assert values(find_local_peaks(df, 2, 0.1)) == [1, 5, 10]
+    assert values(find_local_peaks(df, 2, 0.5)) == [5, 10]
+    assert values(find_local_peaks(df, 2, 0.51)) == [10]
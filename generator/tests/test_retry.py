@@ -0,0 +1,126 @@
+import random
+import time
+
+import pytest
+
+import config
+from benchmarks.mock_server import MockServer
+from zera_tracker import fetcher
+from zera_tracker.client import ApiClient
+from zera_tracker.retry import CircuitOpenError, RetryPolicy
+from zera_tracker.tokens import TokenConfig
+
+
+def _token(server):
+    return TokenConfig(name='tst', symbol='TST', pools={}, migration_dates={}, timeframe='hour',
+                       base_url=server.base_url)
+
+
+def _url(server):
+    return f"{server.base_url}/networks/solana/pools/Pool1/ohlcv/hour"
+
+
+def _host(server):
+    return server.base_url.split('://', 1)[1]
+
+
+def test_retry_after_is_waited_out():
+    # Backoff alone would retry within 10 ms
+    client = ApiClient(cache_dir=False, retry_policy=RetryPolicy(base_delay=0.01, rng=random.Random(0)))
+    with MockServer(rate_limit_every=1, retry_after=1) as server:
+        sent = []
+
+        def recover(response, **kwargs):
+            sent.append(time.monotonic())
+            server.rate_limit_every = 0
+
+        client.session.hooks['response'].append(recover)
+        data = fetcher.fetch_pool_data('Pool1', token=_token(server), client=client, conditional=False)
+
+        assert data['data']['attributes']['ohlcv_list']
+        assert server.rate_limited == 1 and server.requests == 2
+        assert sent[1] - sent[0] >= 1
+
+
+def test_backoff_stays_within_full_jitter_bounds(monkeypatch):
+    policy = RetryPolicy(max_attempts=6, base_delay=0.5, max_delay=4, max_retry_after=10,
+                         rng=random.Random(1))
+    client = ApiClient(cache_dir=False, retry_policy=policy, failure_threshold=100)
+    delays = []
+    monkeypatch.setattr(fetcher.time, 'sleep', delays.append)
+
+    with MockServer(down=True, error_status=503) as server:
+        with pytest.raises(Exception, match='after 6 attempts'):
+            fetcher.fetch_pool_data('Pool1', token=_token(server), client=client, conditional=False)
+        assert server.requests == 6
+
+    assert len(delays) == 5
+    for attempt, delay in enumerate(delays):
+        assert 0 <= delay <= min(policy.max_delay, policy.base_delay * 2 ** attempt)
+
+    # Full jitter spreads over the whole window rather than sitting at its ceiling
+    samples = [policy.delay(3) for _ in range(2000)]
+    assert min(samples) < 0.4 and max(samples) > 3.6 and max(samples) <= 4
+    # Retry-After is a floor, capped at max_retry_after
+    assert all(policy.delay(0, 7) >= 7 for _ in range(100))
+    assert policy.delay(0, 1000) == 10
+
+
+def test_circuit_opens_fails_fast_and_half_opens(monkeypatch):
+    monkeypatch.setattr(config, 'CIRCUIT_RESET_SECONDS', 0.2)
+    client = ApiClient(cache_dir=False)
+    wait = time.sleep
+    sleeps = []
+    monkeypatch.setattr(fetcher.time, 'sleep', sleeps.append)
+
+    with MockServer(down=True, error_status=500) as server:
+        url = _url(server)
+        breaker = client.breaker(_host(server))
+        for _ in range(config.CIRCUIT_FAILURE_THRESHOLD):
+            with pytest.raises(Exception):
+                client.get_json(url, conditional=False)
+        assert breaker.state == 'open'
+        assert server.requests == config.CIRCUIT_FAILURE_THRESHOLD
+
+        with pytest.raises(CircuitOpenError):
+            client.get_json(url, conditional=False)
+        # The fetcher gives up at once instead of retrying into an open circuit
+        with pytest.raises(Exception, match='Circuit open'):
+            fetcher.fetch_pool_data('Pool1', token=_token(server), client=client, conditional=False)
+        assert server.requests == config.CIRCUIT_FAILURE_THRESHOLD
+        assert sleeps == []
+
+        # Half-open: one trial request; a failure opens the circuit again
+        wait(0.25)
+        assert breaker.state == 'half-open'
+        with pytest.raises(Exception):
+            client.get_json(url, conditional=False)
+        assert breaker.state == 'open'
+        assert server.requests == config.CIRCUIT_FAILURE_THRESHOLD + 1
+
+        # A successful trial closes it
+        wait(0.25)
+        server.down = False
+        assert client.get_json(url, conditional=False)
+        assert breaker.state == 'closed'
+        assert breaker.trips == 2
+        assert server.requests == config.CIRCUIT_FAILURE_THRESHOLD + 2
+
+
+def test_latency_histogram_counts_every_request():
+    client = ApiClient(cache_dir=False, failure_threshold=100)
+    with MockServer(latency=0.06, rate_limit_every=3) as server:
+        url = _url(server)
+        for _ in range(12):
+            try:
+                client.get_json(url, conditional=False)
+            except Exception:
+                pass
+        assert server.requests == 12 and server.rate_limited == 4
+
+    summary = client.latency[_host(server)].summary()
+    assert summary['count'] == 12
+    assert sum(summary['buckets'].values()) == 12
+    # Every answer took longer than the 50 ms bucket
+    assert summary['buckets']['0.05'] == 0
+    assert client.stats['requests'] == 12 and client.stats['failures'] == 4
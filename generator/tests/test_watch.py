@@ -0,0 +1,44 @@
+import time
+
+import numpy as np
+
+from benchmarks.mock_server import MockServer
+from benchmarks.synthetic import make_ohlcv_list
+from zera_tracker.cache import save_pool_cache
+from zera_tracker.consolidator import create_unified_dataframe
+from zera_tracker.tokens import TokenConfig
+from zera_tracker.watch import watch
+
+MINUTE = 60
+
+
+def test_watch_cycle_fills_a_gap_longer_than_a_page(output_dir):
+    end = int(time.time()) // MINUTE * MINUTE
+    rows = make_ohlcv_list(5000, start_ts=end - 4999 * MINUTE, step_seconds=MINUTE)
+    pool_info = {'address': 'Pool1', 'name': 'Pool', 'token_symbol': 'TST'}
+    cached = rows[2500:]
+
+    with MockServer(pools={'Pool1': rows}) as server:
+        token = TokenConfig(name='tst', symbol='TST', pools={'pool': pool_info}, migration_dates={},
+                            timeframe='minute', base_url=server.base_url, output_dir=output_dir)
+        # The process slept through 2500 minutes since the last poll
+        save_pool_cache(pool_info, cached, f"{output_dir}/pool_cache", token)
+        df = create_unified_dataframe({'pool': {'info': pool_info,
+                                                'data': {'data': {'attributes': {'ohlcv_list': cached}}}}})
+
+        now = end + 20
+        sleeps = []
+        refreshes = []
+        df = watch(df, lambda frame, since: refreshes.append((frame, since)), token=token,
+                   settle_seconds=5, max_cycles=1, clock=lambda: now, sleep=sleeps.append)
+
+        assert sleeps == [45]
+        assert server.requests == 3
+
+    assert len(refreshes) == 1
+    frame, since = refreshes[0]
+    assert frame is df
+    assert since == cached[0][0]
+    timestamps = df['timestamp'].to_numpy()
+    assert len(timestamps) == 5000 and timestamps[-1] == end
+    assert (np.diff(timestamps) == MINUTE).all()
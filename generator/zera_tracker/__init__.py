@@ -1,28 +1,52 @@
 """
 ZERA Price Tracker
 
-A tool for tracking historical price data for ZERA token across different pools.
+A tool for tracking historical price data for tokens (ZERA by default)
+across different pools.
+
+Public names are imported on first use (PEP 562), so `import zera_tracker`
+or a fetch-only run doesn't pay for pandas and matplotlib.
 """
 
+import importlib
+
 __version__ = "1.0.0"
 
-from .fetcher import fetch_all_pools
-from .consolidator import (
-    create_unified_dataframe,
-    interpolate_migration_gaps,
-    add_migration_markers,
-    get_summary_stats,
-    print_summary
-)
-from .visualizer import create_price_chart, create_comparison_chart
-
-__all__ = [
-    'fetch_all_pools',
-    'create_unified_dataframe',
-    'interpolate_migration_gaps',
-    'add_migration_markers',
-    'get_summary_stats',
-    'print_summary',
-    'create_price_chart',
-    'create_comparison_chart',
-]
+# Public name -> submodule that defines it
+_EXPORTS = {
+    'fetch_all_pools': 'fetcher',
+    'fetch_all_tokens': 'fetcher',
+    'fetch_pool_incremental': 'fetcher',
+    'backfill_all_pools': 'fetcher',
+    'ROLLUP_TIERS': 'fetcher',
+    'create_unified_dataframe': 'consolidator',
+    'interpolate_migration_gaps': 'consolidator',
+    'add_migration_markers': 'consolidator',
+    'build_rollups': 'consolidator',
+    'update_rollups': 'consolidator',
+    'save_rollups': 'consolidator',
+    'load_rollup': 'consolidator',
+    'get_summary_stats': 'consolidator',
+    'print_summary': 'consolidator',
+    'create_price_chart': 'visualizer',
+    'create_comparison_chart': 'visualizer',
+    'prepare_chart_model': 'visualizer',
+    'ChartModel': 'visualizer',
+    'render_charts': 'render',
+    'TokenConfig': 'tokens',
+    'load_token_registry': 'tokens',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+        globals()[name] = value  # Later lookups skip __getattr__
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
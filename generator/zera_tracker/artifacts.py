@@ -0,0 +1,130 @@
+"""
+Output artifact manifest
+
+Every generated file (charts, CSV) is recorded with a hash of the inputs that
+produced it: a fingerprint of the unified frame, the config settings the
+output depends on, and the job's own options. A later run whose inputs hash
+matches, and whose file is still on disk with the recorded size and mtime,
+can skip regenerating it.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict
+import pandas as pd
+import config
+from .tokens import TokenConfig, resolve_token
+
+MANIFEST_FILENAME = 'artifacts.json'
+
+# Token settings that change what the charts and CSV look like
+FINGERPRINT_SETTINGS = ('symbol', 'network', 'timeframe', 'pools', 'migration_dates',
+                        'migration_labels')
+
+_manifest_lock = threading.Lock()
+
+
+def frame_fingerprint(df: pd.DataFrame) -> str:
+    """
+    Hash a DataFrame's columns, dtypes and values
+
+    Args:
+        df: Unified DataFrame
+
+    Returns:
+        Hex digest that changes whenever any cell changes
+    """
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([[c, str(t)] for c, t in df.dtypes.items()]).encode())
+    h.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def config_fingerprint(token: TokenConfig = None, settings=FINGERPRINT_SETTINGS) -> str:
+    """Hash a token's output-relevant settings (default token: config module)"""
+    token = resolve_token(token)
+    values = {name: getattr(token, name) for name in settings}
+    return hashlib.blake2b(json.dumps(values, sort_keys=True, default=str).encode(),
+                           digest_size=16).hexdigest()
+
+
+def inputs_hash(*parts) -> str:
+    """Combine fingerprints and job options into one inputs hash"""
+    return hashlib.blake2b(json.dumps(parts, sort_keys=True, default=str).encode(),
+                           digest_size=16).hexdigest()
+
+
+def source_fingerprint(path: str) -> str:
+    """Hash a source file so code changes invalidate its outputs"""
+    with open(path, 'rb') as f:
+        return hashlib.blake2b(f.read(), digest_size=16).hexdigest()
+
+
+def _manifest_path(output_dir: str = None) -> str:
+    return f"{output_dir or config.OUTPUT_DIR}/{MANIFEST_FILENAME}"
+
+
+def load_manifest(output_dir: str = None) -> Dict:
+    """
+    Load the artifact manifest
+
+    Returns:
+        {path: {'inputs', 'size', 'mtime'}}, empty if none exists or it is unreadable
+    """
+    path = _manifest_path(output_dir)
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except Exception as e:
+        print(f"✗ Error loading artifact manifest {path}: {e}")
+        return {}
+
+
+def save_manifest(manifest: Dict, output_dir: str = None):
+    """Write the artifact manifest atomically"""
+    path = _manifest_path(output_dir)
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def update_manifest(entries: Dict, output_dir: str = None):
+    """
+    Merge new artifact entries into the on-disk manifest
+
+    The manifest is re-read under a lock so stages writing different
+    artifacts concurrently don't drop each other's entries.
+    """
+    with _manifest_lock:
+        manifest = load_manifest(output_dir)
+        manifest.update(entries)
+        save_manifest(manifest, output_dir)
+
+
+def is_current(manifest: Dict, path: str, inputs: str) -> bool:
+    """
+    Check whether an artifact was produced from the same inputs and is untouched
+
+    Only a stat call is needed: the file must exist with the size and mtime
+    recorded when it was written.
+    """
+    entry = manifest.get(path)
+    if not entry or entry.get('inputs') != inputs:
+        return False
+    try:
+        st = os.stat(path)
+    except OSError:
+        return False
+    return st.st_size == entry.get('size') and st.st_mtime_ns == entry.get('mtime')
+
+
+def record_artifact(manifest: Dict, path: str, inputs: str):
+    """Record a freshly written artifact in the manifest"""
+    st = os.stat(path)
+    manifest[path] = {'inputs': inputs, 'size': st.st_size, 'mtime': st.st_mtime_ns}
@@ -0,0 +1,268 @@
+"""
+Columnar OHLCV cache
+
+Candles are stored as NumPy `.npy` files in column-major layout (one
+contiguous row per field: timestamp, open, high, low, close, volume) next to
+a small JSON manifest. Files are memory-mapped on load, so the consolidator
+reads the arrays without parsing or copying them.
+
+Three stores live here:
+- the run cache (`save_columnar_cache`/`load_columnar_cache`), one array per
+  pool from the last full fetch
+- the incremental per-pool cache, keyed by (network, pool address, timeframe)
+  along with the newest candle timestamp so later runs only request the delta
+- consolidated frames such as rollup tiers (`save_ohlcv_frame`), stored with
+  a per-row pool code
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Union
+import numpy as np
+from .tokens import TokenConfig, resolve_token
+
+OHLCV_FIELDS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+MANIFEST_FILENAME = 'manifest.json'
+
+
+def ohlcv_array(ohlcv_list: Union[List[List], np.ndarray]) -> np.ndarray:
+    """
+    View candles as an (N, 6) float64 array
+
+    Arrays (including memory-mapped cache arrays) pass through without a
+    copy; lists from the API are converted once.
+    """
+    if isinstance(ohlcv_list, np.ndarray) and ohlcv_list.dtype == np.float64:
+        return ohlcv_list
+    arr = np.asarray(ohlcv_list, dtype=np.float64)
+    return arr.reshape(-1, len(OHLCV_FIELDS))
+
+
+@contextmanager
+def atomic_write(path: str, mode: str = 'w'):
+    """
+    Open a temporary file that replaces `path` only if the block succeeds
+
+    Args:
+        path: Final file path
+        mode: File mode for the temporary file ('w' or 'wb')
+    """
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, mode) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def _write_array(path: str, ohlcv_list) -> int:
+    """Write candles column-major and return the row count"""
+    columns = np.ascontiguousarray(ohlcv_array(ohlcv_list).T)
+    with atomic_write(path, 'wb') as f:
+        np.save(f, columns)
+    return columns.shape[1]
+
+
+def _read_array(path: str, mmap: bool = True) -> np.ndarray:
+    """Read column-major candles back as an (N, 6) view"""
+    columns = np.load(path, mmap_mode='r' if mmap else None)
+    return columns.T
+
+
+def _write_manifest(cache_dir: str, manifest: Dict, filename: str = MANIFEST_FILENAME):
+    with atomic_write(f"{cache_dir}/{filename}") as f:
+        json.dump(manifest, f)
+
+
+def save_columnar_cache(all_pool_data: Dict, cache_dir: str):
+    """
+    Save fetched pool data as per-pool arrays plus a JSON manifest
+
+    Args:
+        all_pool_data: {pool_name: {'info', 'data'[, 'error']}} from the fetcher
+        cache_dir: Directory to write the cache into
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = {
+        'cached_at': int(time.time()),
+        'fields': list(OHLCV_FIELDS),
+        'pools': {}
+    }
+
+    for pool_name, pool_data in all_pool_data.items():
+        entry = {'info': pool_data['info']}
+        if pool_data.get('data'):
+            filename = f"{pool_name}.npy"
+            entry['file'] = filename
+            entry['rows'] = _write_array(f"{cache_dir}/{filename}",
+                                         pool_data['data']['data']['attributes']['ohlcv_list'])
+        if 'error' in pool_data:
+            entry['error'] = pool_data['error']
+        manifest['pools'][pool_name] = entry
+
+    _write_manifest(cache_dir, manifest)
+
+
+def load_columnar_cache(cache_dir: str, mmap: bool = True) -> Dict:
+    """
+    Load a columnar cache back into the fetcher's result shape
+
+    Args:
+        cache_dir: Directory written by save_columnar_cache
+        mmap: Memory-map the arrays instead of reading them into memory
+
+    Returns:
+        Tuple of (cached_at timestamp, {pool_name: {'info', 'data'}}),
+        or None if no cache exists
+    """
+    manifest_path = f"{cache_dir}/{MANIFEST_FILENAME}"
+    if not os.path.exists(manifest_path):
+        return None
+
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+
+    all_pool_data = {}
+    for pool_name, entry in manifest['pools'].items():
+        pool_data = {'info': entry['info'], 'data': None}
+        if 'file' in entry:
+            ohlcv = _read_array(f"{cache_dir}/{entry['file']}", mmap=mmap)
+            pool_data['data'] = {'data': {'attributes': {'ohlcv_list': ohlcv}}}
+        if 'error' in entry:
+            pool_data['error'] = entry['error']
+        all_pool_data[pool_name] = pool_data
+
+    return manifest['cached_at'], all_pool_data
+
+
+def save_ohlcv_frame(ohlcv, pool_codes: np.ndarray, pool_infos: List[Dict],
+                     cache_dir: str, name: str):
+    """
+    Save consolidated candles with a per-row pool code
+
+    Args:
+        ohlcv: (N, 6) candles sorted by timestamp
+        pool_codes: Per-row index into pool_infos
+        pool_infos: Pool metadata dictionaries, one per code
+        cache_dir: Target directory
+        name: Base filename (e.g. a rollup tier)
+    """
+    # Each file is replaced atomically and the manifest, which records the row
+    # count, goes last; the loader rejects arrays that don't match it
+    os.makedirs(cache_dir, exist_ok=True)
+    rows = _write_array(f"{cache_dir}/{name}.npy", ohlcv)
+    with atomic_write(f"{cache_dir}/{name}.pools.npy", 'wb') as f:
+        np.save(f, np.asarray(pool_codes, dtype=np.int32))
+    _write_manifest(cache_dir, {
+        'saved_at': int(time.time()),
+        'fields': list(OHLCV_FIELDS),
+        'rows': rows,
+        'pools': pool_infos
+    }, filename=f"{name}.json")
+
+
+def load_ohlcv_frame(cache_dir: str, name: str, mmap: bool = True):
+    """
+    Load candles written by save_ohlcv_frame
+
+    Returns:
+        Tuple of ((N, 6) candles, per-row pool codes, pool_infos), or None if
+        missing or left inconsistent by an interrupted save
+    """
+    meta_path = f"{cache_dir}/{name}.json"
+    if not os.path.exists(meta_path):
+        return None
+
+    with open(meta_path, 'r') as f:
+        meta = json.load(f)
+    ohlcv = _read_array(f"{cache_dir}/{name}.npy", mmap=mmap)
+    pool_codes = np.load(f"{cache_dir}/{name}.pools.npy", mmap_mode='r' if mmap else None)
+    if not len(ohlcv) == len(pool_codes) == meta['rows']:
+        print(f"✗ Ignoring {cache_dir}/{name}: {len(ohlcv)} candles and {len(pool_codes)} pool codes "
+              f"for {meta['rows']} rows")
+        return None
+    return ohlcv, pool_codes, meta['pools']
+
+
+def cache_key(pool_info: Dict, token: TokenConfig = None) -> str:
+    """
+    Build the cache key for a pool at the token's network and timeframe
+
+    The key doesn't depend on which token the pool belongs to, so pools
+    shared between tokens share one cache entry.
+    """
+    token = resolve_token(token)
+    return f"{token.network}_{pool_info['address']}_{token.timeframe}"
+
+
+def load_pool_cache(pool_info: Dict, cache_dir: str, token: TokenConfig = None) -> Dict:
+    """
+    Load a pool's cached candles
+
+    Args:
+        pool_info: Pool configuration dictionary
+        cache_dir: Directory holding per-pool cache files
+        token: Token the pool belongs to (default: config module)
+
+    Returns:
+        Dictionary with 'fetched_at', 'newest_timestamp' and 'ohlcv_list',
+        or None if the pool has not been cached yet
+    """
+    key = cache_key(pool_info, token)
+    meta_path = f"{cache_dir}/{key}.json"
+    if not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        meta['ohlcv_list'] = _read_array(f"{cache_dir}/{key}.npy")
+        return meta
+    except Exception as e:
+        print(f"✗ Error loading pool cache {meta_path}: {e}")
+        return None
+
+
+def save_pool_cache(pool_info: Dict, ohlcv_list, cache_dir: str, token: TokenConfig = None):
+    """
+    Save a pool's candles along with the newest cached timestamp
+
+    Args:
+        pool_info: Pool configuration dictionary
+        ohlcv_list: Candles in GeckoTerminal order (newest first)
+        cache_dir: Directory holding per-pool cache files
+        token: Token the pool belongs to (default: config module)
+    """
+    os.makedirs(cache_dir, exist_ok=True)
+    key = cache_key(pool_info, token)
+    arr = ohlcv_array(ohlcv_list)
+
+    # Array first, then metadata: a crash in between leaves the old
+    # newest_timestamp, which only causes a slightly larger delta next run
+    _write_array(f"{cache_dir}/{key}.npy", arr)
+    _write_manifest(cache_dir, {
+        'fetched_at': int(time.time()),
+        'newest_timestamp': int(arr[:, 0].max()) if len(arr) else None,
+        'rows': len(arr)
+    }, filename=f"{key}.json")
+
+
+def merge_ohlcv(cached, fresh) -> np.ndarray:
+    """
+    Merge two candle sets, de-duplicating on timestamp
+
+    Fresh candles win so a partially-formed candle cached last run is
+    replaced by its final values.
+
+    Returns:
+        Merged (N, 6) array, newest first
+    """
+    combined = np.concatenate([ohlcv_array(fresh), ohlcv_array(cached)])
+    # np.unique keeps the first occurrence, i.e. the fresh candle
+    _, first = np.unique(combined[:, 0], return_index=True)
+    return combined[first][::-1]
@@ -0,0 +1,247 @@
+"""
+Pooled HTTP client for GeckoTerminal API requests
+
+All requests go through one `requests.Session`, so connections (and their
+TLS handshakes) are kept alive and reused across pools, pages and retries.
+Responses are requested gzip-compressed. When the API sends an ETag or
+Last-Modified validator, the response body is cached under
+<OUTPUT_DIR>/http_cache and the next request for the same URL is made
+conditional; a 304 Not Modified answer is served from that cache.
+
+Each host gets a circuit breaker and a latency histogram (see retry.py);
+retrying itself is up to the caller, using the client's RetryPolicy.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+import config
+from . import instrument
+from .retry import CircuitBreaker, CircuitOpenError, LatencyHistogram, RetryPolicy
+
+
+class ApiClient:
+    """
+    Thread-safe JSON client with connection pooling and conditional requests
+
+    Keeps per-run counters (requests, new connections, bytes on the wire,
+    304s) and per-host latency histograms for report(). Request and byte
+    totals also feed the run's instrumentation counters (instrument.py).
+    """
+
+    def __init__(self, cache_dir: str = None, pool_size: int = None,
+                 retry_policy: RetryPolicy = None, failure_threshold: int = None):
+        """
+        Args:
+            cache_dir: Directory for validator/body cache entries (default:
+                <OUTPUT_DIR>/http_cache, resolved per request); False disables it
+            pool_size: Connections kept open per host (default: config.MAX_CONCURRENT_REQUESTS)
+            retry_policy: Timeouts and retry schedule (default: RetryPolicy())
+            failure_threshold: Consecutive failures that open a host's circuit
+                (default: config.CIRCUIT_FAILURE_THRESHOLD)
+        """
+        if pool_size is None:
+            pool_size = config.MAX_CONCURRENT_REQUESTS
+        self.cache_dir = cache_dir
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.failure_threshold = failure_threshold
+        self._breakers = {}
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate'
+        })
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max(1, pool_size))
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self._adapter = adapter
+
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Zero the per-run counters"""
+        with self._lock:
+            # urllib3 pools count for their whole lifetime; report the difference
+            self._connection_baseline = self._pool_counters()
+            self.latency = {}  # Host -> LatencyHistogram
+            self.stats = {
+                'requests': 0,
+                'not_modified': 0,
+                'failures': 0,  # Network errors plus retryable (429/5xx) answers
+                'wire_bytes': 0,  # Response bodies as transferred (compressed)
+                'body_bytes': 0   # Response bodies after decompression
+            }
+
+    def breaker(self, host: str) -> CircuitBreaker:
+        """The circuit breaker guarding a host"""
+        with self._lock:
+            if host not in self._breakers:
+                self._breakers[host] = CircuitBreaker(failure_threshold=self.failure_threshold)
+            return self._breakers[host]
+
+    def _histogram(self, host: str) -> LatencyHistogram:
+        with self._lock:
+            if host not in self.latency:
+                self.latency[host] = LatencyHistogram()
+            return self.latency[host]
+
+    def _cache_path(self, url: str, params: Dict) -> str:
+        cache_dir = self.cache_dir if self.cache_dir is not None else f"{config.OUTPUT_DIR}/http_cache"
+        key = json.dumps([url, sorted((params or {}).items())], default=str)
+        return f"{cache_dir}/{hashlib.blake2b(key.encode(), digest_size=16).hexdigest()}.json"
+
+    def _load_entry(self, path: str):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_entry(self, path: str, entry: Dict):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+
+    def get_json(self, url: str, params: Dict = None, conditional: bool = True) -> Dict:
+        """
+        GET a JSON document, revalidating a cached copy when one exists
+
+        Args:
+            url: Request URL
+            params: Query parameters
+            conditional: Cache validators and body for a later 304 (pass False
+                for one-off requests such as historical backfill pages)
+
+        Returns:
+            Decoded JSON body (from the cache on 304 Not Modified)
+
+        Raises:
+            CircuitOpenError: The host's circuit is open; nothing was sent
+            requests.exceptions.RequestException: On network errors or HTTP error status
+        """
+        host = urlsplit(url).netloc
+        breaker = self.breaker(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host} after repeated failures; "
+                                   f"next attempt allowed in {breaker.retry_in():.0f}s")
+
+        cache_path = self._cache_path(url, params) if conditional and self.cache_dir is not False else None
+        entry = self._load_entry(cache_path) if cache_path else None
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        started = time.perf_counter()
+        try:
+            response = self.session.get(url, params=params, headers=headers,
+                                        timeout=self.retry_policy.timeout)
+            body = response.content
+        except requests.exceptions.RequestException:
+            breaker.record_failure()
+            with self._lock:
+                self.stats['requests'] += 1
+                self.stats['failures'] += 1
+            instrument.count('api_requests')
+            instrument.count('api_failures')
+            raise
+        self._histogram(host).observe(time.perf_counter() - started)
+        wire_bytes = response.raw.tell() if response.raw is not None else len(body)
+
+        failed = response.status_code in self.retry_policy.retry_statuses
+        if failed:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+        with self._lock:
+            self.stats['failures'] += failed
+            self.stats['requests'] += 1
+            self.stats['wire_bytes'] += wire_bytes
+            self.stats['body_bytes'] += len(body)
+            if response.status_code == 304 and entry:
+                self.stats['not_modified'] += 1
+        instrument.count('api_requests')
+        instrument.count('api_failures', int(failed))
+        instrument.count('api_not_modified', int(response.status_code == 304 and entry is not None))
+        instrument.count('api_wire_bytes', wire_bytes)
+        instrument.count('api_body_bytes', len(body))
+
+        if response.status_code == 304 and entry:
+            return entry['body']
+        response.raise_for_status()
+        data = response.json()
+
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if cache_path and (etag or last_modified):
+            self._save_entry(cache_path, {'url': url, 'etag': etag, 'last_modified': last_modified,
+                                          'body': data})
+        return data
+
+    def _pool_counters(self):
+        connections = requests_sent = 0
+        for pool in list(self._adapter.poolmanager.pools._container.values()):
+            connections += pool.num_connections
+            requests_sent += pool.num_requests
+        return connections, requests_sent
+
+    def connection_stats(self) -> Dict:
+        """Connections opened and requests sent since the last reset_stats()"""
+        connections, requests_sent = self._pool_counters()
+        base_connections, base_requests = self._connection_baseline
+        return {'connections': connections - base_connections,
+                'pooled_requests': requests_sent - base_requests}
+
+    def report(self) -> Dict:
+        """
+        Print and return this run's connection reuse and transfer totals
+
+        Returns:
+            The stats dictionary plus 'connections' and 'reused'
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            latency = dict(self.latency)
+            trips = {host: breaker.trips for host, breaker in self._breakers.items() if breaker.trips}
+        stats.update(self.connection_stats())
+        stats['reused'] = max(0, stats['requests'] - stats['connections'])
+        stats['latency'] = {host: histogram.summary() for host, histogram in latency.items()}
+        stats['circuit_trips'] = trips
+        if stats['requests']:
+            print(f"✓ HTTP: {stats['requests']} requests over {stats['connections']} connections "
+                  f"({stats['reused']} reused), {stats['not_modified']} not modified, "
+                  f"{stats['failures']} failed, {stats['wire_bytes'] / 1024:.1f} KB transferred "
+                  f"({stats['body_bytes'] / 1024:.1f} KB decoded)")
+            for host, summary in stats['latency'].items():
+                print(f"  {host}: p50 {summary['p50'] * 1000:.0f} ms, p95 {summary['p95'] * 1000:.0f} ms, "
+                      f"p99 {summary['p99'] * 1000:.0f} ms, max {summary['max'] * 1000:.0f} ms")
+            for host, count in trips.items():
+                print(f"✗ Circuit for {host} opened {count} time(s)")
+        return stats
+
+
+_default_client = None
+_default_lock = threading.Lock()
+
+
+def default_client() -> ApiClient:
+    """Process-wide client shared by every fetch that isn't given one"""
+    global _default_client
+    with _default_lock:
+        if _default_client is None:
+            _default_client = ApiClient()
+        return _default_client
@@ -1,25 +1,37 @@
 """
-Data consolidator - merges M0N3Y and ZERA pool data into unified timeline
+Data consolidator - merges a token's pool data into a unified timeline
 """
 
+import numpy as np
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timezone
 from typing import Dict, List
 import config
-from .fetcher import parse_ohlcv_data
+from .cache import load_ohlcv_frame, save_ohlcv_frame
+from .fetcher import parse_ohlcv_array, _date_to_timestamp, TIMEFRAME_SECONDS, ROLLUP_TIERS
+from .tokens import TokenConfig, resolve_token
 
 
-def create_unified_dataframe(all_pool_data: Dict) -> pd.DataFrame:
+def create_unified_dataframe(all_pool_data: Dict, overlap: str = 'window') -> pd.DataFrame:
     """
     Consolidate data from all pools into a single unified DataFrame
 
+    Each pool's candles are taken as one NumPy array and the frame is built
+    column-wise in a single step, with categorical pool/token columns and
+    UTC dates. Pools are then stitched into one canonical series with a
+    single candle per timestamp (see stitch_pools).
+
     Args:
         all_pool_data: Dictionary of pool data from fetcher
+        overlap: Stitching mode passed to stitch_pools, or None to keep
+            every candle from every pool
 
     Returns:
         Unified pandas DataFrame with complete price history
     """
-    all_records = []
+    arrays = []
+    pool_names = []
+    pool_infos = []
 
     # Process each pool
     for pool_name, pool_data in all_pool_data.items():
@@ -27,33 +39,21 @@ def create_unified_dataframe(all_pool_data: Dict) -> pd.DataFrame:
             print(f"Warning: No data for {pool_name}")
             continue
 
-        pool_info = pool_data['info']
-        ohlcv_list = parse_ohlcv_data(pool_data['data'])
-
-        for entry in ohlcv_list:
-            record = {
-                'timestamp': entry['timestamp'],
-                'date': datetime.fromtimestamp(entry['timestamp']),
-                'open': entry['open'],
-                'high': entry['high'],
-                'low': entry['low'],
-                'close': entry['close'],
-                'volume': entry['volume'],
-                'pool_name': pool_name,
-                'pool_address': pool_info['address'],
-                'token_symbol': pool_info['token_symbol']
-            }
-            all_records.append(record)
+        arrays.append(parse_ohlcv_array(pool_data['data']))
+        pool_names.append(pool_name)
+        pool_infos.append(pool_data['info'])
 
-    # Create DataFrame
-    df = pd.DataFrame(all_records)
+    ohlcv = np.concatenate(arrays) if arrays else np.empty((0, 6))
+    pool_codes = np.repeat(np.arange(len(pool_names)), [len(arr) for arr in arrays])
 
-    # Sort by timestamp
-    df = df.sort_values('timestamp').reset_index(drop=True)
+    # Sort by timestamp (stable, so pools keep config order at equal timestamps)
+    order = np.argsort(ohlcv[:, 0], kind='stable')
+    df = _build_frame(ohlcv[order], pool_codes[order], pool_names, pool_infos)
 
-    # Add calculated fields
-    df['price_change'] = df['close'] - df['open']
-    df['price_change_pct'] = (df['price_change'] / df['open']) * 100
+    if overlap is not None:
+        df = stitch_pools(df, dict(zip(pool_names, pool_infos)), overlap=overlap)
+
+    _add_price_change(df)
 
     print(f"\nConsolidated {len(df)} total data points across all pools")
     print(f"Date range: {df['date'].min()} to {df['date'].max()}")
@@ -61,96 +61,427 @@ def create_unified_dataframe(all_pool_data: Dict) -> pd.DataFrame:
     return df
 
 
-def interpolate_migration_gaps(df: pd.DataFrame, hours_per_point: int = 6) -> pd.DataFrame:
+def stitch_pools(df: pd.DataFrame, pools: Dict = None, overlap: str = 'window') -> pd.DataFrame:
+    """
+    Reduce overlapping pools to one canonical candle per timestamp
+
+    Modes:
+        'window' - clip each pool to [active_from, active_until) from its
+                   config, then resolve any remaining collisions by volume
+        'volume' - at each shared timestamp keep the higher-volume candle
+
+    Args:
+        df: Unified DataFrame sorted by timestamp
+        pools: {pool_name: pool_info} with optional active_from/active_until
+            dates (default: config.POOLS)
+        overlap: 'window' or 'volume'
+
+    Returns:
+        DataFrame with unique timestamps, still sorted by timestamp
+    """
+    if overlap not in ('window', 'volume'):
+        raise ValueError(f"Unknown overlap mode: {overlap}")
+    if pools is None:
+        pools = config.POOLS
+
+    timestamps = df['timestamp'].to_numpy()
+    keep = np.ones(len(df), dtype=bool)
+
+    if overlap == 'window':
+        # Per-pool window bounds, looked up by each row's pool code
+        pool_column = pd.Categorical(df['pool_name'])
+        lower = np.full(len(pool_column.categories), np.iinfo(np.int64).min)
+        upper = np.full(len(pool_column.categories), np.iinfo(np.int64).max)
+        for code, pool_name in enumerate(pool_column.categories):
+            pool_info = pools.get(pool_name, {})
+            if 'active_from' in pool_info:
+                lower[code] = _date_to_timestamp(pool_info['active_from'])
+            if 'active_until' in pool_info:
+                upper[code] = _date_to_timestamp(pool_info['active_until'])
+
+        codes = pool_column.codes
+        keep = (timestamps >= lower[codes]) & (timestamps < upper[codes])
+
+    # Any timestamp still shared by several pools keeps its highest-volume candle
+    rows = np.flatnonzero(keep)
+    order = rows[np.lexsort((-df['volume'].to_numpy()[rows], timestamps[rows]))]
+    first = np.ones(len(order), dtype=bool)
+    first[1:] = timestamps[order][1:] != timestamps[order][:-1]
+
+    dropped = len(df) - int(first.sum())
+    if dropped:
+        print(f"Stitched pools: dropped {dropped} overlapping candles")
+
+    return df.iloc[order[first]].reset_index(drop=True)
+
+
+def _build_frame(ohlcv: np.ndarray, pool_codes: np.ndarray, pool_names: List[str],
+                 pool_infos: List[Dict]) -> pd.DataFrame:
+    """Build the unified frame column-wise from sorted candles and per-row pool codes"""
+    timestamps = ohlcv[:, 0].astype(np.int64)
+
+    return pd.DataFrame({
+        'timestamp': timestamps,
+        'date': pd.to_datetime(timestamps, unit='s', utc=True),
+        'open': ohlcv[:, 1],
+        'high': ohlcv[:, 2],
+        'low': ohlcv[:, 3],
+        'close': ohlcv[:, 4],
+        'volume': ohlcv[:, 5],
+        'pool_name': pd.Categorical.from_codes(pool_codes, categories=pool_names),
+        'pool_address': _categorical_by_pool(pool_codes, [info['address'] for info in pool_infos]),
+        'token_symbol': _categorical_by_pool(pool_codes, [info['token_symbol'] for info in pool_infos])
+    })
+
+
+_OHLCV_COLUMNS = ('timestamp', 'open', 'high', 'low', 'close', 'volume')
+
+
+def _add_price_change(df: pd.DataFrame):
+    """Add calculated fields"""
+    df['price_change'] = df['close'] - df['open']
+    df['price_change_pct'] = (df['price_change'] / df['open']) * 100
+
+
+def _categorical_by_pool(pool_codes: np.ndarray, values_per_pool: List[str]) -> pd.Categorical:
+    """Map per-row pool codes to a categorical of per-pool values (which may repeat)"""
+    categories, value_codes = np.unique(np.asarray(values_per_pool, dtype=object), return_inverse=True)
+    codes = value_codes[pool_codes] if len(pool_codes) else pool_codes
+    return pd.Categorical.from_codes(codes, categories=categories)
+
+
+def _fill_linear(start: np.ndarray, end: np.ndarray, ratio: np.ndarray) -> np.ndarray:
+    """Straight line between the closes either side of the gap"""
+    return start + ratio * (end - start)
+
+
+def _fill_log_linear(start: np.ndarray, end: np.ndarray, ratio: np.ndarray) -> np.ndarray:
+    """Constant percentage change per step; falls back to linear for non-positive prices"""
+    positive = (start > 0) & (end > 0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        log_fill = np.exp(np.log(start) + ratio * (np.log(end) - np.log(start)))
+    return np.where(positive, log_fill, _fill_linear(start, end, ratio))
+
+
+def _fill_previous_close(start: np.ndarray, end: np.ndarray, ratio: np.ndarray) -> np.ndarray:
+    """Hold the last close before the migration flat across the gap"""
+    return np.broadcast_to(start, ratio.shape).astype(float)
+
+
+# Gap fill strategies: fn(close_before, close_after, ratio) -> prices
+FILL_STRATEGIES = {
+    'linear': _fill_linear,
+    'log': _fill_log_linear,
+    'previous': _fill_previous_close
+}
+
+
+def interpolate_migration_gaps(df: pd.DataFrame, hours_per_point: int = 6,
+                               fill: str = 'linear', token: TokenConfig = None) -> pd.DataFrame:
     """
     Interpolate missing data between pool migrations for smooth transitions
 
     For daily data, this adds multiple interpolation points per day to create
-    smooth visual transitions in charts.
+    smooth visual transitions in charts. All migration boundaries are located
+    with one searchsorted call and every synthetic row for every gap is
+    generated as arrays, then merged with a single concat.
 
     Args:
         df: Unified DataFrame
         hours_per_point: Hours between interpolated points (default: 6 = 4 points/day)
+        fill: Price fill strategy, a key of FILL_STRATEGIES ('linear', 'log',
+            'previous') or a callable fn(close_before, close_after, ratio)
+        token: Token whose migration dates to fill (default: config module)
 
     Returns:
         DataFrame with interpolated values at migration points
     """
-    import numpy as np
+    token = resolve_token(token)
+    fill_fn = fill if callable(fill) else FILL_STRATEGIES[fill]
 
     # Sort by timestamp
-    df = df.sort_values('timestamp').reset_index(drop=True)
+    df = df.sort_values('timestamp', kind='stable').reset_index(drop=True)
 
     # Add 'is_interpolated' flag to existing data
     df['is_interpolated'] = False
 
-    # For each migration, check if there's a gap and interpolate
-    for event_name, migration_ts in config.MIGRATION_DATES.items():
-        # Only look at real data (not previously interpolated points) when finding gaps
-        real_data = df[df['is_interpolated'] == False].copy()
-
-        # Find data points around migration
-        before_mask = real_data['timestamp'] < migration_ts
-        after_mask = real_data['timestamp'] >= migration_ts
-
-        if before_mask.any() and after_mask.any():
-            last_before = real_data[before_mask].iloc[-1]
-            first_after = real_data[after_mask].iloc[0]
-
-            # Calculate time gap in hours
-            time_gap_hours = (first_after['timestamp'] - last_before['timestamp']) / 3600
-            time_gap_seconds = first_after['timestamp'] - last_before['timestamp']
-
-            # If gap is > hours_per_point, interpolate
-            if time_gap_hours > hours_per_point:
-                print(f"  Interpolating {time_gap_hours:.1f}h gap at {event_name}")
-
-                # Create interpolated points at regular intervals
-                num_points = int(time_gap_hours / hours_per_point)
-                interval_seconds = hours_per_point * 3600
-
-                for i in range(1, num_points + 1):
-                    ratio = (i * interval_seconds) / time_gap_seconds
-                    interp_ts = last_before['timestamp'] + (i * interval_seconds)
-
-                    # Linear interpolation of price
-                    interp_price = last_before['close'] + ratio * (first_after['close'] - last_before['close'])
-
-                    # Interpolate volume as well (gradually taper to 0 at midpoint, then back up)
-                    volume_ratio = 1 - (2 * abs(ratio - 0.5))  # Creates a valley at midpoint
-                    interp_volume = (last_before['volume'] + first_after['volume']) * volume_ratio * 0.3
-
-                    new_row = {
-                        'timestamp': int(interp_ts),
-                        'date': datetime.fromtimestamp(interp_ts),
-                        'open': interp_price,
-                        'high': interp_price * 1.001,  # Add slight variation
-                        'low': interp_price * 0.999,
-                        'close': interp_price,
-                        'volume': interp_volume,
-                        'pool_name': f'{last_before["pool_name"]}_to_{first_after["pool_name"]}',
-                        'pool_address': last_before['pool_address'],
-                        'token_symbol': last_before['token_symbol'],
-                        'price_change': 0,
-                        'price_change_pct': 0,
-                        'is_interpolated': True
-                    }
-
-                    df = pd.concat([df, pd.DataFrame([new_row])], ignore_index=True)
-
-                print(f"    Added {num_points} interpolated points ({hours_per_point}h intervals)")
-
-    # Re-sort after adding interpolated points
-    df = df.sort_values('timestamp').reset_index(drop=True)
+    event_names = list(token.migration_dates.keys())
+    migration_ts = np.array(list(token.migration_dates.values()), dtype=np.int64)
+    timestamps = df['timestamp'].to_numpy()
+
+    # Last candle before and first candle at/after each migration
+    after_idx = np.searchsorted(timestamps, migration_ts, side='left')
+    has_both = (after_idx > 0) & (after_idx < len(df))
+    before_idx = after_idx[has_both] - 1
+    after_idx = after_idx[has_both]
+    event_names = [name for name, keep in zip(event_names, has_both) if keep]
+
+    interval_seconds = hours_per_point * 3600
+    gap_seconds = timestamps[after_idx] - timestamps[before_idx]
+    # Only strictly interior points, so no synthetic row lands on the real
+    # candle that opens the next pool
+    num_points = (gap_seconds - 1) // interval_seconds
+
+    # If gap is > hours_per_point, interpolate
+    needs_fill = gap_seconds > interval_seconds
+    for name, gap, count in zip(np.array(event_names)[needs_fill], gap_seconds[needs_fill], num_points[needs_fill]):
+        print(f"  Interpolating {gap / 3600:.1f}h gap at {name}")
+        print(f"    Added {count} interpolated points ({hours_per_point}h intervals)")
+
+    before_idx, after_idx = before_idx[needs_fill], after_idx[needs_fill]
+    gap_seconds, num_points = gap_seconds[needs_fill], num_points[needs_fill]
+    if num_points.sum() == 0:
+        return df
+
+    # One synthetic row per (gap, step): step = 1..num_points within each gap
+    gap_of_row = np.repeat(np.arange(len(num_points)), num_points)
+    step = np.arange(num_points.sum()) - np.repeat(np.cumsum(num_points) - num_points, num_points) + 1
+    ratio = (step * interval_seconds) / gap_seconds[gap_of_row]
+
+    before_rows = before_idx[gap_of_row]
+    after_rows = after_idx[gap_of_row]
+    close = df['close'].to_numpy()
+    volume = df['volume'].to_numpy()
+    interp_price = fill_fn(close[before_rows], close[after_rows], ratio)
+
+    # Interpolate volume as well (gradually taper to 0 at midpoint, then back up)
+    volume_ratio = 1 - (2 * np.abs(ratio - 0.5))
+    interp_volume = (volume[before_rows] + volume[after_rows]) * volume_ratio * 0.3
+
+    interp_ts = timestamps[before_rows] + step * interval_seconds
+    pool_names = df['pool_name'].astype(str).to_numpy()
+    transition_names = np.char.add(np.char.add(pool_names[before_idx].astype(str), '_to_'),
+                                   pool_names[after_idx].astype(str))
+
+    interpolated = pd.DataFrame({
+        'timestamp': interp_ts.astype(np.int64),
+        'date': pd.to_datetime(interp_ts, unit='s', utc=True),
+        'open': interp_price,
+        'high': interp_price * 1.001,  # Add slight variation
+        'low': interp_price * 0.999,
+        'close': interp_price,
+        'volume': interp_volume,
+        'pool_name': transition_names[gap_of_row],
+        'pool_address': df['pool_address'].to_numpy()[before_rows],
+        'token_symbol': df['token_symbol'].to_numpy()[before_rows],
+        'price_change': 0.0,
+        'price_change_pct': 0.0,
+        'is_interpolated': True
+    })
+
+    # Keep categorical columns categorical across the concat
+    for column in ('pool_name', 'pool_address', 'token_symbol'):
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            categories = df[column].cat.categories.union(pd.Index(interpolated[column].unique()), sort=False)
+            df[column] = df[column].cat.set_categories(categories)
+            interpolated[column] = pd.Categorical(interpolated[column], categories=categories)
+
+    # Merge and re-sort once
+    df = pd.concat([df, interpolated], ignore_index=True)
+    df = df.sort_values('timestamp', kind='stable').reset_index(drop=True)
 
     return df
 
 
-def add_migration_markers(df: pd.DataFrame) -> pd.DataFrame:
+# Unix epoch was a Thursday; weekly buckets start on Monday like exchange charts
+_WEEK_ORIGIN = 4 * 86400
+
+
+def _bucket_start(timestamps, seconds: int):
+    """Start of the bucket each timestamp falls in (weekly buckets start on Monday)"""
+    origin = _WEEK_ORIGIN if seconds % (7 * 86400) == 0 else 0
+    return (timestamps - origin) // seconds * seconds + origin
+
+
+def resample_ohlcv(df: pd.DataFrame, seconds: int) -> pd.DataFrame:
+    """
+    Aggregate candles into fixed-width time buckets
+
+    Uses first open, max high, min low, last close and summed volume per
+    bucket, computed with ufunc.reduceat over bucket boundaries in one pass.
+    The pool columns take the value of the bucket's last candle.
+
+    Args:
+        df: Unified DataFrame of real candles sorted by timestamp
+        seconds: Bucket width in seconds
+
+    Returns:
+        DataFrame with the unified frame's columns, one row per bucket
+    """
+    if len(df) == 0:
+        return df.copy()
+
+    buckets = _bucket_start(df['timestamp'].to_numpy(), seconds)
+
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(df)] - 1
+
+    ohlcv = np.column_stack([
+        buckets[starts],
+        df['open'].to_numpy()[starts],
+        np.maximum.reduceat(df['high'].to_numpy(), starts),
+        np.minimum.reduceat(df['low'].to_numpy(), starts),
+        df['close'].to_numpy()[ends],
+        np.add.reduceat(df['volume'].to_numpy(), starts)
+    ])
+
+    timestamps = ohlcv[:, 0].astype(np.int64)
+    resampled = pd.DataFrame({
+        'timestamp': timestamps,
+        'date': pd.to_datetime(timestamps, unit='s', utc=True),
+        'open': ohlcv[:, 1],
+        'high': ohlcv[:, 2],
+        'low': ohlcv[:, 3],
+        'close': ohlcv[:, 4],
+        'volume': ohlcv[:, 5]
+    })
+    for column in ('pool_name', 'pool_address', 'token_symbol'):
+        resampled[column] = df[column].iloc[ends].reset_index(drop=True)
+    _add_price_change(resampled)
+
+    return resampled
+
+
+def build_rollups(df: pd.DataFrame, tiers: List[str] = None,
+                  token: TokenConfig = None) -> Dict[str, pd.DataFrame]:
+    """
+    Derive every OHLCV rollup tier from the finest-grained unified frame
+
+    Each tier is aggregated from the previous (finer) tier rather than the
+    raw frame, so only the first tier touches every source candle. Tiers
+    finer than the token's fetched timeframe are skipped.
+
+    Args:
+        df: Unified DataFrame (interpolated rows are ignored)
+        tiers: Tier names from ROLLUP_TIERS (default: all)
+        token: Token the frame belongs to (default: config module)
+
+    Returns:
+        Dictionary mapping tier name to its rollup DataFrame
+    """
+    source_seconds = TIMEFRAME_SECONDS[resolve_token(token).timeframe]
+    tiers = [tier for tier in (tiers or ROLLUP_TIERS)
+             if ROLLUP_TIERS[tier] >= source_seconds and ROLLUP_TIERS[tier] % source_seconds == 0]
+    tiers.sort(key=ROLLUP_TIERS.get)
+
+    if 'is_interpolated' in df.columns:
+        df = df[~df['is_interpolated']]
+    current = df.sort_values('timestamp', kind='stable')
+    current_seconds = source_seconds
+
+    rollups = {}
+    for tier in tiers:
+        seconds = ROLLUP_TIERS[tier]
+        # Cascade from the finer tier when buckets nest inside each other
+        source = current if seconds % current_seconds == 0 else df
+        rollups[tier] = resample_ohlcv(source, seconds)
+        current, current_seconds = rollups[tier], seconds
+
+    return rollups
+
+
+def update_rollups(rollups: Dict[str, pd.DataFrame], df: pd.DataFrame,
+                   since: int) -> Dict[str, pd.DataFrame]:
+    """
+    Refresh rollup tiers after the candles from `since` onward changed
+
+    Buckets that end before `since` are kept as they are; only the bucket
+    containing `since` and later ones are rebuilt, from the frame's candles
+    in that range. Both are located by binary search, so the cost follows
+    the number of changed candles, not the frame's length.
+
+    Args:
+        rollups: Output of build_rollups (or of a previous update)
+        df: Unified DataFrame sorted by timestamp, including the changed
+            candles (interpolated rows are ignored)
+        since: Timestamp of the earliest new or changed candle
+
+    Returns:
+        Dictionary mapping tier name to its updated rollup DataFrame
+    """
+    starts = {tier: _bucket_start(int(since), ROLLUP_TIERS[tier]) for tier in rollups}
+    if not starts:
+        return {}
+    recent = df.iloc[np.searchsorted(df['timestamp'].to_numpy(), min(starts.values())):]
+    if 'is_interpolated' in recent.columns:
+        recent = recent[~recent['is_interpolated']]
+    recent_timestamps = recent['timestamp'].to_numpy()
+
+    updated = {}
+    for tier, frame in rollups.items():
+        start = starts[tier]
+        head = frame.iloc[:np.searchsorted(frame['timestamp'].to_numpy(), start)]
+        source = recent.iloc[np.searchsorted(recent_timestamps, start):]
+        if len(source) == 0:
+            updated[tier] = head.reset_index(drop=True)
+            continue
+        updated[tier] = _concat_frames(head, resample_ohlcv(source, ROLLUP_TIERS[tier]))
+
+    return updated
+
+
+def save_rollups(rollups: Dict[str, pd.DataFrame], rollup_dir: str = None,
+                 token: TokenConfig = None):
+    """
+    Persist rollup tiers as columnar arrays for the chart and export stages
+
+    Args:
+        rollups: Output of build_rollups
+        rollup_dir: Target directory (default: <OUTPUT_DIR>/rollups)
+        token: Token whose output directory to use (default: config module)
+    """
+    if rollup_dir is None:
+        rollup_dir = f"{resolve_token(token).output_dir}/rollups"
+
+    for tier, frame in rollups.items():
+        pools = pd.Categorical(frame['pool_name'])
+        _, first_rows = np.unique(pools.codes, return_index=True)
+        pool_infos = [
+            {
+                'pool_name': str(frame['pool_name'].iloc[row]),
+                'address': str(frame['pool_address'].iloc[row]),
+                'token_symbol': str(frame['token_symbol'].iloc[row])
+            }
+            for row in first_rows
+        ]
+        save_ohlcv_frame(frame[['timestamp', 'open', 'high', 'low', 'close', 'volume']].to_numpy(dtype=np.float64),
+                         np.unique(pools.codes, return_inverse=True)[1], pool_infos, rollup_dir, tier)
+
+    print(f"✓ Saved {len(rollups)} rollup tiers to: {rollup_dir} ({', '.join(rollups)})")
+
+
+def load_rollup(tier: str, rollup_dir: str = None, token: TokenConfig = None) -> pd.DataFrame:
+    """
+    Load a persisted rollup tier as a unified DataFrame
+
+    Args:
+        tier: Tier name from ROLLUP_TIERS
+        rollup_dir: Directory written by save_rollups (default: <OUTPUT_DIR>/rollups)
+        token: Token whose output directory to use (default: config module)
+
+    Returns:
+        DataFrame with the unified frame's columns, or None if not persisted
+    """
+    if rollup_dir is None:
+        rollup_dir = f"{resolve_token(token).output_dir}/rollups"
+
+    loaded = load_ohlcv_frame(rollup_dir, tier)
+    if loaded is None:
+        return None
+
+    ohlcv, pool_codes, pool_infos = loaded
+    df = _build_frame(ohlcv, pool_codes, [info['pool_name'] for info in pool_infos], pool_infos)
+    _add_price_change(df)
+    return df
+
+
+def add_migration_markers(df: pd.DataFrame, token: TokenConfig = None) -> pd.DataFrame:
     """
     Add migration event markers to the DataFrame
 
     Args:
         df: Unified DataFrame
+        token: Token whose migration dates to mark (default: config module)
 
     Returns:
         DataFrame with migration marker column
@@ -158,25 +489,94 @@ def add_migration_markers(df: pd.DataFrame) -> pd.DataFrame:
     df['migration_event'] = None
 
     # Mark migration dates
-    for event_name, timestamp in config.MIGRATION_DATES.items():
-        migration_date = datetime.fromtimestamp(timestamp).date()
+    for event_name, timestamp in resolve_token(token).migration_dates.items():
+        migration_date = datetime.fromtimestamp(timestamp, tz=timezone.utc).date()
         mask = df['date'].dt.date == migration_date
         df.loc[mask, 'migration_event'] = event_name.replace('_', ' ').title()
 
     return df
 
 
-def get_summary_stats(df: pd.DataFrame) -> Dict:
+def append_candles(df: pd.DataFrame, pool_name: str, pool_info: Dict, ohlcv,
+                   token: TokenConfig = None):
+    """
+    Fold newly fetched candles for one pool into a consolidated frame
+
+    Candles at timestamps the frame already holds replace the existing row
+    (the previous newest candle was usually still forming); later candles
+    are appended. Only the new rows get price change, interpolation and
+    migration columns, so the cost is independent of the frame's length.
+
+    Args:
+        df: Consolidated frame from create_unified_dataframe (optionally with
+            interpolated rows and migration markers)
+        pool_name: Pool the candles belong to
+        pool_info: Pool configuration dictionary
+        ohlcv: Candles in any order, as an (N, 6) array or API rows
+        token: Token the frame belongs to (default: config module)
+
+    Returns:
+        Tuple of (updated frame, number of rows added or changed)
+    """
+    candles = parse_ohlcv_array({'data': {'attributes': {'ohlcv_list': ohlcv}}})
+    if len(candles) == 0:
+        return df, 0
+
+    candles = candles[np.argsort(candles[:, 0], kind='stable')]
+    timestamps = df['timestamp'].to_numpy()
+    last_ts = timestamps[-1] if len(timestamps) else np.iinfo(np.int64).min
+    candles = candles[candles[:, 0] >= last_ts]
+    if len(candles) == 0:
+        return df, 0
+
+    new_rows = _build_frame(candles, np.zeros(len(candles), dtype=np.int64), [pool_name], [pool_info])
+    _add_price_change(new_rows)
+
+    # Rows already present with identical values and pool are not changes
+    existing = df[df['timestamp'].isin(new_rows['timestamp'])]
+    existing = existing[existing['pool_name'].astype(str) == pool_name]
+    merged = new_rows[list(_OHLCV_COLUMNS)].merge(existing[list(_OHLCV_COLUMNS)], how='left',
+                                                  on=list(_OHLCV_COLUMNS), indicator=True)
+    changed = merged['_merge'].to_numpy() == 'left_only'
+    if not changed.any():
+        return df, 0
+    new_rows = new_rows[changed].reset_index(drop=True)
+
+    if 'is_interpolated' in df.columns:
+        new_rows['is_interpolated'] = False
+    if 'migration_event' in df.columns:
+        add_migration_markers(new_rows, token=token)
+
+    kept = df[~df['timestamp'].isin(new_rows['timestamp'])]
+    return _concat_frames(kept, new_rows[df.columns]), int(changed.sum())
+
+
+def _concat_frames(head: pd.DataFrame, tail: pd.DataFrame) -> pd.DataFrame:
+    """Append rows to a unified frame, keeping the pool columns categorical"""
+    for column in ('pool_name', 'pool_address', 'token_symbol'):
+        if isinstance(head[column].dtype, pd.CategoricalDtype) and \
+                isinstance(tail[column].dtype, pd.CategoricalDtype):
+            categories = head[column].cat.categories.union(tail[column].cat.categories, sort=False)
+            head = head.assign(**{column: head[column].cat.set_categories(categories)})
+            tail = tail.assign(**{column: tail[column].cat.set_categories(categories)})
+    return pd.concat([head, tail], ignore_index=True)
+
+
+def get_summary_stats(df: pd.DataFrame, token: TokenConfig = None) -> Dict:
     """
     Calculate summary statistics for the unified price history
 
     Args:
         df: Unified DataFrame
+        token: Token the frame belongs to (default: config module)
 
     Returns:
         Dictionary of summary statistics
     """
+    token = resolve_token(token)
+    pool_counts = df['pool_name'].value_counts()
     stats = {
+        'token_symbol': token.symbol,
         'total_days': len(df),
         'start_date': df['date'].min(),
         'end_date': df['date'].max(),
@@ -188,11 +588,7 @@ def get_summary_stats(df: pd.DataFrame) -> Dict:
         'lowest_price': df['low'].min(),
         'total_volume': df['volume'].sum(),
         'avg_daily_volume': df['volume'].mean(),
-        'pools': {
-            'mon3y': len(df[df['pool_name'] == 'mon3y']),
-            'zera_Raydium': len(df[df['pool_name'] == 'zera_Raydium']),
-            'zera_Meteora': len(df[df['pool_name'] == 'zera_Meteora'])
-        }
+        'pools': {pool_name: int(pool_counts.get(pool_name, 0)) for pool_name in token.pools}
     }
 
     return stats
@@ -201,7 +597,7 @@ def get_summary_stats(df: pd.DataFrame) -> Dict:
 def print_summary(stats: Dict):
     """Print summary statistics in a readable format"""
     print("\n" + "="*60)
-    print("ZERA UNIFIED PRICE HISTORY SUMMARY")
+    print(f"{stats['token_symbol']} UNIFIED PRICE HISTORY SUMMARY")
     print("="*60)
     print(f"\nDate Range: {stats['start_date']} to {stats['end_date']}")
     print(f"Total Days: {stats['total_days']}")
@@ -0,0 +1,180 @@
+"""
+Downsampling for charts and chart payloads
+
+A chart can only show as many candles as it has horizontal pixels for; a
+backfilled minute or hour history easily exceeds that by an order of
+magnitude. Two reductions are offered, both applied per pool run so a
+bucket never mixes two pools:
+
+- bucket_ohlcv: merges N consecutive candles into one (first open, max
+  high, min low, last close, summed volume), so every wick extreme
+  survives. Used for candlestick charts and the webapp payloads.
+- lttb / downsample_line: Largest-Triangle-Three-Buckets, which keeps the
+  points that preserve the visual shape of a line series.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+import config
+
+# Columns aggregated per bucket; everything else takes the bucket's last row
+_FIRST_COLUMNS = ('date', 'timestamp', 'open')
+
+
+def drawable_candles(width_inches: float, dpi: float = None, pixels_per_candle: float = None,
+                     plot_fraction: float = 0.85) -> int:
+    """
+    Number of candles that fit legibly across a plot
+
+    Args:
+        width_inches: Figure width in inches (or CSS pixels with dpi=1)
+        dpi: Output resolution (default: config.CHART_DPI)
+        pixels_per_candle: Horizontal pixels per candle, body plus gap
+            (default: config.CHART_PIXELS_PER_CANDLE)
+        plot_fraction: Share of the width taken by the axes
+
+    Returns:
+        Maximum candle count
+    """
+    if dpi is None:
+        dpi = config.CHART_DPI
+    if pixels_per_candle is None:
+        pixels_per_candle = config.CHART_PIXELS_PER_CANDLE
+    return max(1, int(width_inches * dpi * plot_fraction / pixels_per_candle))
+
+
+def pool_runs(df: pd.DataFrame):
+    """
+    [start, end) row ranges of consecutive rows from the same pool
+
+    Returns:
+        (starts, ends) arrays; a frame without 'pool_name' is one run, an
+        empty frame has none
+    """
+    if len(df) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    if 'pool_name' not in df.columns:
+        return np.array([0]), np.array([len(df)])
+    pool_names = df['pool_name']
+    if isinstance(pool_names.dtype, pd.CategoricalDtype):
+        codes = pool_names.cat.codes.to_numpy()
+    else:
+        codes = pd.factorize(pool_names)[0]
+    starts = np.r_[0, np.flatnonzero(codes[1:] != codes[:-1]) + 1]
+    return starts, np.r_[starts[1:], len(df)]
+
+
+def bucket_factor(n_rows: int, max_points: int) -> int:
+    """Candles merged per bucket to bring n_rows down to at most ~max_points"""
+    if max_points is None or n_rows <= max_points:
+        return 1
+    return math.ceil(n_rows / max(1, max_points))
+
+
+def bucket_ohlcv(df: pd.DataFrame, max_points: int) -> pd.DataFrame:
+    """
+    Merge consecutive candles so the frame has at most about `max_points` rows
+
+    Each pool run is cut into buckets of the same number of candles (a
+    run's last bucket may be shorter), so the result can exceed
+    `max_points` by at most one bucket per pool. Returns the frame itself
+    when it is already small enough.
+
+    Args:
+        df: Frame with date/timestamp/open/high/low/close/volume columns,
+            sorted by time with each pool's rows contiguous
+        max_points: Target row count
+
+    Returns:
+        Frame with the same columns, one row per bucket
+    """
+    factor = bucket_factor(len(df), max_points)
+    if factor == 1:
+        return df
+
+    run_starts, run_ends = pool_runs(df)
+    starts = np.concatenate([np.arange(start, end, factor) for start, end in zip(run_starts, run_ends)])
+    ends = np.r_[starts[1:], len(df)] - 1
+
+    # Non-OHLCV columns (pool, address, markers) come from the bucket's last candle
+    out = df.iloc[ends].reset_index(drop=True)
+    for column in _FIRST_COLUMNS:
+        if column in df.columns:
+            out[column] = df[column].to_numpy()[starts]
+    out['high'] = np.maximum.reduceat(df['high'].to_numpy(), starts)
+    out['low'] = np.minimum.reduceat(df['low'].to_numpy(), starts)
+    if 'volume' in df.columns:
+        out['volume'] = np.add.reduceat(df['volume'].to_numpy(), starts)
+    if 'price_change' in df.columns:
+        out['price_change'] = out['close'] - out['open']
+    return out
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets point selection
+
+    Always keeps the first and last points. Each bucket in between keeps the
+    point forming the largest triangle with the previously kept point and
+    the average of the next bucket.
+
+    Args:
+        x: Monotonic x values (e.g. Unix timestamps)
+        y: Values
+        n_out: Number of points to keep
+
+    Returns:
+        Sorted indices of the kept points
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Bucket edges over the points between first and last
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.int64)
+
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        areas = np.abs((x[previous] - avg_x) * (y[start:end] - y[previous])
+                       - (x[previous] - x[start:end]) * (avg_y - y[previous]))
+        previous = start + int(np.nanargmax(areas)) if np.isfinite(areas).any() else start
+        kept[i + 1] = previous
+
+    return kept
+
+
+def downsample_line(df: pd.DataFrame, max_points: int, column: str = 'close') -> pd.DataFrame:
+    """
+    Reduce a line series to about `max_points` rows with LTTB
+
+    Points are shared between pool runs in proportion to their length, so
+    each pool keeps its first and last point.
+
+    Args:
+        df: Frame with 'timestamp' and `column`, sorted by time
+        max_points: Target row count
+        column: Column holding the line's values
+
+    Returns:
+        The kept rows of `df`
+    """
+    if max_points is None or len(df) <= max_points:
+        return df
+
+    x = df['timestamp'].to_numpy()
+    y = df[column].to_numpy()
+    indices = []
+    for start, end in zip(*pool_runs(df)):
+        share = max(3, round(max_points * (end - start) / len(df)))
+        indices.append(start + lttb(x[start:end], y[start:end], share))
+    return df.iloc[np.concatenate(indices)]
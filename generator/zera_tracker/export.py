@@ -0,0 +1,401 @@
+"""
+Export layer for the unified price history
+
+- CSV: only rows that are new or changed since the last export are
+  formatted. A sidecar index records a hash and byte offset per written
+  row, so an append touches nothing else. A change inside the file (e.g. the
+  previously forming candle) copies the untouched prefix bytes and
+  re-formats only the rows after it.
+- Parquet: partitioned by pool and month (`pool_name=.../month=YYYY-MM/`),
+  rewriting only partitions whose rows changed. Needs the optional pyarrow
+  dependency.
+- Chart payloads: one compact JSON document per rollup tier for the webapp
+  chart, with columnar OHLCV arrays, delta-encoded timestamps and migration
+  markers, optionally pre-compressed (gzip, or brotli if installed). Tiers
+  longer than the chart can show are merged into OHLC buckets first.
+
+Every rewrite goes to a temporary file that is renamed over the target, so
+readers never see a half-written file.
+"""
+
+import gzip
+import json
+import os
+import shutil
+from typing import Dict, Iterable
+import numpy as np
+import pandas as pd
+from .cache import atomic_write
+from .downsample import bucket_factor, bucket_ohlcv, downsample_line
+
+CSV_INDEX_SUFFIX = '.index.npz'
+PARQUET_MANIFEST = '_partitions.json'
+CHART_PAYLOAD_VERSION = 1
+CHART_PAYLOAD_COMPRESSION = ('gzip', 'br')
+
+
+def _row_hashes(df: pd.DataFrame) -> np.ndarray:
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _csv_lines(df: pd.DataFrame, header: bool) -> bytes:
+    return df.to_csv(index=False, header=header).encode()
+
+
+def _line_offsets(data: bytes, start: int) -> np.ndarray:
+    """Byte offset of the start of each line in `data`, shifted by `start`"""
+    ends = np.flatnonzero(np.frombuffer(data, dtype=np.uint8) == ord('\n')) + 1
+    return start + np.r_[0, ends[:-1]]
+
+
+def _load_csv_index(path: str):
+    index_path = f"{path}{CSV_INDEX_SUFFIX}"
+    if not os.path.exists(path) or not os.path.exists(index_path):
+        return None
+    try:
+        with np.load(index_path, allow_pickle=False) as index:
+            return {key: index[key] for key in ('columns', 'hashes', 'offsets', 'size')}
+    except Exception as e:
+        print(f"✗ Error loading CSV index {index_path}: {e}")
+        return None
+
+
+def _save_csv_index(path: str, columns, hashes: np.ndarray, offsets: np.ndarray, size: int):
+    with atomic_write(f"{path}{CSV_INDEX_SUFFIX}", 'wb') as f:
+        np.savez(f, columns=np.asarray(columns, dtype=str), hashes=hashes,
+                 offsets=offsets, size=np.int64(size))
+
+
+def export_csv(df: pd.DataFrame, path: str) -> Dict:
+    """
+    Bring a CSV export up to date with the frame, writing as little as possible
+
+    Produces the same file as `df.to_csv(path, index=False)`.
+
+    Args:
+        df: Frame to export
+        path: CSV path
+
+    Returns:
+        Dictionary with 'mode' ('unchanged', 'append', 'tail' or 'full') and
+        'rows_written'
+    """
+    hashes = _row_hashes(df)
+    index = _load_csv_index(path)
+
+    first_changed = 0
+    if (index is not None and list(index['columns']) == list(df.columns)
+            and os.path.getsize(path) == int(index['size'])):
+        old = index['hashes']
+        common = min(len(old), len(hashes))
+        mismatch = np.flatnonzero(old[:common] != hashes[:common])
+        first_changed = int(mismatch[0]) if len(mismatch) else common
+        if first_changed == len(old) == len(hashes):
+            return {'mode': 'unchanged', 'rows_written': 0}
+    else:
+        index = None
+
+    if index is None or first_changed == 0:
+        # Nothing reusable: header plus every row
+        data = _csv_lines(df, header=True)
+        header_len = data.index(b'\n') + 1
+        with atomic_write(path, 'wb') as f:
+            f.write(data)
+        offsets = _line_offsets(data[header_len:], header_len) if len(df) else np.empty(0, np.int64)
+        _save_csv_index(path, df.columns, hashes, offsets, len(data))
+        return {'mode': 'full', 'rows_written': len(df)}
+
+    # Rows before first_changed are already on disk, byte for byte
+    keep_bytes = int(index['offsets'][first_changed]) if first_changed < len(index['offsets']) \
+        else int(index['size'])
+    data = _csv_lines(df.iloc[first_changed:], header=False)
+
+    if first_changed == len(index['hashes']):
+        # Pure append: the existing bytes stay where they are
+        mode = 'append'
+        with open(path, 'ab') as f:
+            f.write(data)
+    else:
+        # Copy the untouched prefix into a new file, then the re-formatted tail
+        mode = 'tail'
+        with open(path, 'rb') as src, atomic_write(path, 'wb') as dst:
+            remaining = keep_bytes
+            while remaining:
+                chunk = src.read(min(remaining, 1 << 20))
+                if not chunk:
+                    break
+                dst.write(chunk)
+                remaining -= len(chunk)
+            dst.write(data)
+
+    offsets = np.r_[index['offsets'][:first_changed], _line_offsets(data, keep_bytes)]
+    _save_csv_index(path, df.columns, hashes, offsets, keep_bytes + len(data))
+    return {'mode': mode, 'rows_written': len(df) - first_changed}
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+    return pyarrow, pyarrow.parquet
+
+
+def export_parquet(df: pd.DataFrame, root: str) -> Dict:
+    """
+    Write the frame as Parquet partitioned by pool and month
+
+    Layout: `<root>/pool_name=<pool>/month=<YYYY-MM>/part-0.parquet`, readable
+    as a hive-partitioned dataset. Partitions whose rows are unchanged since
+    the last export are left alone; partitions that no longer exist are removed.
+
+    Args:
+        df: Frame to export (needs 'pool_name' and a UTC 'date' column)
+        root: Dataset directory
+
+    Returns:
+        Dictionary with 'written', 'unchanged' and 'removed' partition counts
+    """
+    pa, pq = _import_pyarrow()
+
+    manifest_path = f"{root}/{PARQUET_MANIFEST}"
+    previous = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            previous = json.load(f)
+
+    pools = df['pool_name'].astype(str)
+    months = df['date'].dt.strftime('%Y-%m')
+    current = {}
+    written = unchanged = 0
+
+    for (pool_name, month), rows in df.groupby([pools, months], sort=True).groups.items():
+        part = df.loc[rows]
+        relative = f"pool_name={pool_name}/month={month}"
+        digest = f"{_row_hashes(part).sum(dtype=np.uint64):016x}:{len(part)}"
+        current[relative] = digest
+        if previous.get(relative) == digest and os.path.exists(f"{root}/{relative}/part-0.parquet"):
+            unchanged += 1
+            continue
+
+        # Partition values live in the path, as hive-style readers expect
+        table = pa.Table.from_pandas(part.drop(columns=['pool_name']), preserve_index=False)
+        with atomic_write(f"{root}/{relative}/part-0.parquet", 'wb') as f:
+            pq.write_table(table, f)
+        written += 1
+
+    removed = 0
+    for relative in set(previous) - set(current):
+        shutil.rmtree(f"{root}/{relative}", ignore_errors=True)
+        removed += 1
+        pool_dir = os.path.dirname(f"{root}/{relative}")
+        if os.path.isdir(pool_dir) and not os.listdir(pool_dir):
+            os.rmdir(pool_dir)
+
+    with atomic_write(manifest_path) as f:
+        json.dump(current, f, indent=2, sort_keys=True)
+
+    return {'written': written, 'unchanged': unchanged, 'removed': removed}
+
+
+def _round_significant(values: np.ndarray, digits: int) -> list:
+    """Round to significant digits so JSON floats stay short (8 → '8.0', not '8.000000000000002')"""
+    values = np.asarray(values, dtype=np.float64)
+    magnitude = np.floor(np.log10(np.abs(values), where=values != 0, out=np.zeros_like(values)))
+    scale = 10.0 ** (digits - 1 - magnitude)
+    rounded = np.round(values * scale) / scale
+    # NaN is not valid JSON
+    return [None if value != value else value for value in rounded.tolist()]
+
+
+def build_chart_payload(df: pd.DataFrame, tier: str, interval: int, token=None,
+                        digits: int = 6, candles_per_point: int = 1) -> Dict:
+    """
+    Encode a rollup tier as the webapp chart payload
+
+    Layout (all arrays are row-aligned):
+
+        version           CHART_PAYLOAD_VERSION
+        symbol, tier      token symbol and tier name
+        interval          tier width in seconds
+        candles_per_point tier candles merged into each row (1 if none)
+        t0                first candle's Unix time in seconds (null if empty)
+        dt                seconds since the previous candle (first entry 0)
+        o/h/l/c/v         OHLCV columns, rounded to `digits` significant
+                          digits; null where the value was NaN
+        pool_runs         [[pool index, first row], ...], one entry per pool change
+        pools             [{name, label, address, color}, ...]
+        migrations        [{name, time, label}, ...], sorted by time
+
+    To decode, take row i's time as t0 plus the running sum of dt[:i + 1],
+    and its pool as pools[index] of the last pool_runs entry whose first
+    row is <= i. For a regular tier `dt` is one repeated value, which gzip
+    shrinks to almost nothing. overview.json (build_overview_payload) has
+    the same layout without interval, candles_per_point, o, h, l and v, and
+    index.json lists each tier's interval, rows and JSON size, so a client
+    can pick a tier before fetching it.
+
+    Args:
+        df: Rollup frame (sorted by timestamp, real candles only)
+        tier: Tier name (e.g. '1h')
+        interval: Tier width in seconds
+        token: Token the frame belongs to (default: config module)
+        digits: Significant digits kept for prices and volume
+        candles_per_point: Tier candles merged into each row (see bucket_ohlcv)
+
+    Returns:
+        JSON-serialisable dictionary
+    """
+    from .tokens import resolve_token
+    token = resolve_token(token)
+
+    timestamps = df['timestamp'].to_numpy(dtype=np.int64)
+    pools = pd.Categorical(df['pool_name'].astype(str), categories=[
+        name for name in dict.fromkeys(df['pool_name'].astype(str))
+    ])
+    codes = pools.codes
+    run_starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.empty(0, np.int64)
+    addresses = df.groupby(df['pool_name'].astype(str), sort=False)['pool_address'].first()
+
+    return {
+        'version': CHART_PAYLOAD_VERSION,
+        'symbol': token.symbol,
+        'tier': tier,
+        'interval': int(interval),
+        'candles_per_point': int(candles_per_point),
+        't0': int(timestamps[0]) if len(timestamps) else None,
+        'dt': np.diff(timestamps, prepend=timestamps[:1]).tolist(),
+        'o': _round_significant(df['open'], digits),
+        'h': _round_significant(df['high'], digits),
+        'l': _round_significant(df['low'], digits),
+        'c': _round_significant(df['close'], digits),
+        'v': _round_significant(df['volume'], digits),
+        'pool_runs': [[int(codes[start]), int(start)] for start in run_starts],
+        'pools': [
+            {'name': name, 'label': token.pool_label(name),
+             'address': str(addresses.get(name, token.pools.get(name, {}).get('address', ''))),
+             'color': token.pool_color(name)}
+            for name in pools.categories
+        ],
+        'migrations': [
+            {'name': event_name, 'time': int(timestamp), 'label': token.migration_label(event_name)}
+            for event_name, timestamp in sorted(token.migration_dates.items(), key=lambda item: item[1])
+        ]
+    }
+
+
+def _compress(data: bytes, encoding: str) -> bytes:
+    if encoding == 'gzip':
+        # mtime=0 keeps the output deterministic, so unchanged payloads stay unchanged
+        return gzip.compress(data, compresslevel=9, mtime=0)
+    if encoding == 'br':
+        try:
+            import brotli
+        except ImportError:
+            raise ImportError("Brotli chart payloads require the brotli package (pip install brotli)")
+        return brotli.compress(data, quality=11)
+    raise ValueError(f"Unknown payload compression '{encoding}' (expected one of {CHART_PAYLOAD_COMPRESSION})")
+
+
+def _write_if_changed(path: str, data: bytes) -> bool:
+    """Atomically write `data` unless the file already holds exactly these bytes"""
+    if os.path.exists(path) and os.path.getsize(path) == len(data):
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    with atomic_write(path, 'wb') as f:
+        f.write(data)
+    return True
+
+
+def _encode_files(directory: str, name: str, payload: Dict, compression: Iterable[str]) -> Dict:
+    """Payload bytes per encoding, keyed 'json' / 'gzip' / 'br', with their paths"""
+    data = json.dumps(payload, separators=(',', ':')).encode()
+    files = {'json': (f"{directory}/{name}.json", data)}
+    for encoding in compression:
+        suffix = 'gz' if encoding == 'gzip' else encoding
+        files[encoding] = (f"{directory}/{name}.json.{suffix}", _compress(data, encoding))
+    return files
+
+
+def build_overview_payload(df: pd.DataFrame, max_points: int, token=None, digits: int = 6) -> Dict:
+    """
+    Close-price line of the whole history, reduced with LTTB
+
+    Args:
+        df: Finest rollup tier (sorted by timestamp)
+        max_points: Points to keep
+        token: Token the frame belongs to (default: config module)
+        digits: Significant digits kept for prices
+
+    Returns:
+        JSON-serialisable dictionary with t0/dt/c/pool_runs as in build_chart_payload
+    """
+    line = downsample_line(df, max_points).reset_index(drop=True)
+    payload = build_chart_payload(line, 'overview', 0, token=token, digits=digits)
+    for column in ('o', 'h', 'l', 'v', 'interval', 'candles_per_point'):
+        del payload[column]
+    return payload
+
+
+def export_chart_payloads(rollups: Dict[str, pd.DataFrame], directory: str, token=None,
+                          compression: Iterable[str] = ('gzip',), digits: int = 6,
+                          max_candles: int = None, overview_points: int = None) -> Dict:
+    """
+    Write one chart payload per rollup tier, plus pre-compressed copies
+
+    Files are `<directory>/<tier>.json` (and `.json.gz` / `.json.br`), next
+    to an `index.json` listing the tiers with their candle counts and sizes so
+    the webapp can pick a tier before fetching it. Tiers with more than
+    `max_candles` candles are merged into OHLC buckets; `overview.json`
+    holds an LTTB-reduced close line of the finest tier.
+
+    Args:
+        rollups: Output of consolidator.build_rollups
+        directory: Target directory (e.g. served as static files)
+        token: Token the rollups belong to (default: config module)
+        compression: Encodings to pre-compress with ('gzip', 'br')
+        digits: Significant digits kept for prices and volume
+        max_candles: Most rows per tier payload (default: no limit)
+        overview_points: Points in overview.json (default: no overview)
+
+    Returns:
+        Dictionary mapping tier name to {'rows', 'bytes', 'written'}, where
+        'bytes' maps each encoding ('json', 'gzip', 'br') to its file size
+    """
+    from .consolidator import ROLLUP_TIERS
+
+    payloads = {}
+    for tier, frame in rollups.items():
+        candles_per_point = bucket_factor(len(frame), max_candles)
+        frame = bucket_ohlcv(frame, max_candles)
+        payloads[tier] = (len(frame), build_chart_payload(frame, tier, ROLLUP_TIERS[tier], token=token,
+                                                          digits=digits, candles_per_point=candles_per_point))
+    if overview_points and rollups:
+        finest = min(rollups, key=ROLLUP_TIERS.get)
+        overview = build_overview_payload(rollups[finest], overview_points, token=token, digits=digits)
+        payloads['overview'] = (len(overview['dt']), overview)
+
+    results = {}
+    for name, (rows, payload) in payloads.items():
+        files = _encode_files(directory, name, payload, compression)
+        written = False
+        for path, content in files.values():
+            written = _write_if_changed(path, content) or written
+        results[name] = {
+            'rows': rows,
+            'bytes': {encoding: len(content) for encoding, (_, content) in files.items()},
+            'written': written
+        }
+
+    index = {
+        'version': CHART_PAYLOAD_VERSION,
+        'tiers': {tier: {'interval': ROLLUP_TIERS[tier], 'rows': result['rows'],
+                         'bytes': result['bytes']['json']}
+                  for tier, result in results.items() if tier in rollups}
+    }
+    if 'overview' in results:
+        index['overview'] = {'rows': results['overview']['rows'], 'bytes': results['overview']['bytes']['json']}
+    _write_if_changed(f"{directory}/index.json", json.dumps(index, indent=2).encode())
+    return results
@@ -2,71 +2,124 @@
 Data fetcher for GeckoTerminal API
 """
 
+import math
 import requests
 import time
 import json
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from typing import Dict, List
-from datetime import datetime
+from datetime import datetime, timezone
 import config
-
-
-def fetch_pool_data(pool_address: str, retries: int = 3) -> Dict:
+from .cache import (
+    cache_key,
+    load_columnar_cache,
+    save_columnar_cache,
+    load_pool_cache,
+    save_pool_cache,
+    merge_ohlcv,
+    ohlcv_array
+)
+from .client import ApiClient, default_client
+from .retry import CircuitOpenError
+from .ratelimit import TokenBucket
+from .tokens import TokenConfig, resolve_token
+
+
+TIMEFRAME_SECONDS = {
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400
+}
+
+# Rollup tiers derived from the finest-grained frame, finest first (see
+# consolidator.build_rollups); defined here so the CLI can list them without
+# importing pandas
+ROLLUP_TIERS = {
+    '5m': 300,
+    '15m': 900,
+    '1h': 3600,
+    '4h': 4 * 3600,
+    '1d': 86400,
+    '1w': 7 * 86400
+}
+
+
+def _date_to_timestamp(date_str: str) -> int:
+    """Convert a YYYY-MM-DD config date to a UTC midnight Unix timestamp"""
+    return int(datetime.strptime(date_str, '%Y-%m-%d').replace(tzinfo=timezone.utc).timestamp())
+
+
+def fetch_pool_data(pool_address: str, retries: int = None, rate_limiter: TokenBucket = None,
+                    params: Dict = None, token: TokenConfig = None, client: ApiClient = None,
+                    conditional: bool = True) -> Dict:
     """
     Fetch OHLCV data for a specific pool from GeckoTerminal API
 
     Args:
         pool_address: The Solana pool address
-        retries: Number of retry attempts if request fails
+        retries: Total attempts (default: the client's RetryPolicy.max_attempts)
+        rate_limiter: Optional shared limiter; every attempt consumes one token
+        params: Optional query parameters (e.g. before_timestamp, limit)
+        token: Token whose network/timeframe to query (default: config module)
+        client: Pooled HTTP client (default: the process-wide client)
+        conditional: Revalidate with ETag/Last-Modified (see ApiClient.get_json)
 
     Returns:
         Dictionary containing pool data and OHLCV list
     """
-    url = f"{config.BASE_URL}/networks/{config.NETWORK}/pools/{pool_address}/ohlcv/{config.TIMEFRAME}"
-    headers = {"Accept": "application/json"}
+    token = resolve_token(token)
+    if client is None:
+        client = default_client()
+    url = f"{token.base_url}/networks/{token.network}/pools/{pool_address}/ohlcv/{token.timeframe}"
+
+    policy = client.retry_policy
+    if retries is None:
+        retries = policy.max_attempts
 
     for attempt in range(retries):
         try:
+            if rate_limiter is not None:
+                rate_limiter.acquire()
             print(f"Fetching data for pool: {pool_address[:8]}...")
-            response = requests.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-
-            data = response.json()
-            return data
+            return client.get_json(url, params=params, conditional=conditional)
 
+        except CircuitOpenError as e:
+            # The host is failing for everyone; don't add to the queue of retries
+            raise Exception(f"Failed to fetch data for {pool_address}: {e}")
         except requests.exceptions.RequestException as e:
             print(f"Attempt {attempt + 1}/{retries} failed: {e}")
-            if attempt < retries - 1:
-                time.sleep(2)  # Wait before retry
+            if attempt < retries - 1 and policy.is_retryable(e):
+                delay = policy.delay(attempt, policy.retry_after(e))
+                time.sleep(delay)  # Jittered backoff, at least any Retry-After
             else:
-                raise Exception(f"Failed to fetch data for {pool_address} after {retries} attempts")
+                raise Exception(f"Failed to fetch data for {pool_address} after {attempt + 1} attempts")
 
     return None
 
 
 def save_cache(data: Dict, cache_path: str):
     """
-    Save fetched data to cache file
+    Save fetched data to the columnar cache
 
     Args:
         data: Dictionary to cache
-        cache_path: Path to save cache file
+        cache_path: Cache directory (manifest plus one array per pool)
     """
-    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
-    with open(cache_path, 'w') as f:
-        json.dump({
-            'cached_at': datetime.now().isoformat(),
-            'data': data
-        }, f, indent=2)
+    save_columnar_cache(data, cache_path)
     print(f"✓ Data cached to: {cache_path}")
 
 
 def load_cache(cache_path: str) -> Dict:
     """
-    Load data from cache file
+    Load data from cache
+
+    Reads the columnar cache directory; a legacy `api_cache.json` file path
+    is still accepted so existing caches keep working.
 
     Args:
-        cache_path: Path to cache file
+        cache_path: Cache directory or legacy JSON cache file
 
     Returns:
         Cached data dictionary or None if not found
@@ -75,60 +128,169 @@ def load_cache(cache_path: str) -> Dict:
         return None
 
     try:
-        with open(cache_path, 'r') as f:
-            cache = json.load(f)
+        if os.path.isdir(cache_path):
+            cached = load_columnar_cache(cache_path)
+            if cached is None:
+                return None
+            cached_at, data = cached
+            cached_time = datetime.fromtimestamp(cached_at)
+        else:
+            with open(cache_path, 'r') as f:
+                cache = json.load(f)
             cached_time = datetime.fromisoformat(cache['cached_at'])
-            print(f"✓ Loading cached data from {cached_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            return cache['data']
+            data = cache['data']
+
+        print(f"✓ Loading cached data from {cached_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        return data
     except Exception as e:
         print(f"✗ Error loading cache: {e}")
         return None
 
 
-def fetch_all_pools(use_cache: bool = False, cache_path: str = None) -> Dict[str, Dict]:
+def _fetch_pool(pool_name: str, pool_info: Dict, rate_limiter: TokenBucket,
+                params: Dict = None, token: TokenConfig = None) -> Dict:
+    """Fetch a single pool and wrap it in the {'info', 'data'} result shape"""
+    print(f"\nFetching {pool_info['name']}...")
+    try:
+        data = fetch_pool_data(pool_info['address'], rate_limiter=rate_limiter, params=params,
+                               token=token)
+        print(f"✓ Successfully fetched {len(data['data']['attributes']['ohlcv_list'])} data points for {pool_name}")
+        return {
+            'info': pool_info,
+            'data': data
+        }
+    except Exception as e:
+        print(f"✗ Error fetching {pool_name}: {e}")
+        return {
+            'info': pool_info,
+            'data': None,
+            'error': str(e)
+        }
+
+
+def fetch_pool_incremental(pool_name: str, pool_info: Dict, rate_limiter: TokenBucket,
+                           cache_dir: str, token: TokenConfig = None) -> Dict:
     """
-    Fetch data for all pools defined in config
+    Fetch only the candles newer than a pool's cached history
+
+    Pools whose `active_until` date had passed when they were last cached
+    are served from the cache without any API call. A gap longer than one
+    page (e.g. minute candles after a day offline) is paged backwards with
+    `before_timestamp` until it is covered; if a page fails, nothing is
+    saved, so the next run retries the whole gap instead of keeping a hole.
+
+    Args:
+        pool_name: Name of the pool
+        pool_info: Pool configuration dictionary
+        rate_limiter: Shared limiter
+        cache_dir: Per-pool incremental cache directory
+        token: Token the pool belongs to (default: config module)
+
+    Returns:
+        {'info', 'data'[, 'error']} as in fetch_all_pools, with the pool's
+        cached history merged with the new candles
+    """
+    token = resolve_token(token)
+    cached = load_pool_cache(pool_info, cache_dir, token)
+
+    if cached and 'active_until' in pool_info:
+        if cached['fetched_at'] >= _date_to_timestamp(pool_info['active_until']):
+            print(f"\n✓ {pool_name} is inactive, using {len(cached['ohlcv_list'])} cached data points")
+            return {
+                'info': pool_info,
+                'data': {'data': {'attributes': {'ohlcv_list': cached['ohlcv_list']}}}
+            }
+
+    if not cached or cached['newest_timestamp'] is None:
+        result = _fetch_pool(pool_name, pool_info, rate_limiter, token=token)
+        if result['data'] is not None:
+            save_pool_cache(pool_info, result['data']['data']['attributes']['ohlcv_list'], cache_dir, token)
+        return result
+
+    # Request just enough candles to cover the gap, re-reading the newest
+    # cached candle in case it was still forming when it was stored
+    newest = cached['newest_timestamp']
+    period = TIMEFRAME_SECONDS[token.timeframe]
+    missing = math.ceil((time.time() - newest) / period) + 1
+    first_limit = min(max(missing, 1), config.BACKFILL_PAGE_LIMIT)
+
+    print(f"\nFetching {pool_info['name']}...")
+    try:
+        pages = list(_iter_pages(pool_info['address'], rate_limiter, until_ts=newest,
+                                 first_limit=first_limit, conditional=True, token=token))
+    except Exception as e:
+        print(f"✗ Error fetching {pool_name}: {e}")
+        # Serve stale history rather than nothing
+        return {
+            'info': pool_info,
+            'data': {'data': {'attributes': {'ohlcv_list': cached['ohlcv_list']}}},
+            'error': str(e)
+        }
+
+    fresh = [row for rows in pages for row in rows]
+    pages_note = f" in {len(pages)} pages" if len(pages) > 1 else ""
+    print(f"✓ Successfully fetched {len(fresh)} data points{pages_note} for {pool_name}")
+    merged = merge_ohlcv(cached['ohlcv_list'], fresh)
+    save_pool_cache(pool_info, merged, cache_dir, token)
+    return {'info': pool_info, 'data': {'data': {'attributes': {'ohlcv_list': merged}}}}
+
+
+def fetch_all_pools(use_cache: bool = False, cache_path: str = None,
+                    max_workers: int = None, rate_limiter: TokenBucket = None,
+                    incremental: bool = False, cache_dir: str = None,
+                    token: TokenConfig = None) -> Dict[str, Dict]:
+    """
+    Fetch data for all of a token's pools
+
+    Pools are fetched concurrently; a shared token bucket keeps the combined
+    request rate within the GeckoTerminal per-minute quota.
 
     Args:
         use_cache: If True, load from cache instead of API
-        cache_path: Path to cache file
+        cache_path: Cache directory (default: <OUTPUT_DIR>/api_cache)
+        max_workers: Number of concurrent requests (default: config.MAX_CONCURRENT_REQUESTS)
+        rate_limiter: Shared limiter (default: config.RATE_LIMIT_PER_MINUTE)
+        incremental: If True, only fetch candles newer than the per-pool cache
+        cache_dir: Directory for the per-pool cache (default: <OUTPUT_DIR>/pool_cache)
+        token: Token whose pools to fetch (default: config module)
 
     Returns:
         Dictionary mapping pool names to their data
     """
+    token = resolve_token(token)
     if cache_path is None:
-        cache_path = f"{config.OUTPUT_DIR}/api_cache.json"
+        cache_path = f"{token.output_dir}/api_cache"
 
     # Try to load from cache if requested
     if use_cache:
         cached_data = load_cache(cache_path)
+        if not cached_data and os.path.exists(f"{token.output_dir}/api_cache.json"):
+            cached_data = load_cache(f"{token.output_dir}/api_cache.json")
         if cached_data:
             return cached_data
         else:
             print("Cache not found, fetching from API...")
 
-    # Fetch from API
-    all_pool_data = {}
+    if max_workers is None:
+        max_workers = config.MAX_CONCURRENT_REQUESTS
+    if rate_limiter is None:
+        rate_limiter = TokenBucket(config.RATE_LIMIT_PER_MINUTE, capacity=config.RATE_LIMIT_BURST)
 
-    for pool_name, pool_info in config.POOLS.items():
-        print(f"\nFetching {pool_info['name']}...")
-        try:
-            data = fetch_pool_data(pool_info['address'])
-            all_pool_data[pool_name] = {
-                'info': pool_info,
-                'data': data
-            }
-            print(f"✓ Successfully fetched {len(data['data']['attributes']['ohlcv_list'])} data points")
-        except Exception as e:
-            print(f"✗ Error fetching {pool_name}: {e}")
-            all_pool_data[pool_name] = {
-                'info': pool_info,
-                'data': None,
-                'error': str(e)
-            }
+    if incremental:
+        if cache_dir is None:
+            cache_dir = f"{token.output_dir}/pool_cache"
+        fetch = partial(fetch_pool_incremental, cache_dir=cache_dir, token=token)
+    else:
+        fetch = partial(_fetch_pool, token=token)
 
-        # Be nice to the API
-        time.sleep(1)
+    # Fetch from API
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            pool_name: executor.submit(fetch, pool_name, pool_info, rate_limiter)
+            for pool_name, pool_info in token.pools.items()
+        }
+        # Preserve the chronological pool order from config
+        all_pool_data = {pool_name: future.result() for pool_name, future in futures.items()}
 
     # Save to cache
     save_cache(all_pool_data, cache_path)
@@ -136,6 +298,277 @@ def fetch_all_pools(use_cache: bool = False, cache_path: str = None) -> Dict[str
     return all_pool_data
 
 
+def fetch_all_tokens(tokens: List[TokenConfig], max_workers: int = None,
+                     rate_limiter: TokenBucket = None, incremental: bool = False,
+                     cache_dir: str = None) -> Dict[str, Dict[str, Dict]]:
+    """
+    Fetch the pools of several tokens, requesting each distinct pool once
+
+    Pools are de-duplicated on (network, address, timeframe), so a pool
+    listed by several tokens costs a single request; every token still gets
+    its own result dictionary (and api_cache) keyed by its own pool names.
+
+    Args:
+        tokens: Tokens to fetch
+        max_workers: Number of concurrent requests (default: config.MAX_CONCURRENT_REQUESTS)
+        rate_limiter: Shared limiter (default: config.RATE_LIMIT_PER_MINUTE)
+        incremental: If True, only fetch candles newer than the per-pool cache
+        cache_dir: Per-pool cache shared by all tokens (default: <OUTPUT_DIR>/pool_cache)
+
+    Returns:
+        Dictionary mapping token ids to fetch_all_pools-style results
+    """
+    if max_workers is None:
+        max_workers = config.MAX_CONCURRENT_REQUESTS
+    if rate_limiter is None:
+        rate_limiter = TokenBucket(config.RATE_LIMIT_PER_MINUTE, capacity=config.RATE_LIMIT_BURST)
+    if incremental and cache_dir is None:
+        cache_dir = f"{config.OUTPUT_DIR}/pool_cache"
+
+    # First token to list a pool does the fetch for everyone
+    unique = {}
+    for token in tokens:
+        for pool_name, pool_info in token.pools.items():
+            unique.setdefault(cache_key(pool_info, token), (pool_name, pool_info, token))
+    shared = sum(len(token.pools) for token in tokens) - len(unique)
+    if shared:
+        print(f"✓ {shared} pool fetches shared between tokens")
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {}
+        for key, (pool_name, pool_info, token) in unique.items():
+            if incremental:
+                futures[key] = executor.submit(fetch_pool_incremental, pool_name, pool_info,
+                                               rate_limiter, cache_dir, token)
+            else:
+                futures[key] = executor.submit(_fetch_pool, pool_name, pool_info, rate_limiter,
+                                               token=token)
+        fetched = {key: future.result() for key, future in futures.items()}
+
+    results = {}
+    for token in tokens:
+        all_pool_data = {}
+        for pool_name, pool_info in token.pools.items():
+            pool_data = dict(fetched[cache_key(pool_info, token)])
+            pool_data['info'] = pool_info
+            all_pool_data[pool_name] = pool_data
+        save_cache(all_pool_data, f"{token.output_dir}/api_cache")
+        results[token.name] = all_pool_data
+
+    return results
+
+
+def _backfill_path(pool_info: Dict, backfill_dir: str, token: TokenConfig = None) -> str:
+    return f"{backfill_dir}/{cache_key(pool_info, token)}.jsonl"
+
+
+def _backfilled_range(path: str):
+    """Scan a backfill file page by page and return its (oldest, newest) candle timestamps"""
+    oldest = newest = None
+    if not os.path.exists(path):
+        return oldest, newest
+
+    with open(path, 'r') as f:
+        for line in f:
+            rows = json.loads(line)
+            if rows:
+                timestamps = [row[0] for row in rows]
+                oldest = min(timestamps) if oldest is None else min(oldest, min(timestamps))
+                newest = max(timestamps) if newest is None else max(newest, max(timestamps))
+    return oldest, newest
+
+
+def _iter_pages(pool_address: str, rate_limiter: TokenBucket = None, page_limit: int = None,
+                before_ts: int = None, until_ts: int = None, first_limit: int = None,
+                conditional: bool = False, token: TokenConfig = None):
+    """
+    Page a pool's candles backwards with `before_timestamp`
+
+    Yields each page's rows (newest-first) as it arrives. Paging stops after
+    the first page holding a candle at or before `until_ts`, on a short or
+    empty page (the start of the pool's history), or when the API ignores
+    `before_timestamp`.
+
+    Args:
+        pool_address: Pool to page through
+        rate_limiter: Optional shared limiter
+        page_limit: Candles per request (default: config.BACKFILL_PAGE_LIMIT)
+        before_ts: Start below this timestamp (default: the newest candle)
+        until_ts: Stop once a page reaches this timestamp (default: history start)
+        first_limit: Candles in the first request (default: page_limit)
+        conditional: Revalidate the first request with ETag/Last-Modified;
+            older pages never change, so they are always fetched plainly
+        token: Token whose network/timeframe to query (default: config module)
+    """
+    if page_limit is None:
+        page_limit = config.BACKFILL_PAGE_LIMIT
+    limit = first_limit or page_limit
+
+    while True:
+        params = {'limit': limit}
+        if before_ts is not None:
+            params['before_timestamp'] = before_ts
+        page = fetch_pool_data(pool_address, rate_limiter=rate_limiter, params=params, token=token,
+                               conditional=conditional)
+        rows = page['data']['attributes']['ohlcv_list'] if page else []
+        if not rows:
+            return
+        yield rows
+
+        oldest = min(row[0] for row in rows)
+        if (until_ts is not None and oldest <= until_ts) or len(rows) < limit:
+            return
+        if before_ts is not None and oldest >= before_ts:
+            return  # API ignored before_timestamp; avoid looping forever
+        before_ts, limit, conditional = oldest, page_limit, False
+
+
+def backfill_pool(pool_name: str, pool_info: Dict, backfill_dir: str,
+                  rate_limiter: TokenBucket = None, page_limit: int = None,
+                  token: TokenConfig = None) -> int:
+    """
+    Walk a pool's OHLCV history backwards page by page until `active_from`
+
+    Each page is appended to a JSON-lines file as soon as it arrives, so
+    memory use stays at one page and an interrupted backfill resumes from
+    the oldest candle already on disk. A later run first pages from the
+    newest candle back to the newest one on disk, so candles that closed
+    since the last backfill are picked up too.
+
+    Args:
+        pool_name: Pool key in the token's pools
+        pool_info: Pool configuration dictionary
+        backfill_dir: Directory holding the per-pool backfill files
+        rate_limiter: Optional shared limiter
+        page_limit: Candles per request (default: config.BACKFILL_PAGE_LIMIT)
+        token: Token the pool belongs to (default: config module)
+
+    Returns:
+        Number of candles written during this call
+    """
+    token = resolve_token(token)
+
+    os.makedirs(backfill_dir, exist_ok=True)
+    path = _backfill_path(pool_info, backfill_dir, token)
+
+    # Stop once we reach the day the pool became active (or the API runs dry)
+    stop_ts = _date_to_timestamp(pool_info['active_from']) if 'active_from' in pool_info else None
+    end_ts = None
+    if 'active_until' in pool_info:
+        end_ts = _date_to_timestamp(pool_info['active_until']) + TIMEFRAME_SECONDS[token.timeframe]
+
+    oldest, newest = _backfilled_range(path)
+    # Catch up on candles newer than the file, unless the pool stopped trading
+    # before its newest stored candle. The newest stored candle is fetched
+    # again, as it may have been forming when it was written.
+    catch_up = newest is not None and (end_ts is None or newest < end_ts - TIMEFRAME_SECONDS[token.timeframe])
+    # Resume from the oldest stored candle, otherwise start at the end of the pool's life
+    before_ts = oldest if oldest is not None else end_ts
+    backwards = before_ts is None or stop_ts is None or before_ts > stop_ts
+
+    if not catch_up and not backwards:
+        print(f"✓ {pool_name} already backfilled to {pool_info['active_from']}")
+        return 0
+
+    written = 0
+    with open(path, 'a') as f:
+        walks = []
+        if catch_up:
+            walks.append({'before_ts': end_ts, 'until_ts': newest})
+        if backwards:
+            walks.append({'before_ts': before_ts, 'until_ts': stop_ts})
+        for walk in walks:
+            # Past pages never change and are already kept in the backfill file
+            for rows in _iter_pages(pool_info['address'], rate_limiter, page_limit, token=token, **walk):
+                f.write(json.dumps(rows) + "\n")
+                f.flush()
+                written += len(rows)
+
+    print(f"✓ Backfilled {written} candles for {pool_name}")
+    return written
+
+
+def load_backfill(pool_info: Dict, backfill_dir: str, token: TokenConfig = None) -> Dict:
+    """
+    Load a pool's backfill file into the API response shape
+
+    Pages are de-duplicated on timestamp and returned newest-first, the same
+    ordering GeckoTerminal uses, so the consolidator needs no special case.
+
+    Args:
+        pool_info: Pool configuration dictionary
+        backfill_dir: Directory holding the per-pool backfill files
+        token: Token the pool belongs to (default: config module)
+
+    Returns:
+        Dictionary in the GeckoTerminal OHLCV response shape, or None if empty
+    """
+    path = _backfill_path(pool_info, backfill_dir, token)
+    if not os.path.exists(path):
+        return None
+
+    candles = {}
+    with open(path, 'r') as f:
+        for line in f:
+            for row in json.loads(line):
+                candles[row[0]] = row
+
+    if not candles:
+        return None
+
+    ohlcv_list = [candles[ts] for ts in sorted(candles, reverse=True)]
+    return {'data': {'attributes': {'ohlcv_list': ohlcv_list}}}
+
+
+def backfill_all_pools(backfill_dir: str = None, max_workers: int = None,
+                       rate_limiter: TokenBucket = None, token: TokenConfig = None) -> Dict[str, Dict]:
+    """
+    Backfill full history for all of a token's pools
+
+    Args:
+        backfill_dir: Directory for backfill files (default: <OUTPUT_DIR>/backfill)
+        max_workers: Number of pools backfilled concurrently
+        rate_limiter: Shared limiter (default: config.RATE_LIMIT_PER_MINUTE)
+        token: Token whose pools to backfill (default: config module)
+
+    Returns:
+        Dictionary mapping pool names to their data, as fetch_all_pools does
+    """
+    token = resolve_token(token)
+    if backfill_dir is None:
+        backfill_dir = f"{token.output_dir}/backfill"
+    if max_workers is None:
+        max_workers = config.MAX_CONCURRENT_REQUESTS
+    if rate_limiter is None:
+        rate_limiter = TokenBucket(config.RATE_LIMIT_PER_MINUTE, capacity=config.RATE_LIMIT_BURST)
+
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+        futures = {
+            pool_name: executor.submit(backfill_pool, pool_name, pool_info, backfill_dir, rate_limiter,
+                                       token=token)
+            for pool_name, pool_info in token.pools.items()
+        }
+        for pool_name, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                print(f"✗ Error backfilling {pool_name}: {e}")
+                errors[pool_name] = str(e)
+
+    # Whatever made it to disk is still usable, even for pools that errored
+    all_pool_data = {}
+    for pool_name, pool_info in token.pools.items():
+        all_pool_data[pool_name] = {
+            'info': pool_info,
+            'data': load_backfill(pool_info, backfill_dir, token)
+        }
+        if pool_name in errors:
+            all_pool_data[pool_name]['error'] = errors[pool_name]
+
+    return all_pool_data
+
+
 def parse_ohlcv_data(pool_data: Dict) -> List[Dict]:
     """
     Parse raw OHLCV data into a list of dictionaries
@@ -155,7 +588,7 @@ def parse_ohlcv_data(pool_data: Dict) -> List[Dict]:
     for entry in ohlcv_list:
         timestamp, open_price, high, low, close, volume = entry
         parsed_data.append({
-            'timestamp': timestamp,
+            'timestamp': int(timestamp),
             'open': open_price,
             'high': high,
             'low': low,
@@ -166,6 +599,24 @@ def parse_ohlcv_data(pool_data: Dict) -> List[Dict]:
     return parsed_data
 
 
+def parse_ohlcv_array(pool_data: Dict):
+    """
+    Return raw OHLCV data as an (N, 6) float64 array
+
+    Memory-mapped cache arrays are returned as-is, without copying.
+
+    Args:
+        pool_data: Raw pool data from API or cache
+
+    Returns:
+        Array with columns timestamp, open, high, low, close, volume
+    """
+    if not pool_data or 'data' not in pool_data:
+        return ohlcv_array([])
+
+    return ohlcv_array(pool_data['data']['attributes']['ohlcv_list'])
+
+
 if __name__ == "__main__":
     # Test the fetcher
     print("Testing GeckoTerminal API fetcher...")
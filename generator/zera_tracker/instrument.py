@@ -0,0 +1,396 @@
+"""
+Run instrumentation: timed spans, counters and memory use
+
+    with instrument.span('consolidate', token='ZERA') as record:
+        ...
+        instrument.count('rows_unified', len(df))
+
+Each span records its wall time, the CPU time of the thread that ran it and
+the process RSS at entry, exit and at its peak. Peaks are found by a
+background thread that samples /proc/self/statm while any span is open;
+where that file doesn't exist, the process's lifetime high-water mark
+(getrusage) is used instead. Spans opened inside another span on the same
+thread are nested under it and inherit its labels.
+
+The recorder's report() is the machine-readable run report (written as
+JSON by main.py); write_prometheus() writes the same numbers in the
+Prometheus text format for node_exporter's textfile collector.
+
+Only the standard library is imported, so fetch-only runs stay light.
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, List
+import config
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPORT_VERSION = 1
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def _rss_bytes() -> int:
+    """Current resident set size, or None where /proc isn't available"""
+    try:
+        with open('/proc/self/statm', 'rb') as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def _max_rss_bytes(children: bool = False) -> int:
+    """Peak RSS of this process (or its largest finished child) so far"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    # ru_maxrss is in kilobytes, except on macOS
+    return usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+
+
+class Recorder:
+    """
+    Thread-safe collector of spans and counters for one run
+
+    Span records are plain dictionaries: id, name, parent (name),
+    parent_id, depth, labels, start (seconds after the recorder started),
+    seconds, cpu_seconds, rss_start, rss_end and peak_rss (bytes), plus
+    'error' when the span raised and any fields the code inside the span
+    added.
+    """
+
+    def __init__(self, sample_interval: float = None):
+        """
+        Args:
+            sample_interval: Seconds between RSS samples while a span is open
+                (default: config.METRICS_SAMPLE_INTERVAL; 0 disables sampling)
+        """
+        self.sample_interval = sample_interval if sample_interval is not None \
+            else config.METRICS_SAMPLE_INTERVAL
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._sampler = None
+        self.reset()
+
+    def reset(self):
+        """Drop every recorded span and counter and restart the run clock"""
+        with self._lock:
+            self.started = time.time()
+            self._t0 = time.perf_counter()
+            self.spans = []
+            self.counters = {}
+            self._open = []
+            self._next_id = 0
+
+    def _stack(self) -> List[Dict]:
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """
+        Time a block of code
+
+        Args:
+            name: Span name (e.g. a pipeline stage)
+            **labels: Extra dimensions such as token='ZERA'; nested spans
+                inherit their parent's labels
+
+        Yields:
+            The span record, which the block may annotate
+        """
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        if parent is not None:
+            labels = {**parent['labels'], **labels}
+        rss = _rss_bytes()
+        with self._lock:
+            span_id = self._next_id
+            self._next_id += 1
+        record = {
+            'id': span_id,
+            'name': name,
+            'parent': parent['name'] if parent else None,
+            'parent_id': parent['id'] if parent else None,
+            'depth': len(stack),
+            'labels': labels,
+            'start': round(time.perf_counter() - self._t0, 6),
+            'seconds': None,
+            'cpu_seconds': None,
+            'rss_start': rss,
+            'rss_end': None,
+            'peak_rss': rss
+        }
+        stack.append(record)
+        with self._lock:
+            self._open.append(record)
+            self._start_sampler()
+
+        started, cpu_started = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+        except BaseException as e:
+            record['error'] = type(e).__name__
+            raise
+        finally:
+            record['seconds'] = round(time.perf_counter() - started, 6)
+            record['cpu_seconds'] = round(time.thread_time() - cpu_started, 6)
+            rss = _rss_bytes()
+            record['rss_end'] = rss
+            stack.pop()
+            with self._lock:
+                self._open.remove(record)
+                if rss is None:
+                    record['peak_rss'] = _max_rss_bytes()
+                elif record['peak_rss'] is None or rss > record['peak_rss']:
+                    record['peak_rss'] = rss
+                self.spans.append(record)
+
+    def _start_sampler(self):
+        """Start the RSS sampling thread if it isn't running (lock held)"""
+        if self._sampler is None and self.sample_interval and _rss_bytes() is not None:
+            self._sampler = threading.Thread(target=self._sample, name='rss-sampler', daemon=True)
+            self._sampler.start()
+
+    def _sample(self):
+        # Runs until no span is open; the next span starts a new thread
+        while True:
+            rss = _rss_bytes()
+            with self._lock:
+                if not self._open:
+                    self._sampler = None
+                    return
+                for record in self._open:
+                    if rss > record['peak_rss']:
+                        record['peak_rss'] = rss
+            time.sleep(self.sample_interval)
+
+    def count(self, name: str, value: float = 1):
+        """Add `value` to a counter"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def collect(self) -> Dict:
+        """Spans and counters in a picklable form, for merge() in another process"""
+        with self._lock:
+            return {'started': self.started, 'spans': list(self.spans), 'counters': dict(self.counters)}
+
+    def merge(self, collected: Dict):
+        """
+        Add spans and counters recorded by another process (e.g. a chart worker)
+
+        The spans are nested under the span open on the calling thread.
+
+        Args:
+            collected: Result of the other recorder's collect()
+        """
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        offset = collected['started'] - self.started
+        with self._lock:
+            # Renumber the other process's spans after ours
+            ids = {}
+            for record in collected['spans']:
+                ids[record['id']] = self._next_id
+                self._next_id += 1
+            for record in collected['spans']:
+                record = dict(record)
+                record['id'] = ids[record['id']]
+                record['start'] = round(record['start'] + offset, 6)
+                if record['parent_id'] is not None:
+                    record['parent_id'] = ids[record['parent_id']]
+                elif parent is not None:
+                    record['parent'], record['parent_id'] = parent['name'], parent['id']
+                if parent is not None:
+                    record['labels'] = {**parent['labels'], **record['labels']}
+                    record['depth'] += parent['depth'] + 1
+                self.spans.append(record)
+            for name, value in collected['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+
+    def report(self, **extra) -> Dict:
+        """
+        The run report
+
+        Args:
+            **extra: Additional top-level fields (command, token, ...)
+
+        Returns:
+            Dictionary with the run's start time, duration, peak RSS of the
+            process and of its largest child (chart workers), every finished
+            span in start order and the counters
+        """
+        with self._lock:
+            spans = sorted(self.spans, key=lambda record: record['start'])
+            counters = dict(sorted(self.counters.items()))
+        return {
+            'version': REPORT_VERSION,
+            'started': datetime.fromtimestamp(self.started, timezone.utc).isoformat(),
+            'seconds': round(time.perf_counter() - self._t0, 6),
+            **extra,
+            'peak_rss': _max_rss_bytes(),
+            'children_peak_rss': _max_rss_bytes(children=True),
+            'spans': spans,
+            'counters': counters
+        }
+
+    def write_report(self, path: str, **extra) -> Dict:
+        """Write report() as JSON (atomically) and return it"""
+        report = self.report(**extra)
+        _write_atomic(path, json.dumps(report, indent=2) + "\n")
+        return report
+
+    def write_prometheus(self, path: str, **labels) -> str:
+        """
+        Write the run's metrics in the Prometheus text exposition format
+
+        Repeated spans with the same name and labels (e.g. watch refreshes)
+        are summed; their peak RSS is the largest seen.
+
+        Args:
+            path: Output file, typically in node_exporter's --collector.textfile.directory
+            **labels: Labels added to every sample (e.g. token='ZERA')
+
+        Returns:
+            The written text
+        """
+        report = self.report()
+        spans = {}
+        for record in report['spans']:
+            key = (record['name'], tuple(sorted({**labels, **record['labels']}.items())))
+            total = spans.setdefault(key, {'seconds': 0.0, 'cpu_seconds': 0.0, 'peak_rss': None, 'count': 0})
+            total['seconds'] += record['seconds']
+            total['cpu_seconds'] += record['cpu_seconds']
+            total['count'] += 1
+            if record['peak_rss'] is not None:
+                total['peak_rss'] = max(total['peak_rss'] or 0, record['peak_rss'])
+
+        lines = []
+
+        def metric(name, kind, help_text, samples):
+            lines.append(f"# HELP {config.METRICS_PREFIX}_{name} {help_text}")
+            lines.append(f"# TYPE {config.METRICS_PREFIX}_{name} {kind}")
+            for sample_labels, value in samples:
+                lines.append(f"{config.METRICS_PREFIX}_{name}{_format_labels(sample_labels)} {value}")
+
+        run_labels = tuple(sorted(labels.items()))
+        metric('run_start_time_seconds', 'gauge', 'Unix time the run started',
+               [(run_labels, round(self.started, 3))])
+        metric('run_duration_seconds', 'gauge', 'Wall-clock duration of the run',
+               [(run_labels, report['seconds'])])
+        if report['peak_rss'] is not None:
+            metric('run_peak_rss_bytes', 'gauge', 'Peak resident set size of the process',
+                   [(run_labels, report['peak_rss'])])
+
+        def span_samples(field):
+            return [((('span', name),) + key_labels, total[field])
+                    for (name, key_labels), total in spans.items() if total[field] is not None]
+
+        metric('span_duration_seconds', 'gauge', 'Wall-clock seconds spent in a span',
+               span_samples('seconds'))
+        metric('span_cpu_seconds', 'gauge', 'CPU seconds of the thread running a span',
+               span_samples('cpu_seconds'))
+        metric('span_peak_rss_bytes', 'gauge', 'Peak process resident set size while a span was open',
+               span_samples('peak_rss'))
+        metric('span_count', 'gauge', 'Times a span ran', span_samples('count'))
+        for name, value in report['counters'].items():
+            metric(f"{_metric_name(name)}_total", 'counter', f"Run counter {name}", [(run_labels, value)])
+
+        text = "\n".join(lines) + "\n"
+        _write_atomic(path, text)
+        return text
+
+    def print_summary(self):
+        """Print the finished spans as an indented timing table"""
+        report = self.report()
+        if not report['spans']:
+            return
+
+        # Depth-first, so each span's children follow it
+        children = {}
+        for record in report['spans']:
+            children.setdefault(record['parent_id'], []).append(record)
+        ordered = []
+
+        def visit(parent_id):
+            for record in children.get(parent_id, []):
+                ordered.append(record)
+                visit(record['id'])
+
+        visit(None)
+        # Spans whose parent is still open (e.g. a summary printed mid-run)
+        listed = {record['id'] for record in ordered}
+        ordered += [record for record in report['spans'] if record['id'] not in listed]
+
+        print(f"\nTimings ({report['seconds']:.2f} s total):")
+        for record in ordered:
+            name = "  " * record['depth'] + record['name']
+            peak = f"{record['peak_rss'] / 2**20:8.0f} MB" if record['peak_rss'] is not None else ""
+            note = " (memoized)" if record.get('memoized') else ""
+            note += f" ({record['error']})" if record.get('error') else ""
+            print(f"  {name:<36} {record['seconds']:8.2f} s  cpu {record['cpu_seconds']:7.2f} s  "
+                  f"peak {peak}{note}")
+        for name, value in report['counters'].items():
+            print(f"  {name:<36} {value}")
+
+
+def _metric_name(name: str) -> str:
+    return re.sub(r'[^a-zA-Z0-9_]', '_', name)
+
+
+def _format_labels(labels) -> str:
+    if not labels:
+        return ""
+    escaped = [(_metric_name(key), str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+               for key, value in labels]
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _write_atomic(path: str, text: str):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+_recorder = Recorder()
+
+
+def _reset_after_fork():
+    # A forked child must not share the parent's spans, or a lock another
+    # thread held at fork time
+    global _recorder
+    _recorder = Recorder(_recorder.sample_interval)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
+
+
+def recorder() -> Recorder:
+    """The process-wide recorder used by span() and count()"""
+    return _recorder
+
+
+def span(name: str, **labels):
+    """Time a block of code on the process-wide recorder (see Recorder.span)"""
+    return _recorder.span(name, **labels)
+
+
+def count(name: str, value: float = 1):
+    """Add to a counter on the process-wide recorder"""
+    _recorder.count(name, value)
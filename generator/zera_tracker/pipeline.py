@@ -0,0 +1,207 @@
+"""
+Pipeline runner
+
+Stages declare the named inputs they consume and the output they produce;
+the runner orders them as a DAG and runs every stage whose inputs are ready
+on a thread pool, so independent stages (e.g. CSV export and chart
+rendering) overlap.
+
+Memoized stages are keyed by a content hash of their inputs plus any extra
+key material (config settings, source fingerprints). A hit loads the pickled
+result from disk instead of running the stage, and downstream keys chain off
+that hash, so an unchanged upstream never forces downstream work.
+
+Every stage runs inside an instrumentation span named after it.
+"""
+
+import glob
+import hashlib
+import os
+import pickle
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Tuple
+import pandas as pd
+import config
+from . import instrument
+from .artifacts import frame_fingerprint
+
+
+class PipelineError(Exception):
+    """Raised when a fatal stage fails"""
+
+
+class Stage:
+    """
+    One step of the pipeline
+
+    The stage function is called with its inputs as positional arguments,
+    in the order they are declared, and its return value is published under
+    `output` for downstream stages.
+    """
+
+    def __init__(self, name: str, func: Callable, inputs: Tuple[str, ...] = (),
+                 output: str = None, description: str = None, memoize: bool = False,
+                 key: Callable = None, fatal: bool = True):
+        """
+        Args:
+            name: Unique stage name (also the memo file prefix)
+            func: Callable run with the declared inputs
+            inputs: Names of upstream outputs this stage consumes
+            output: Name the result is published under (default: the stage name)
+            description: Progress message printed when the stage starts
+            memoize: Cache the result on disk keyed by the inputs' content hash
+            key: Optional callable returning extra key material (e.g. config)
+            fatal: Abort the run if this stage fails; otherwise report the
+                   error and skip only the stages that depend on it
+        """
+        self.name = name
+        self.func = func
+        self.inputs = tuple(inputs)
+        self.output = output or name
+        self.description = description or name
+        self.memoize = memoize
+        self.key = key
+        self.fatal = fatal
+
+
+def content_hash(value) -> str:
+    """
+    Hash a stage result by content
+
+    DataFrames are hashed cell by cell; anything else via its pickle.
+    """
+    if isinstance(value, pd.DataFrame):
+        return frame_fingerprint(value)
+    return hashlib.blake2b(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL),
+                           digest_size=16).hexdigest()
+
+
+def _stage_key(stage: Stage, input_hashes: List[str]) -> str:
+    extra = stage.key() if stage.key else None
+    material = pickle.dumps((stage.name, input_hashes, extra), protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.blake2b(material, digest_size=16).hexdigest()
+
+
+def _load_memo(cache_dir: str, stage: Stage, key: str):
+    path = f"{cache_dir}/{stage.name}-{key}.pkl"
+    if not os.path.exists(path):
+        return False, None
+    try:
+        with open(path, 'rb') as f:
+            return True, pickle.load(f)
+    except Exception as e:
+        print(f"✗ Error loading memoized {stage.name}: {e}")
+        return False, None
+
+
+def _save_memo(cache_dir: str, stage: Stage, key: str, result):
+    os.makedirs(cache_dir, exist_ok=True)
+    path = f"{cache_dir}/{stage.name}-{key}.pkl"
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(result, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, path)
+
+    # Only the latest result per stage is kept
+    for old in glob.glob(f"{cache_dir}/{stage.name}-*.pkl"):
+        if old != path:
+            os.remove(old)
+
+
+def _check_graph(stages: List[Stage]):
+    """Validate names and reject missing inputs or cycles"""
+    producers = {}
+    for stage in stages:
+        if stage.output in producers:
+            raise ValueError(f"Output '{stage.output}' is produced by more than one stage")
+        producers[stage.output] = stage
+
+    for stage in stages:
+        for name in stage.inputs:
+            if name not in producers:
+                raise ValueError(f"Stage '{stage.name}' needs '{name}', which no stage produces")
+
+    # Kahn's algorithm: if some stage is never ready, there is a cycle
+    done, remaining = set(), list(stages)
+    while remaining:
+        ready = [s for s in remaining if all(n in done for n in s.inputs)]
+        if not ready:
+            raise ValueError(f"Cycle between stages: {[s.name for s in remaining]}")
+        done.update(s.output for s in ready)
+        remaining = [s for s in remaining if s not in ready]
+
+
+def run_pipeline(stages: List[Stage], cache_dir: str = None, max_workers: int = None,
+                 force: bool = False, labels: Dict = None) -> Dict:
+    """
+    Run stages in dependency order, concurrently where possible
+
+    Args:
+        stages: Stage definitions, in the order their progress should be numbered
+        cache_dir: Directory for memoized results (default: {OUTPUT_DIR}/stages)
+        max_workers: Maximum stages running at once (default: number of stages)
+        force: Ignore memoized results (they are still refreshed)
+        labels: Labels for the stages' instrumentation spans (e.g. {'token': 'ZERA'})
+
+    Returns:
+        Dictionary of every produced output by name (failed non-fatal
+        stages and their dependents are absent)
+    """
+    _check_graph(stages)
+    if cache_dir is None:
+        cache_dir = f"{config.OUTPUT_DIR}/stages"
+
+    total = len(stages)
+    number = {stage.name: i for i, stage in enumerate(stages, 1)}
+    results, hashes = {}, {}
+    pending = list(stages)
+    failed = set()
+    running = {}
+
+    def execute(stage: Stage, args: List, key: str):
+        # One print call so concurrent stages don't interleave their headers
+        print(f"\n[{number[stage.name]}/{total}] {stage.description}...\n" + "-" * 70)
+        with instrument.span(stage.name, **(labels or {})) as record:
+            if key is not None and not force:
+                hit, result = _load_memo(cache_dir, stage, key)
+                if hit:
+                    print(f"✓ {stage.name}: inputs unchanged, loaded memoized result")
+                    record['memoized'] = True
+                    return result, key
+            result = stage.func(*args)
+            if key is not None:
+                _save_memo(cache_dir, stage, key, result)
+                return result, key
+            return result, content_hash(result)
+
+    with ThreadPoolExecutor(max_workers=max_workers or total) as executor:
+        while pending or running:
+            # Skip stages whose inputs can never arrive
+            for stage in [s for s in pending if any(n in failed for n in s.inputs)]:
+                print(f"\n✗ Skipping {stage.name}: an input stage failed")
+                failed.add(stage.output)
+                pending.remove(stage)
+
+            for stage in [s for s in pending if all(n in results for n in s.inputs)]:
+                args = [results[n] for n in stage.inputs]
+                key = _stage_key(stage, [hashes[n] for n in stage.inputs]) if stage.memoize else None
+                running[executor.submit(execute, stage, args, key)] = stage
+                pending.remove(stage)
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                stage = running.pop(future)
+                try:
+                    results[stage.output], hashes[stage.output] = future.result()
+                except Exception as e:
+                    print(f"\n✗ Error in {stage.name}: {e}")
+                    if stage.fatal:
+                        for other in running:
+                            other.cancel()
+                        raise PipelineError(f"{stage.name} failed: {e}") from e
+                    failed.add(stage.output)
+
+    return results
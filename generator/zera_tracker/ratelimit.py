@@ -0,0 +1,52 @@
+"""
+Rate limiting for GeckoTerminal API requests
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket shared by all concurrent API requests
+
+    Tokens refill continuously at `rate_per_minute`; a burst of up to
+    `capacity` requests may go out at once before callers start blocking.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: int = None):
+        """
+        Args:
+            rate_per_minute: Sustained number of requests allowed per minute
+            capacity: Maximum burst size (default: one request)
+        """
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be positive")
+
+        self.rate = rate_per_minute / 60.0  # tokens per second
+        self.capacity = capacity if capacity is not None else 1
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: int = 1):
+        """
+        Block until `tokens` tokens are available, then consume them
+
+        Args:
+            tokens: Number of tokens to consume
+        """
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+
+            time.sleep(wait)
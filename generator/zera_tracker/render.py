@@ -0,0 +1,164 @@
+"""
+Parallel chart rendering
+
+The shared chart model is computed once per unified frame in the parent
+process; the independent figures are then rendered in a process pool on the
+non-interactive Agg backend, so many charts (or many tokens) use every core.
+Workers are started with forkserver (spawn where unavailable) rather than
+fork, as the pipeline renders from a thread while other stages run, and
+receive each job without its frame: the chart model carries what they draw.
+
+Charts whose inputs (frame fingerprint, chart config, visualizer source and
+job options) match the artifact manifest are not re-rendered.
+
+Each chart renders inside a "chart:<file name>" instrumentation span; spans
+and counters recorded in a worker are sent back and merged into the
+parent's recorder.
+"""
+
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+import config
+from . import artifacts, instrument
+
+VISUALIZER_SOURCE = os.path.join(os.path.dirname(__file__), 'visualizer.py')
+
+# Config the workers read while drawing; a fresh worker process imports the
+# config module anew, so values changed at run time are passed along
+WORKER_SETTINGS = ('CHART_DPI', 'CHART_PIXELS_PER_CANDLE')
+
+# pyplot keeps global state, so in-process renders from several threads
+# (e.g. tokens in batch mode) must take turns
+_pyplot_lock = threading.Lock()
+
+
+def _init_worker(settings: Dict = None):
+    """Force the Agg backend before pyplot is imported in the worker"""
+    import matplotlib
+    matplotlib.use('Agg')
+    for name, value in (settings or {}).items():
+        setattr(config, name, value)
+
+
+def _worker_context():
+    """Start method for render workers: never fork a multi-threaded parent"""
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context('forkserver' if 'forkserver' in methods else 'spawn')
+
+
+def _render_job(job: Dict, model) -> str:
+    """Render one chart in a worker process and return its output path"""
+    from . import visualizer
+
+    with instrument.span(f"chart:{os.path.basename(job['output_path'])}"):
+        if job['kind'] == 'price':
+            visualizer.create_price_chart(job['df'], job['output_path'],
+                                          include_volume=job.get('include_volume', True),
+                                          model=model)
+        elif job['kind'] == 'comparison':
+            visualizer.create_comparison_chart(job['df'], job['output_path'], model=model)
+        else:
+            raise ValueError(f"Unknown chart kind: {job['kind']}")
+
+    return job['output_path']
+
+
+def _render_job_in_worker(job: Dict, model):
+    """Run _render_job in a pool process and return its path and instrumentation"""
+    # Pool processes are reused across jobs; start each job's record afresh
+    instrument.recorder().reset()
+    path = _render_job(job, model)
+    return path, instrument.recorder().collect()
+
+
+def _job_inputs(job: Dict, frame_hash: str, source_hash: str) -> str:
+    """Inputs hash for one chart job"""
+    return artifacts.inputs_hash(frame_hash, source_hash,
+                                 artifacts.config_fingerprint(job.get('token')),
+                                 job['kind'], job.get('include_volume', True),
+                                 config.CHART_DPI, config.CHART_PIXELS_PER_CANDLE)
+
+
+def render_charts(jobs: List[Dict], max_workers: int = None, force: bool = False) -> List[str]:
+    """
+    Render chart jobs concurrently across processes
+
+    Args:
+        jobs: List of {'kind': 'price' | 'comparison', 'df': DataFrame,
+              'output_path': str, ['include_volume': bool], ['token': TokenConfig]}
+              dictionaries. Jobs may reference different frames (e.g. several
+              tokens); jobs without a token use the config module.
+        max_workers: Worker process count (default: one per CPU, capped at
+              the number of stale jobs)
+        force: Re-render even if the manifest says a chart is up to date
+
+    Returns:
+        Output paths in job order (including skipped, up-to-date charts)
+    """
+    if not jobs:
+        return []
+
+    # Fingerprint each distinct frame once, then drop charts already rendered
+    # from the same inputs
+    source_hash = artifacts.source_fingerprint(VISUALIZER_SOURCE)
+    frame_hashes = {}
+    for job in jobs:
+        if id(job['df']) not in frame_hashes:
+            frame_hashes[id(job['df'])] = artifacts.frame_fingerprint(job['df'])
+
+    manifest = artifacts.load_manifest()
+    stale = []
+    for job in jobs:
+        inputs = _job_inputs(job, frame_hashes[id(job['df'])], source_hash)
+        if not force and artifacts.is_current(manifest, job['output_path'], inputs):
+            print(f"✓ Chart unchanged, skipped: {job['output_path']}")
+            instrument.count('charts_skipped')
+        else:
+            stale.append((job, inputs))
+
+    if stale:
+        rendered = _render_stale([job for job, _ in stale], max_workers)
+        instrument.count('charts_rendered', len(rendered))
+        entries = {}
+        for path, (_, inputs) in zip(rendered, stale):
+            artifacts.record_artifact(entries, path, inputs)
+        artifacts.update_manifest(entries)
+
+    return [job['output_path'] for job in jobs]
+
+
+def _render_stale(jobs: List[Dict], max_workers: int = None) -> List[str]:
+    """Render jobs in a process pool, sharing one chart model per frame"""
+    from .visualizer import prepare_chart_model
+
+    # One chart model per distinct frame, shared by every job that renders it
+    models = {}
+    with instrument.span('chart_model'):
+        for job in jobs:
+            if id(job['df']) not in models:
+                models[id(job['df'])] = prepare_chart_model(job['df'], job.get('token'))
+
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = max(1, min(max_workers, len(jobs)))
+
+    if max_workers == 1:
+        with _pyplot_lock:
+            _init_worker()
+            return [_render_job(job, models[id(job['df'])]) for job in jobs]
+
+    settings = {name: getattr(config, name) for name in WORKER_SETTINGS}
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=_worker_context(),
+                             initializer=_init_worker, initargs=(settings,)) as executor:
+        # The model holds the frames the renderers draw; don't pickle df as well
+        futures = [executor.submit(_render_job_in_worker, {**job, 'df': None}, models[id(job['df'])])
+                   for job in jobs]
+        paths = []
+        for future in futures:
+            path, collected = future.result()
+            instrument.recorder().merge(collected)
+            paths.append(path)
+        return paths
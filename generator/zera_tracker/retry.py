@@ -0,0 +1,240 @@
+"""
+Retry, circuit breaking and latency tracking for API requests
+
+- RetryPolicy: exponential backoff with full jitter, honouring a server's
+  Retry-After header on 429/503 answers.
+- CircuitBreaker: after repeated failures against a host, stops sending it
+  requests for a cool-down period instead of queueing more doomed retries.
+- LatencyHistogram: fixed-bucket request latency histogram with percentiles.
+"""
+
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict
+import requests
+import config
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Latency histogram bucket upper bounds in seconds (last bucket is open-ended)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, float('inf'))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request to a host whose circuit is open"""
+
+
+def parse_retry_after(value: str, now: float = None) -> float:
+    """
+    Seconds to wait according to a Retry-After header
+
+    Args:
+        value: Header value, either delta-seconds or an HTTP date
+        now: Current Unix time (default: time.time())
+
+    Returns:
+        Non-negative delay in seconds, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        return None
+    return max(0.0, retry_at - (time.time() if now is None else now))
+
+
+class RetryPolicy:
+    """
+    Decides whether a failed request is retried and how long to wait first
+
+    Backoff uses "full jitter": attempt n sleeps a uniform random time in
+    [0, min(max_delay, base_delay * 2**n)], which spreads out concurrent
+    workers that failed together. A Retry-After header sets a floor on the
+    delay (capped at max_retry_after).
+    """
+
+    def __init__(self, max_attempts: int = None, base_delay: float = None, max_delay: float = None,
+                 max_retry_after: float = None, timeout=None, retry_statuses=RETRY_STATUSES,
+                 rng: random.Random = None):
+        """
+        Args:
+            max_attempts: Total attempts per request (default: config.RETRY_MAX_ATTEMPTS)
+            base_delay: Backoff for the first retry in seconds (default: config.RETRY_BASE_DELAY)
+            max_delay: Backoff ceiling in seconds (default: config.RETRY_MAX_DELAY)
+            max_retry_after: Longest Retry-After honoured (default: config.RETRY_AFTER_MAX)
+            timeout: (connect, read) timeout in seconds (default: config.REQUEST_TIMEOUT)
+            retry_statuses: HTTP status codes that are retried
+            rng: Random source for jitter (seedable for benchmarks)
+        """
+        self.max_attempts = max(1, max_attempts if max_attempts is not None else config.RETRY_MAX_ATTEMPTS)
+        self.base_delay = base_delay if base_delay is not None else config.RETRY_BASE_DELAY
+        self.max_delay = max_delay if max_delay is not None else config.RETRY_MAX_DELAY
+        self.max_retry_after = max_retry_after if max_retry_after is not None else config.RETRY_AFTER_MAX
+        self.timeout = tuple(timeout if timeout is not None else config.REQUEST_TIMEOUT)
+        self.retry_statuses = tuple(retry_statuses)
+        self._rng = rng or random.Random()
+
+    def is_retryable(self, error: Exception) -> bool:
+        """Whether a request exception is worth another attempt"""
+        if isinstance(error, CircuitOpenError):
+            return False
+        if isinstance(error, requests.exceptions.HTTPError):
+            response = error.response
+            return response is not None and response.status_code in self.retry_statuses
+        return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                                  requests.exceptions.ChunkedEncodingError))
+
+    def retry_after(self, error: Exception) -> float:
+        """Delay requested by the server through Retry-After, if any"""
+        response = getattr(error, 'response', None)
+        if response is None:
+            return None
+        return parse_retry_after(response.headers.get('Retry-After'))
+
+    def delay(self, attempt: int, retry_after: float = None) -> float:
+        """
+        Seconds to wait before retry number `attempt` (0 for the first retry)
+
+        Args:
+            attempt: Zero-based retry index
+            retry_after: Server-requested delay, if any
+        """
+        backoff = self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        if retry_after is not None:
+            return max(backoff, min(retry_after, self.max_retry_after))
+        return backoff
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker
+
+    Closed: requests flow; consecutive failures are counted. After
+    `failure_threshold` of them the circuit opens and requests fail fast
+    with CircuitOpenError for `reset_timeout` seconds. Then one trial
+    request is let through (half-open): success closes the circuit, failure
+    opens it again.
+    """
+
+    def __init__(self, failure_threshold: int = None, reset_timeout: float = None,
+                 clock=time.monotonic):
+        """
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+                (default: config.CIRCUIT_FAILURE_THRESHOLD)
+            reset_timeout: Seconds the circuit stays open (default: config.CIRCUIT_RESET_SECONDS)
+            clock: Monotonic time source
+        """
+        self.failure_threshold = failure_threshold if failure_threshold is not None \
+            else config.CIRCUIT_FAILURE_THRESHOLD
+        self.reset_timeout = reset_timeout if reset_timeout is not None else config.CIRCUIT_RESET_SECONDS
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return 'closed'
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return 'half-open'
+        return 'open'
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now (claims the trial slot when half-open)"""
+        with self._lock:
+            state = self._state()
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def retry_in(self) -> float:
+        """Seconds until the open circuit lets a trial request through"""
+        with self._lock:
+            if self._opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (self._clock() - self._opened_at))
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_in_flight:
+                    self.trips += 1
+                self._opened_at = self._clock()
+                self._trial_in_flight = False
+
+
+class LatencyHistogram:
+    """Thread-safe request latency histogram over LATENCY_BUCKETS"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, seconds: float):
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    self.counts[i] += 1
+                    break
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bucket bound containing the q-th percentile (the maximum for the open bucket)
+
+        Args:
+            q: Percentile in [0, 100]
+        """
+        with self._lock:
+            if not self.count:
+                return 0.0
+            rank = q / 100 * self.count
+            seen = 0
+            for bound, count in zip(self.buckets, self.counts):
+                seen += count
+                if seen >= rank and count:
+                    return min(bound, self.max)
+            return self.max
+
+    def summary(self) -> Dict:
+        """Count, mean, p50/p95/p99 and max in seconds, plus the raw bucket counts"""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'max': self.max,
+            'buckets': dict(zip([str(bound) for bound in self.buckets], self.counts))
+        }
@@ -0,0 +1,188 @@
+"""
+Per-token configuration
+
+A TokenConfig carries everything that used to be read from the `config`
+module for a single token: its pools, migration dates, network/timeframe,
+output locations and display names. `TokenConfig.from_config()` builds one
+from config.py, so single-token runs behave exactly as before; batch runs
+load one TokenConfig per file from a registry directory.
+
+Registry files are JSON (or YAML, if PyYAML is installed) named after the
+token id, e.g. `tokens/zera.json`:
+
+    {
+        "symbol": "ZERA",
+        "pools": {"zera_Raydium": {"address": "...", "name": "ZERA Raydium",
+                                   "token_symbol": "ZERA", "active_from": "2025-10-02"}},
+        "migration_dates": {"mon3y_to_zera": 1759363200},
+        "migration_labels": {"mon3y_to_zera": "MON3Y → Raydium"}
+    }
+
+Optional keys: network, timeframe, base_url, output_dir, csv_filename,
+chart_filename. Pools may carry a display `label` and a chart `color`.
+"""
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List
+import config
+
+# Chart colors for pools that don't set one, assigned in pool order
+DEFAULT_POOL_COLORS = ['#FF6B6B', '#4ECDC4', '#45B7D1', '#FFA94D', '#9775FA', '#69DB7C']
+
+TOKEN_FILE_EXTENSIONS = ('.json', '.yaml', '.yml')
+
+
+@dataclass
+class TokenConfig:
+    """Pools, migrations and output settings for one tracked token"""
+    name: str
+    symbol: str
+    pools: Dict
+    migration_dates: Dict
+    migration_labels: Dict = field(default_factory=dict)
+    network: str = None
+    timeframe: str = None
+    base_url: str = None
+    output_dir: str = None
+    csv_filename: str = None
+    chart_filename: str = None
+
+    def __post_init__(self):
+        if self.network is None:
+            self.network = config.NETWORK
+        if self.timeframe is None:
+            self.timeframe = config.TIMEFRAME
+        if self.base_url is None:
+            self.base_url = config.BASE_URL
+        if self.output_dir is None:
+            self.output_dir = f"{config.OUTPUT_DIR}/{self.name}"
+        if self.csv_filename is None:
+            self.csv_filename = f"{self.name}_unified_price_history.csv"
+        if self.chart_filename is None:
+            self.chart_filename = f"{self.name}_price_chart.png"
+
+    @classmethod
+    def from_config(cls) -> 'TokenConfig':
+        """Build the token described by the config module (read at call time)"""
+        name = config.CSV_FILENAME.replace('_unified_price_history.csv', '')
+        return cls(
+            name=name,
+            symbol=getattr(config, 'TOKEN_SYMBOL', name.upper()),
+            pools=config.POOLS,
+            migration_dates=config.MIGRATION_DATES,
+            migration_labels=getattr(config, 'MIGRATION_LABELS', {}),
+            output_dir=config.OUTPUT_DIR,
+            csv_filename=config.CSV_FILENAME,
+            chart_filename=config.CHART_FILENAME
+        )
+
+    @classmethod
+    def from_dict(cls, name: str, data: Dict) -> 'TokenConfig':
+        """
+        Build a token from a registry entry
+
+        Args:
+            name: Token id (the registry file's base name)
+            data: Parsed registry file contents
+        """
+        for key in ('pools', 'migration_dates'):
+            if key not in data:
+                raise ValueError(f"Token '{name}' is missing '{key}'")
+        known = set(cls.__dataclass_fields__) - {'name'}
+        unknown = set(data) - known
+        if unknown:
+            raise ValueError(f"Token '{name}' has unknown keys: {', '.join(sorted(unknown))}")
+        return cls(name=name, **{'symbol': name.upper(), **data})
+
+    @property
+    def comparison_chart_filename(self) -> str:
+        return f"{self.name}_comparison_chart.png"
+
+    @property
+    def parquet_dirname(self) -> str:
+        return f"{self.name}_parquet"
+
+    @property
+    def chart_payload_dirname(self) -> str:
+        return f"{self.name}_chart_data"
+
+    @property
+    def large_chart_filename(self) -> str:
+        root, ext = os.path.splitext(self.chart_filename)
+        return f"{root}_large{ext}"
+
+    def output_path(self, filename: str) -> str:
+        """Path of an output file in this token's output directory"""
+        return f"{self.output_dir}/{filename}"
+
+    def pool_color(self, pool_name: str) -> str:
+        """Chart color for a pool: its configured color or one from the default palette"""
+        pool_info = self.pools.get(pool_name)
+        if pool_info is None:
+            return '#333333'
+        if 'color' in pool_info:
+            return pool_info['color']
+        index = list(self.pools).index(pool_name)
+        return DEFAULT_POOL_COLORS[index % len(DEFAULT_POOL_COLORS)]
+
+    def pool_label(self, pool_name: str) -> str:
+        """Short legend label for a pool"""
+        pool_info = self.pools.get(pool_name, {})
+        return pool_info.get('label', pool_name)
+
+    def migration_label(self, event_name: str) -> str:
+        """Transition label for a migration event"""
+        return self.migration_labels.get(event_name, event_name.replace('_to_', ' → '))
+
+
+def resolve_token(token: TokenConfig = None) -> TokenConfig:
+    """Return the given token, or the one described by the config module"""
+    return token if token is not None else TokenConfig.from_config()
+
+
+def load_token_file(path: str) -> TokenConfig:
+    """
+    Load one token definition from a JSON or YAML file
+
+    Args:
+        path: Registry file; its base name becomes the token id
+
+    Returns:
+        TokenConfig for the file
+    """
+    name, ext = os.path.splitext(os.path.basename(path))
+    with open(path, 'r') as f:
+        if ext in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError(f"PyYAML is required to load {path} (pip install pyyaml)")
+            data = yaml.safe_load(f)
+        else:
+            data = json.load(f)
+    return TokenConfig.from_dict(name, data or {})
+
+
+def load_token_registry(directory: str) -> List[TokenConfig]:
+    """
+    Load every token definition in a directory
+
+    Args:
+        directory: Directory of <token id>.json / .yaml files
+
+    Returns:
+        TokenConfigs sorted by token id
+    """
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Token registry not found: {directory}")
+
+    tokens = [
+        load_token_file(os.path.join(directory, filename))
+        for filename in sorted(os.listdir(directory))
+        if os.path.splitext(filename)[1] in TOKEN_FILE_EXTENSIONS
+    ]
+    if not tokens:
+        raise ValueError(f"No token definitions (*.json, *.yaml) in {directory}")
+    return tokens
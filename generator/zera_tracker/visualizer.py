@@ -1,71 +1,158 @@
 """
-Visualizer - creates charts for unified ZERA price history
+Visualizer - creates charts for a token's unified price history
 """
 
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
-from matplotlib.patches import Rectangle
+from matplotlib.collections import LineCollection, PolyCollection
 from matplotlib.lines import Line2D
-from datetime import datetime, timedelta
+from dataclasses import dataclass
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 import pandas as pd
-from typing import Dict
+from typing import Dict, List, NamedTuple, Tuple
 import config
 import os
+from . import instrument
+from .tokens import TokenConfig, resolve_token
+from .downsample import bucket_factor, bucket_ohlcv, drawable_candles, pool_runs
+
+# Width of the narrowest price chart variant, which sets the drawable candle count
+PRICE_CHART_WIDTH = 16
+
+
+def _date_nums(dates) -> np.ndarray:
+    """Convert a date column (naive or tz-aware) to Matplotlib date numbers in one call"""
+    index = pd.DatetimeIndex(dates)
+    if index.tz is not None:
+        index = index.tz_convert('UTC').tz_localize(None)
+    return mdates.date2num(index.to_numpy())
 
 
 def plot_candlesticks(ax, df, color='#4ECDC4', alpha=0.8):
     """
     Plot candlestick chart on given axes
 
+    All wicks are drawn as one LineCollection and all bodies as one
+    PolyCollection per direction, so the artist count stays constant no
+    matter how many candles are plotted.
+
     Args:
         ax: Matplotlib axes object
         df: DataFrame with columns: date, open, high, low, close
         color: Base color for candlesticks
         alpha: Transparency
     """
-    # Calculate candlestick width based on data density
+    if len(df) == 0:
+        return
+
+    x = _date_nums(df['date'])
+    open_price = df['open'].to_numpy()
+    high = df['high'].to_numpy()
+    low = df['low'].to_numpy()
+    close = df['close'].to_numpy()
+
+    # Calculate candlestick width based on data density (in days)
     if len(df) > 1:
-        avg_timedelta = (df['date'].iloc[-1] - df['date'].iloc[0]) / len(df)
-        candle_width = avg_timedelta * 0.6  # 60% of period for candle body
+        candle_width = (x[-1] - x[0]) / len(df) * 0.6  # 60% of period for candle body
     else:
-        candle_width = timedelta(days=0.6)
-
-    for _, row in df.iterrows():
-        date = row['date']
-        open_price = row['open']
-        high = row['high']
-        low = row['low']
-        close = row['close']
-
-        # Determine if bullish (green) or bearish (red)
-        is_bullish = close >= open_price
-        body_color = '#26a69a' if is_bullish else '#ef5350'  # Green/Red
-
-        # Draw high-low wick (thin line)
-        ax.plot([date, date], [low, high],
-                color=body_color, linewidth=1, alpha=alpha, zorder=1)
-
-        # Draw body (rectangle from open to close)
-        body_height = abs(close - open_price)
-        body_bottom = min(open_price, close)
-
-        if body_height > 0:
-            rect = Rectangle((mdates.date2num(date) - candle_width.total_seconds()/(2*86400), body_bottom),
-                           candle_width.total_seconds()/86400, body_height,
-                           facecolor=body_color, edgecolor=body_color,
-                           alpha=alpha, linewidth=0.5, zorder=2)
-            ax.add_patch(rect)
-        else:
-            # Doji (open == close) - draw thin horizontal line
-            ax.plot([mdates.date2num(date) - candle_width.total_seconds()/(2*86400),
-                    mdates.date2num(date) + candle_width.total_seconds()/(2*86400)],
-                   [close, close], color=body_color, linewidth=1.5, alpha=alpha, zorder=2)
+        candle_width = 0.6
+    half_width = candle_width / 2
+
+    # Determine if bullish (green) or bearish (red)
+    is_bullish = close >= open_price
+    body_colors = np.where(is_bullish, '#26a69a', '#ef5350')  # Green/Red
+
+    # Draw high-low wicks (thin lines)
+    wicks = np.stack([np.column_stack([x, low]), np.column_stack([x, high])], axis=1)
+    ax.add_collection(LineCollection(wicks, colors=body_colors, linewidths=1,
+                                     alpha=alpha, zorder=1))
+
+    # Draw bodies (rectangles from open to close)
+    body_bottom = np.minimum(open_price, close)
+    body_top = np.maximum(open_price, close)
+    has_body = body_top > body_bottom
+
+    for mask, body_color in ((has_body & is_bullish, '#26a69a'), (has_body & ~is_bullish, '#ef5350')):
+        if not mask.any():
+            continue
+        left, right = x[mask] - half_width, x[mask] + half_width
+        bottom, top = body_bottom[mask], body_top[mask]
+        bodies = np.stack([
+            np.column_stack([left, bottom]),
+            np.column_stack([left, top]),
+            np.column_stack([right, top]),
+            np.column_stack([right, bottom])
+        ], axis=1)
+        ax.add_collection(PolyCollection(bodies, facecolors=body_color, edgecolors=body_color,
+                                         alpha=alpha, linewidths=0.5, zorder=2))
+
+    # Doji (open == close) - draw thin horizontal lines
+    doji = ~has_body
+    if doji.any():
+        ticks = np.stack([np.column_stack([x[doji] - half_width, close[doji]]),
+                          np.column_stack([x[doji] + half_width, close[doji]])], axis=1)
+        ax.add_collection(LineCollection(ticks, colors=body_colors[doji], linewidths=1.5,
+                                         alpha=alpha, zorder=2))
+
+    ax.xaxis_date()
+    ax.autoscale_view()
+
+
+def plot_volume_bars(ax, df, color='#4ECDC4', alpha=0.6, width=0.8):
+    """
+    Plot volume bars (in millions) as a single PolyCollection
+
+    Args:
+        ax: Matplotlib axes object
+        df: DataFrame with columns: date, volume
+        color: Bar color
+        alpha: Transparency
+        width: Bar width in days
+    """
+    if len(df) == 0:
+        return
+
+    x = _date_nums(df['date'])
+    height = df['volume'].to_numpy() / 1_000_000
+    left, right = x - width / 2, x + width / 2
+    zeros = np.zeros_like(height)
+    bars = np.stack([
+        np.column_stack([left, zeros]),
+        np.column_stack([left, height]),
+        np.column_stack([right, height]),
+        np.column_stack([right, zeros])
+    ], axis=1)
+    ax.add_collection(PolyCollection(bars, facecolors=color, edgecolors='none', alpha=alpha))
+    ax.xaxis_date()
+    ax.autoscale_view()
+
+
+def _window_extremes(values: np.ndarray, window: int):
+    """
+    Rolling max/min over the `window` points on each side of every candidate
+
+    Returns (left_max, left_min, right_max, right_min) for candidate indices
+    window .. len(values) - window - 1, computed from one sliding_window_view.
+    """
+    windows = sliding_window_view(values, window)
+    win_max = windows.max(axis=1)
+    win_min = windows.min(axis=1)
+    n = len(values)
+    # Window starting at i - window covers the left side; at i + 1 the right side
+    left = slice(0, n - 2 * window)
+    right = slice(window + 1, n - window + 1)
+    return win_max[left], win_min[left], win_max[right], win_min[right]
 
 
 def find_local_peaks(df: pd.DataFrame, window=5, prominence_threshold=0.1):
     """
     Find significant local peaks in the price data
 
+    A point is a peak when it is >= every high within `window` points on
+    either side; its prominence is its height above the higher of the two
+    side minima. Evaluated for the whole series at once with sliding windows.
+
     Args:
         df: DataFrame with 'high' and 'date' columns
         window: Window size for peak detection
@@ -77,7 +164,6 @@ def find_local_peaks(df: pd.DataFrame, window=5, prominence_threshold=0.1):
     if len(df) < window * 2:
         return []
 
-    peaks = []
     highs = df['high'].values
     dates = df['date'].values
 
@@ -85,26 +171,23 @@ def find_local_peaks(df: pd.DataFrame, window=5, prominence_threshold=0.1):
     price_range = highs.max() - highs.min()
     min_prominence = price_range * prominence_threshold
 
-    for i in range(window, len(highs) - window):
-        # Check if current point is higher than neighbors
-        is_peak = all(highs[i] >= highs[i-window:i]) and all(highs[i] >= highs[i+1:i+window+1])
-
-        if is_peak:
-            # Check prominence (how much higher than surrounding area)
-            left_min = min(highs[max(0, i-window):i])
-            right_min = min(highs[i+1:min(len(highs), i+window+1)])
-            prominence = highs[i] - max(left_min, right_min)
+    candidates = highs[window:len(highs) - window]
+    left_max, left_min, right_max, right_min = _window_extremes(highs, window)
 
-            if prominence >= min_prominence:
-                peaks.append((dates[i], highs[i]))
+    # Check if current point is higher than neighbors, then its prominence
+    is_peak = (candidates >= left_max) & (candidates >= right_max)
+    prominence = candidates - np.maximum(left_min, right_min)
+    indices = np.flatnonzero(is_peak & (prominence >= min_prominence)) + window
 
-    return peaks
+    return [(dates[i], highs[i]) for i in indices]
 
 
 def find_local_troughs(df: pd.DataFrame, window=5, prominence_threshold=0.1):
     """
     Find significant local troughs (lows) in the price data
 
+    Mirror image of find_local_peaks on the 'low' column.
+
     Args:
         df: DataFrame with 'low' and 'date' columns
         window: Window size for trough detection
@@ -116,7 +199,6 @@ def find_local_troughs(df: pd.DataFrame, window=5, prominence_threshold=0.1):
     if len(df) < window * 2:
         return []
 
-    troughs = []
     lows = df['low'].values
     dates = df['date'].values
 
@@ -124,20 +206,15 @@ def find_local_troughs(df: pd.DataFrame, window=5, prominence_threshold=0.1):
     price_range = lows.max() - lows.min()
     min_prominence = price_range * prominence_threshold
 
-    for i in range(window, len(lows) - window):
-        # Check if current point is lower than neighbors
-        is_trough = all(lows[i] <= lows[i-window:i]) and all(lows[i] <= lows[i+1:i+window+1])
+    candidates = lows[window:len(lows) - window]
+    left_max, left_min, right_max, right_min = _window_extremes(lows, window)
 
-        if is_trough:
-            # Check prominence (how much lower than surrounding area)
-            left_max = max(lows[max(0, i-window):i])
-            right_max = max(lows[i+1:min(len(lows), i+window+1)])
-            prominence = min(left_max, right_max) - lows[i]
+    # Check if current point is lower than neighbors, then its prominence
+    is_trough = (candidates <= left_min) & (candidates <= right_min)
+    prominence = np.minimum(left_max, right_max) - candidates
+    indices = np.flatnonzero(is_trough & (prominence >= min_prominence)) + window
 
-            if prominence >= min_prominence:
-                troughs.append((dates[i], lows[i]))
-
-    return troughs
+    return [(dates[i], lows[i]) for i in indices]
 
 
 def filter_by_minimum_distance(points, min_distance_days=5):
@@ -181,7 +258,169 @@ def filter_by_minimum_distance(points, min_distance_days=5):
     return filtered
 
 
-def create_price_chart(df: pd.DataFrame, output_path: str = None, include_volume: bool = True):
+class PoolSlice(NamedTuple):
+    """One pool's contiguous run of rows in the chart frame"""
+    pool_name: str
+    frame: pd.DataFrame
+    markers: List[Tuple]
+
+
+@dataclass
+class ChartModel:
+    """
+    Everything the chart renderers share, computed once per unified frame
+
+    Pools are contiguous after consolidation (see stitch_pools), so each
+    pool is an iloc slice of the drawn frame rather than a masked copy. The
+    drawn frame is the real data merged into OHLC buckets when it has more
+    candles than the chart is wide. The model is picklable and can be handed
+    to worker processes.
+    """
+    real_df: pd.DataFrame  # Full-resolution real candles
+    pools: List[PoolSlice]
+    label_offset: pd.Timedelta
+    min_distance_hours: float
+    peak_window: int
+    last_marker: Tuple  # (date, value, color) for the current price label
+    migration_lines: List[Tuple]  # (date, label) per configured migration
+    xlim: Tuple
+    token: TokenConfig  # Titles, pool colors/labels and timeframe
+    candles_per_bar: int = 1  # >1 when candles were merged to fit the chart width
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame, token: TokenConfig = None,
+                   max_candles: int = None) -> 'ChartModel':
+        """
+        Build the model from a unified DataFrame
+
+        Args:
+            df: Unified DataFrame with price history
+            token: Token the frame belongs to (default: config module)
+            max_candles: Most candles to draw; longer histories are merged
+                into OHLC buckets (default: what fits PRICE_CHART_WIDTH)
+        """
+        token = resolve_token(token)
+        # Filter out interpolated rows once (no copy when there are none)
+        if 'is_interpolated' in df.columns and df['is_interpolated'].any():
+            real_df = df[~df['is_interpolated']]
+        else:
+            real_df = df
+
+        # Merge candles the chart has no pixels for (wick extremes are kept)
+        if max_candles is None:
+            max_candles = drawable_candles(PRICE_CHART_WIDTH)
+        # (real_df itself stays full-resolution for the comparison statistics)
+        candles_per_bar = bucket_factor(len(real_df), max_candles)
+        drawn_df = bucket_ohlcv(real_df, max_candles)
+
+        label_offset, min_distance_hours, peak_window = _adaptive_parameters(drawn_df)
+
+        pools = []
+        for start, end in zip(*pool_runs(drawn_df)):
+            pool_df = drawn_df.iloc[start:end]
+
+            # Find peaks and troughs using adaptive window
+            peaks = find_local_peaks(pool_df, window=peak_window, prominence_threshold=0.25)
+            troughs = find_local_troughs(pool_df, window=peak_window, prominence_threshold=0.25)
+
+            # Combine peaks and troughs with type markers
+            all_markers = [(date, value, 'peak') for date, value in peaks]
+            all_markers += [(date, value, 'trough') for date, value in troughs]
+
+            # Filter combined list to prevent overlaps using adaptive distance
+            markers = filter_by_minimum_distance(all_markers, min_distance_days=min_distance_hours / 24)
+            pools.append(PoolSlice(str(drawn_df['pool_name'].iloc[start]), pool_df, markers))
+
+        # X-axis limits with padding to ensure all data fits (including labels)
+        first_date, last_date = drawn_df['date'].iloc[0], drawn_df['date'].iloc[-1]
+        date_range = last_date - first_date
+        left_padding = date_range * 0.02  # 2% padding on left
+        # Right padding needs to account for label offset plus some extra space
+        right_padding = label_offset + (date_range * 0.05)
+
+        return cls(
+            real_df=real_df,
+            pools=pools,
+            label_offset=label_offset,
+            min_distance_hours=min_distance_hours,
+            peak_window=peak_window,
+            last_marker=_last_candle_marker(drawn_df.iloc[-1]),
+            migration_lines=_migration_lines(token),
+            xlim=(first_date - left_padding, last_date + right_padding),
+            token=token,
+            candles_per_bar=candles_per_bar
+        )
+
+
+def _adaptive_parameters(real_df: pd.DataFrame) -> Tuple:
+    """Label offset, marker spacing (hours) and peak window for the data density"""
+    if len(real_df) <= 1:
+        # Fallback values
+        return pd.Timedelta(hours=6), 24, 5
+
+    avg_time_delta = (real_df['date'].iloc[-1] - real_df['date'].iloc[0]) / len(real_df)
+    avg_hours = avg_time_delta.total_seconds() / 3600
+
+    # Adaptive parameters based on timeframe
+    if avg_hours < 1.5:  # Minute data
+        label_offset_multiplier = 3
+        min_distance_periods = 10
+        peak_window = 3
+    elif avg_hours < 12:  # Hourly data
+        label_offset_multiplier = 4
+        min_distance_periods = 6  # Reduced from 15 to allow more markers
+        peak_window = 3  # Reduced from 5 for better detection
+    else:  # Daily or longer
+        label_offset_multiplier = 2
+        min_distance_periods = 7
+        peak_window = 5
+
+    return avg_time_delta * label_offset_multiplier, avg_hours * min_distance_periods, peak_window
+
+
+def _last_candle_marker(last_row: pd.Series) -> Tuple:
+    """Pick which value of the last candle to label (high or low based on close position)"""
+    last_close = last_row['close']
+    last_high = last_row['high']
+    last_low = last_row['low']
+
+    candle_range = last_high - last_low
+    if candle_range > 0:
+        close_position = (last_close - last_low) / candle_range
+        if close_position > 0.7:  # Close near high
+            return last_row['date'], last_high, '#26a69a'  # Green
+        elif close_position < 0.3:  # Close near low
+            return last_row['date'], last_low, '#ef5350'  # Red
+    # Close in middle
+    return last_row['date'], last_close, '#4169E1'  # Blue
+
+
+def _migration_lines(token: TokenConfig) -> List[Tuple]:
+    """Migration dates with their transition labels"""
+    return [
+        (pd.Timestamp(timestamp, unit='s', tz='UTC'), token.migration_label(event_name))
+        for event_name, timestamp in token.migration_dates.items()
+    ]
+
+
+def prepare_chart_model(df: pd.DataFrame, token: TokenConfig = None,
+                        max_candles: int = None) -> ChartModel:
+    """
+    Compute everything the chart renderers share, once per unified frame
+
+    Args:
+        df: Unified DataFrame with price history
+        token: Token the frame belongs to (default: config module)
+        max_candles: Most candles to draw (default: what fits the chart width)
+
+    Returns:
+        ChartModel consumed by create_price_chart and create_comparison_chart
+    """
+    return ChartModel.from_frame(df, token, max_candles)
+
+
+def create_price_chart(df: pd.DataFrame, output_path: str = None, include_volume: bool = True,
+                       model: ChartModel = None, token: TokenConfig = None):
     """
     Create a comprehensive price chart with migration markers
 
@@ -189,34 +428,13 @@ def create_price_chart(df: pd.DataFrame, output_path: str = None, include_volume
         df: Unified DataFrame with price history
         output_path: Path to save the chart (optional)
         include_volume: Whether to include volume subplot (default: True)
+        model: Precomputed ChartModel for df (optional)
+        token: Token the frame belongs to, if no model is given (default: config module)
     """
-    # Calculate adaptive parameters based on timeframe
-    real_df_temp = df[~df.get('is_interpolated', False)].copy()
-    if len(real_df_temp) > 1:
-        avg_time_delta = (real_df_temp['date'].iloc[-1] - real_df_temp['date'].iloc[0]) / len(real_df_temp)
-        avg_hours = avg_time_delta.total_seconds() / 3600
-
-        # Adaptive parameters based on timeframe
-        if avg_hours < 1.5:  # Minute data
-            label_offset_multiplier = 3
-            min_distance_periods = 10
-            peak_window = 3
-        elif avg_hours < 12:  # Hourly data
-            label_offset_multiplier = 4
-            min_distance_periods = 6  # Reduced from 15 to allow more markers
-            peak_window = 3  # Reduced from 5 for better detection
-        else:  # Daily or longer
-            label_offset_multiplier = 2
-            min_distance_periods = 7
-            peak_window = 5
-
-        label_offset = avg_time_delta * label_offset_multiplier
-        min_distance_hours = avg_hours * min_distance_periods
-    else:
-        # Fallback values
-        label_offset = pd.Timedelta(hours=6)
-        min_distance_hours = 24
-        peak_window = 5
+    if model is None:
+        model = prepare_chart_model(df, token)
+    token = model.token
+    label_offset = model.label_offset
 
     # Set up dark theme style
     plt.style.use('dark_background')
@@ -235,129 +453,52 @@ def create_price_chart(df: pd.DataFrame, output_path: str = None, include_volume
         ax1.set_facecolor('#0d1117')
 
     # Add timeframe label to title
-    timeframe_label = config.TIMEFRAME.upper()
-    if config.TIMEFRAME == 'hour':
+    timeframe_label = token.timeframe.upper()
+    if token.timeframe == 'hour':
         timeframe_label = '1H'
-    elif config.TIMEFRAME == 'day':
+    elif token.timeframe == 'day':
         timeframe_label = '1D'
-    elif config.TIMEFRAME == 'minute':
+    elif token.timeframe == 'minute':
         timeframe_label = '1M'
+    if model.candles_per_bar > 1:
+        timeframe_label += f' ×{model.candles_per_bar}'
 
-    fig.suptitle(f'ZERA Token - Complete Price History | {timeframe_label}',
+    fig.suptitle(f'{token.symbol} Token - Complete Price History | {timeframe_label}',
                  fontsize=16, fontweight='bold', color='#c9d1d9')
 
-    # Color mapping for different pools
-    pool_colors = {
-        'mon3y': '#FF6B6B',      # Red for M0N3Y
-        'zera_Raydium': '#4ECDC4', # Teal for ZERA Raydium
-        'zera_Meteora': '#45B7D1'  # Blue for ZERA Meteora
-    }
-
-    # Migration timestamps for filtering
-    migration_1 = datetime.fromtimestamp(config.MIGRATION_DATES['mon3y_to_zera'])
-    migration_2 = datetime.fromtimestamp(config.MIGRATION_DATES['zera_Raydium_to_Meteora'])
-
     # Plot 1: Candlestick chart
     # Plot each pool's real data as candlesticks
-    real_df = df[~df.get('is_interpolated', False)].copy()
-
     # Track which pools were plotted for legend
-    plotted_pools = []
-
-    for pool_name in real_df['pool_name'].unique():
-        pool_df = real_df[real_df['pool_name'] == pool_name].copy()
-
-        # Cut off old pools BEFORE migration (new pools start AT migration)
-        if pool_name == 'mon3y':
-            # M0N3Y ends BEFORE ZERA Raydium starts (exclude migration date)
-            pool_df = pool_df[pool_df['date'] < migration_1]
-        elif pool_name == 'zera_Raydium':
-            # ZERA Raydium starts at migration_1, ends BEFORE Meteora starts
-            pool_df = pool_df[pool_df['date'] < migration_2]
-        # Meteora has no cutoff (it's current, starts at migration_2)
-
-        if len(pool_df) > 0:
-            # Plot candlesticks for this pool
-            plot_candlesticks(ax1, pool_df, color=pool_colors.get(pool_name, '#333333'), alpha=0.9)
-            plotted_pools.append((pool_name, pool_colors.get(pool_name, '#333333')))
-
-            # Find peaks and troughs using adaptive window
-            peaks = find_local_peaks(pool_df, window=peak_window, prominence_threshold=0.25)
-            troughs = find_local_troughs(pool_df, window=peak_window, prominence_threshold=0.25)
-
-            # Combine peaks and troughs with type markers
-            all_markers = []
-            for date, value in peaks:
-                all_markers.append((date, value, 'peak'))
-            for date, value in troughs:
-                all_markers.append((date, value, 'trough'))
-
-            # Filter combined list to prevent overlaps using adaptive distance
-            min_distance_days = min_distance_hours / 24
-            filtered_markers = filter_by_minimum_distance(all_markers, min_distance_days=min_distance_days)
-
-            # Plot filtered markers with side labels
-            for marker in filtered_markers:
-                date, value, marker_type = marker
-
-                if marker_type == 'peak':
-                    # Mark the peak with a small circle
-                    ax1.plot(date, value, 'o', color='#26a69a', markersize=6,
-                            markeredgecolor='white', markeredgewidth=1, zorder=11)
-
-                    # Position label using adaptive offset
-                    label_date = date + label_offset
-                    ax1.annotate(f'${value:.4f}',
-                               xy=(date, value),
-                               xytext=(label_date, value),
-                               fontsize=7, color='white', weight='bold',
-                               bbox=dict(boxstyle='round,pad=0.4', facecolor='#26a69a',
-                                        edgecolor='white', alpha=0.9, linewidth=1),
-                               ha='left', va='center',
-                               arrowprops=dict(arrowstyle='-', color='#26a69a',
-                                             lw=1, alpha=0.6),
-                               zorder=10)
-                else:  # trough
-                    # Mark the trough with a small circle
-                    ax1.plot(date, value, 'o', color='#ef5350', markersize=6,
-                            markeredgecolor='white', markeredgewidth=1, zorder=11)
-
-                    # Position label using adaptive offset
-                    label_date = date + label_offset
-                    ax1.annotate(f'${value:.4f}',
-                               xy=(date, value),
-                               xytext=(label_date, value),
-                               fontsize=7, color='white', weight='bold',
-                               bbox=dict(boxstyle='round,pad=0.4', facecolor='#ef5350',
-                                        edgecolor='white', alpha=0.9, linewidth=1),
-                               ha='left', va='center',
-                               arrowprops=dict(arrowstyle='-', color='#ef5350',
-                                             lw=1, alpha=0.6),
-                               zorder=10)
+    plotted_pools = {}
+
+    for pool_name, pool_df, markers in model.pools:
+        # Plot candlesticks for this pool
+        plot_candlesticks(ax1, pool_df, color=token.pool_color(pool_name), alpha=0.9)
+        plotted_pools[pool_name] = token.pool_color(pool_name)
+
+        # Plot filtered markers with side labels
+        for date, value, marker_type in markers:
+            marker_color = '#26a69a' if marker_type == 'peak' else '#ef5350'
+
+            # Mark the peak/trough with a small circle
+            ax1.plot(date, value, 'o', color=marker_color, markersize=6,
+                    markeredgecolor='white', markeredgewidth=1, zorder=11)
+
+            # Position label using adaptive offset
+            label_date = date + label_offset
+            ax1.annotate(f'${value:.4f}',
+                       xy=(date, value),
+                       xytext=(label_date, value),
+                       fontsize=7, color='white', weight='bold',
+                       bbox=dict(boxstyle='round,pad=0.4', facecolor=marker_color,
+                                edgecolor='white', alpha=0.9, linewidth=1),
+                       ha='left', va='center',
+                       arrowprops=dict(arrowstyle='-', color=marker_color,
+                                     lw=1, alpha=0.6),
+                       zorder=10)
 
     # Label the absolute last candlestick (current price) - only once
-    last_row = real_df.iloc[-1]
-    last_date = last_row['date']
-    last_close = last_row['close']
-    last_high = last_row['high']
-    last_low = last_row['low']
-
-    # Determine which value to mark (high or low based on close position)
-    candle_range = last_high - last_low
-    if candle_range > 0:
-        close_position = (last_close - last_low) / candle_range
-        if close_position > 0.7:  # Close near high
-            mark_value = last_high
-            mark_color = '#26a69a'  # Green
-        elif close_position < 0.3:  # Close near low
-            mark_value = last_low
-            mark_color = '#ef5350'  # Red
-        else:  # Close in middle
-            mark_value = last_close
-            mark_color = '#4169E1'  # Blue
-    else:
-        mark_value = last_close
-        mark_color = '#4169E1'
+    last_date, mark_value, mark_color = model.last_marker
 
     # Mark with circle
     ax1.plot(last_date, mark_value, 'o', color=mark_color, markersize=8,
@@ -377,19 +518,10 @@ def create_price_chart(df: pd.DataFrame, output_path: str = None, include_volume
                zorder=12)
 
     # Add migration markers with transition labels
-    for event_name, timestamp in config.MIGRATION_DATES.items():
-        migration_date = datetime.fromtimestamp(timestamp)
+    for migration_date, label in model.migration_lines:
         ax1.axvline(x=migration_date, color='#666666', linestyle='--',
                    linewidth=1, alpha=0.6, zorder=0)
 
-        # Create transition label from event name
-        if 'mon3y_to_zera' in event_name:
-            label = 'MON3Y → Raydium'
-        elif 'Raydium_to_Meteora' in event_name:
-            label = 'Raydium → Meteora'
-        else:
-            label = event_name.replace('_', ' → ')
-
         # Place label at top of chart, centered on line
         ax1.text(migration_date, ax1.get_ylim()[1] * 0.98, label,
                 ha='center', va='top', fontsize=8, color='#8b949e',
@@ -399,16 +531,9 @@ def create_price_chart(df: pd.DataFrame, output_path: str = None, include_volume
     # Create custom legend with simple names
     legend_elements = []
 
-    # Simple label mapping
-    simple_labels = {
-        'mon3y': 'MON3Y',
-        'zera_Raydium': 'Raydium',
-        'zera_Meteora': 'Meteora'
-    }
-
     # Add legend entries for each plotted pool
-    for pool_name, color in plotted_pools:
-        label = simple_labels.get(pool_name, pool_name)
+    for pool_name, color in plotted_pools.items():
+        label = token.pool_label(pool_name)
         legend_elements.append(Line2D([0], [0], color=color, linewidth=8,
                                      label=label))
 
@@ -423,37 +548,18 @@ def create_price_chart(df: pd.DataFrame, output_path: str = None, include_volume
     plt.setp(ax1.xaxis.get_majorticklabels(), rotation=45, ha='right')
 
     # Set x-axis limits with padding to ensure all data fits (including labels)
-    date_range = real_df['date'].max() - real_df['date'].min()
-    left_padding = date_range * 0.02  # 2% padding on left
-    # Right padding needs to account for label offset plus some extra space
-    right_padding = label_offset + (date_range * 0.05)
-    ax1.set_xlim(real_df['date'].min() - left_padding, real_df['date'].max() + right_padding)
+    ax1.set_xlim(*model.xlim)
 
     # Plot 2: Volume over time (only if include_volume is True)
     if include_volume:
         # Only plot real data (skip interpolated points)
-        real_df_vol = df[~df.get('is_interpolated', False)].copy()
-
-        for pool_name in real_df_vol['pool_name'].unique():
-            pool_df = real_df_vol[real_df_vol['pool_name'] == pool_name].copy()
-
-            # Cut off old pools BEFORE migration (new pools start AT migration)
-            if pool_name == 'mon3y':
-                pool_df = pool_df[pool_df['date'] < migration_1]
-            elif pool_name == 'zera_Raydium':
-                pool_df = pool_df[pool_df['date'] < migration_2]
-
-            if len(pool_df) > 0:
-                label = simple_labels.get(pool_name, pool_name)
-                # Scale volume to millions
-                ax2.bar(pool_df['date'], pool_df['volume'] / 1_000_000,
-                       label=label,
-                       color=pool_colors.get(pool_name, '#333333'),
-                       alpha=0.6, width=0.8)
+        for pool_name, pool_df, _ in model.pools:
+            # Scale volume to millions
+            plot_volume_bars(ax2, pool_df, color=token.pool_color(pool_name),
+                             alpha=0.6, width=0.8)
 
         # Add migration markers to volume chart (matching price chart style)
-        for event_name, timestamp in config.MIGRATION_DATES.items():
-            migration_date = datetime.fromtimestamp(timestamp)
+        for migration_date, _ in model.migration_lines:
             ax2.axvline(x=migration_date, color='#30363d', linestyle='--',
                        linewidth=1, alpha=0.6, zorder=0)
 
@@ -466,14 +572,15 @@ def create_price_chart(df: pd.DataFrame, output_path: str = None, include_volume
         plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
 
         # Set x-axis limits to match price chart exactly
-        ax2.set_xlim(real_df['date'].min() - left_padding, real_df['date'].max() + right_padding)
+        ax2.set_xlim(*model.xlim)
 
     plt.tight_layout()
+    instrument.count('artists_drawn', len(fig.findobj()))
 
     # Save or show
     if output_path:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=config.CHART_DPI, bbox_inches='tight')
         print(f"\n✓ Chart saved to: {output_path}")
     else:
         plt.show()
@@ -481,42 +588,41 @@ def create_price_chart(df: pd.DataFrame, output_path: str = None, include_volume
     plt.close()
 
 
-def create_comparison_chart(df: pd.DataFrame, output_path: str = None):
+def create_comparison_chart(df: pd.DataFrame, output_path: str = None, model: ChartModel = None,
+                            token: TokenConfig = None):
     """
     Create a comparison chart showing key metrics across pools
 
     Args:
         df: Unified DataFrame with price history
         output_path: Path to save the chart (optional)
+        model: Precomputed ChartModel for df (optional)
+        token: Token the frame belongs to, if no model is given (default: config module)
     """
     # Set up dark theme
     plt.style.use('dark_background')
 
     # Filter out interpolated data for accurate statistics
-    real_df = df[~df.get('is_interpolated', False)].copy()
+    if model is not None:
+        real_df = model.real_df
+        token = model.token
+    else:
+        real_df = df[~df.get('is_interpolated', False)].copy()
+        token = resolve_token(token)
 
     fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(14, 10))
     fig.patch.set_facecolor('#0d1117')
     for ax in [ax1, ax2, ax3, ax4]:
         ax.set_facecolor('#0d1117')
 
-    fig.suptitle('ZERA Token - Pool Comparison Metrics',
+    fig.suptitle(f'{token.symbol} Token - Pool Comparison Metrics',
                  fontsize=16, fontweight='bold', color='#c9d1d9')
 
-    pool_colors = ['#FF6B6B', '#4ECDC4', '#45B7D1']
-
-    # Simple label mapping
-    simple_labels = {
-        'mon3y': 'MON3Y',
-        'zera_Raydium': 'Raydium',
-        'zera_Meteora': 'Meteora'
-    }
-
     # 1. Average Price by Pool
-    avg_prices = real_df.groupby('pool_name')['close'].mean()
-    ax1.bar(range(len(avg_prices)), avg_prices.values, color=pool_colors)
+    avg_prices = real_df.groupby('pool_name', observed=True)['close'].mean()
+    ax1.bar(range(len(avg_prices)), avg_prices.values, color=[token.pool_color(p) for p in avg_prices.index])
     ax1.set_xticks(range(len(avg_prices)))
-    ax1.set_xticklabels([simple_labels.get(p, p) for p in avg_prices.index],
+    ax1.set_xticklabels([token.pool_label(p) for p in avg_prices.index],
                          rotation=15, ha='right', color='#c9d1d9')
     ax1.set_ylabel('Average Price (USD)', color='#c9d1d9')
     ax1.set_title('Average Price by Pool', color='#c9d1d9')
@@ -524,10 +630,10 @@ def create_comparison_chart(df: pd.DataFrame, output_path: str = None):
     ax1.tick_params(colors='#8b949e', which='both')
 
     # 2. Total Volume by Pool
-    total_volumes = real_df.groupby('pool_name')['volume'].sum()
-    ax2.bar(range(len(total_volumes)), total_volumes.values, color=pool_colors)
+    total_volumes = real_df.groupby('pool_name', observed=True)['volume'].sum()
+    ax2.bar(range(len(total_volumes)), total_volumes.values, color=[token.pool_color(p) for p in total_volumes.index])
     ax2.set_xticks(range(len(total_volumes)))
-    ax2.set_xticklabels([simple_labels.get(p, p) for p in total_volumes.index],
+    ax2.set_xticklabels([token.pool_label(p) for p in total_volumes.index],
                          rotation=15, ha='right', color='#c9d1d9')
     ax2.set_ylabel('Total Volume (USD)', color='#c9d1d9')
     ax2.set_title('Total Volume by Pool', color='#c9d1d9')
@@ -535,10 +641,10 @@ def create_comparison_chart(df: pd.DataFrame, output_path: str = None):
     ax2.tick_params(colors='#8b949e', which='both')
 
     # 3. Price Volatility (std dev) by Pool
-    volatility = real_df.groupby('pool_name')['close'].std()
-    ax3.bar(range(len(volatility)), volatility.values, color=pool_colors)
+    volatility = real_df.groupby('pool_name', observed=True)['close'].std()
+    ax3.bar(range(len(volatility)), volatility.values, color=[token.pool_color(p) for p in volatility.index])
     ax3.set_xticks(range(len(volatility)))
-    ax3.set_xticklabels([simple_labels.get(p, p) for p in volatility.index],
+    ax3.set_xticklabels([token.pool_label(p) for p in volatility.index],
                          rotation=15, ha='right', color='#c9d1d9')
     ax3.set_ylabel('Price Std Dev (USD)', color='#c9d1d9')
     ax3.set_title('Price Volatility by Pool', color='#c9d1d9')
@@ -546,10 +652,10 @@ def create_comparison_chart(df: pd.DataFrame, output_path: str = None):
     ax3.tick_params(colors='#8b949e', which='both')
 
     # 4. Days Active by Pool
-    days_active = real_df.groupby('pool_name').size()
-    ax4.bar(range(len(days_active)), days_active.values, color=pool_colors)
+    days_active = real_df.groupby('pool_name', observed=True).size()
+    ax4.bar(range(len(days_active)), days_active.values, color=[token.pool_color(p) for p in days_active.index])
     ax4.set_xticks(range(len(days_active)))
-    ax4.set_xticklabels([simple_labels.get(p, p) for p in days_active.index],
+    ax4.set_xticklabels([token.pool_label(p) for p in days_active.index],
                          rotation=15, ha='right', color='#c9d1d9')
     ax4.set_ylabel('Days', color='#c9d1d9')
     ax4.set_title('Days Active by Pool', color='#c9d1d9')
@@ -557,11 +663,12 @@ def create_comparison_chart(df: pd.DataFrame, output_path: str = None):
     ax4.tick_params(colors='#8b949e', which='both')
 
     plt.tight_layout()
+    instrument.count('artists_drawn', len(fig.findobj()))
 
     # Save or show
     if output_path:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
+        plt.savefig(output_path, dpi=config.CHART_DPI, bbox_inches='tight')
         print(f"✓ Comparison chart saved to: {output_path}")
     else:
         plt.show()
@@ -580,5 +687,6 @@ if __name__ == "__main__":
     df = add_migration_markers(df)
 
     # Create charts
-    create_price_chart(df, f"{config.OUTPUT_DIR}/{config.CHART_FILENAME}")
-    create_comparison_chart(df, f"{config.OUTPUT_DIR}/zera_comparison_chart.png")
+    token = resolve_token()
+    create_price_chart(df, token.output_path(token.chart_filename))
+    create_comparison_chart(df, token.output_path(token.comparison_chart_filename))
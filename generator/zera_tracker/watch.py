@@ -0,0 +1,118 @@
+"""
+Watch mode
+
+Keeps the process (and its imported pandas/matplotlib) alive after a normal
+run and refreshes the outputs as candles close. Only the token's active
+pools (those without `active_until`) are polled, on a schedule aligned to
+the candle boundaries of the configured timeframe. New candles go through
+the incremental per-pool cache and are folded into the in-memory unified
+frame, so a refresh costs one small request per active pool plus the
+outputs that actually changed.
+"""
+
+import time
+from typing import Callable, Dict
+import pandas as pd
+import config
+from .consolidator import append_candles
+from .fetcher import TIMEFRAME_SECONDS, fetch_pool_incremental
+from .ratelimit import TokenBucket
+from .tokens import TokenConfig, resolve_token
+
+
+def active_pools(token: TokenConfig = None) -> Dict:
+    """Pools that are still trading (no `active_until` date)"""
+    return {name: info for name, info in resolve_token(token).pools.items()
+            if 'active_until' not in info}
+
+
+def next_candle_close(now: float, timeframe: str, settle_seconds: float = 0) -> float:
+    """
+    Unix time of the next candle boundary for a timeframe
+
+    Args:
+        now: Current Unix time
+        timeframe: 'minute', 'hour' or 'day'
+        settle_seconds: Delay after the boundary to let the API publish the candle
+    """
+    period = TIMEFRAME_SECONDS[timeframe]
+    return (now // period + 1) * period + settle_seconds
+
+
+def poll_active_pools(df: pd.DataFrame, token: TokenConfig = None, rate_limiter: TokenBucket = None,
+                      cache_dir: str = None):
+    """
+    Fetch the newest candles of every active pool and fold them into the frame
+
+    Args:
+        df: Consolidated in-memory frame
+        token: Token being watched (default: config module)
+        rate_limiter: Shared limiter
+        cache_dir: Per-pool incremental cache (default: <output_dir>/pool_cache)
+
+    Returns:
+        Tuple of (updated frame, number of rows added or changed, timestamp
+        from which rows may have changed, or None if none did)
+    """
+    token = resolve_token(token)
+    if cache_dir is None:
+        cache_dir = f"{token.output_dir}/pool_cache"
+
+    # append_candles only replaces the newest row or appends after it
+    since = int(df['timestamp'].iloc[-1]) if len(df) else 0
+    changed = 0
+    for pool_name, pool_info in active_pools(token).items():
+        result = fetch_pool_incremental(pool_name, pool_info, rate_limiter, cache_dir, token)
+        if result.get('data') is None:
+            continue
+        df, rows = append_candles(df, pool_name, pool_info,
+                                  result['data']['data']['attributes']['ohlcv_list'], token=token)
+        changed += rows
+    return df, changed, since if changed else None
+
+
+def watch(df: pd.DataFrame, refresh: Callable, token: TokenConfig = None,
+          settle_seconds: float = None, max_cycles: int = None,
+          clock: Callable = time.time, sleep: Callable = time.sleep) -> pd.DataFrame:
+    """
+    Poll active pools at each candle close and refresh outputs on change
+
+    Args:
+        df: Consolidated frame from the initial run
+        refresh: Called as refresh(df, since) whenever the frame changed, with
+            the timestamp of the earliest row that may have changed
+        token: Token being watched (default: config module)
+        settle_seconds: Wait after each candle boundary (default: config.WATCH_SETTLE_SECONDS)
+        max_cycles: Stop after this many polls (default: run until interrupted)
+        clock, sleep: Time source and sleep function (overridable for benchmarks)
+
+    Returns:
+        The latest frame when the loop ends
+    """
+    token = resolve_token(token)
+    if settle_seconds is None:
+        settle_seconds = config.WATCH_SETTLE_SECONDS
+    if not active_pools(token):
+        print("✗ No active pool (every pool has active_until); nothing to watch")
+        return df
+
+    rate_limiter = TokenBucket(config.RATE_LIMIT_PER_MINUTE, capacity=config.RATE_LIMIT_BURST)
+    cycles = 0
+    while max_cycles is None or cycles < max_cycles:
+        wake_at = next_candle_close(clock(), token.timeframe, settle_seconds)
+        print(f"\n⏳ Next {token.timeframe} candle close: "
+              f"{pd.Timestamp(wake_at, unit='s', tz='UTC').strftime('%Y-%m-%d %H:%M:%S')} UTC")
+        sleep(max(0.0, wake_at - clock()))
+
+        started = clock()
+        df, changed, since = poll_active_pools(df, token, rate_limiter)
+        cycles += 1
+        if not changed:
+            print("✓ No new candles")
+            continue
+
+        print(f"✓ {changed} new or updated candles")
+        refresh(df, since)
+        print(f"✓ Outputs refreshed {clock() - started:.1f}s after poll started")
+
+    return df